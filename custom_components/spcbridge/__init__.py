@@ -1,61 +1,140 @@
 """Support for acre/Vanderbilt SPC alarm system connected via Lundix's SPC Bridge"""
 
+import asyncio
 import logging
+import time
+from datetime import timedelta
+from typing import Any
 
 import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import (
     ATTR_CODE,
     ATTR_DEVICE_ID,
+    ATTR_ENTITY_ID,
     CONF_IP_ADDRESS,
     CONF_PORT,
     EVENT_HOMEASSISTANT_STOP,
     Platform,
 )
-from homeassistant.core import Event, HomeAssistant, ServiceCall, SupportsResponse
-from homeassistant.exceptions import ConfigEntryNotReady, ServiceValidationError
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import (
+    ConfigEntryNotReady,
+    ServiceValidationError,
+    Unauthorized,
+    UnknownUser,
+)
 from homeassistant.helpers import (
     aiohttp_client,
     config_validation as cv,
     device_registry as dr,
     entity_registry as er,
 )
-from homeassistant.helpers.dispatcher import async_dispatcher_send
-from homeassistant.helpers.httpx_client import get_async_client as get_http_client
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.util.hass_dict import HassKey
 from pyspcbridge import SpcBridge
-from pyspcbridge.area import Area
-from pyspcbridge.door import Door
-from pyspcbridge.output import Output
-from pyspcbridge.panel import Panel
-from pyspcbridge.zone import Zone
+from pyspcbridge.exceptions import SpcException
 
+from .client import SpcHttpStats, create_http_client
+from .commands import SpcCommandQueue
+from .connection import SpcConnection
 from .const import (
     ATTR_COMMAND,
+    ATTR_CONCURRENCY,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_DURATION,
+    ATTR_FILE,
+    ATTR_SPEED,
+    ATTR_VERIFY,
     CONF_AREAS_INCLUDE_DATA,
+    CONF_COALESCE_WINDOW,
     CONF_DOORS_INCLUDE_DATA,
     CONF_GET_PASSWORD,
     CONF_GET_USERNAME,
     CONF_OUTPUTS_INCLUDE_DATA,
     CONF_PUT_PASSWORD,
     CONF_PUT_USERNAME,
+    CONF_RECORD_FRAMES,
+    CONF_SLOW_EVENT_THRESHOLD,
+    CONF_USER_IDENTIFY_METHOD,
     CONF_USERS_DATA,
     CONF_WS_PASSWORD,
     CONF_WS_USERNAME,
     CONF_ZONES_INCLUDE_DATA,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_RECORD_FRAMES,
+    DEFAULT_SLOW_EVENT_THRESHOLD,
     DOMAIN,
+    SIGNAL_ADD_ENTITIES,
+    SIGNAL_OPTIONS_UPDATED,
+    SIGNAL_RECONCILE,
+    SIGNAL_UPDATE_HEALTH,
 )
+from .dispatcher import FRAME_RECEIVED, SpcDispatcher
+from .models import SpcRuntimeData
+from .profiler import async_profile
+from .readiness import SpcArmStatusCache, SpcReadiness
+from .recorder import SpcFrameRecorder, async_load_recording, recording_path
+from .resolver import SpcDeviceResolver, SpcTarget
+from .stats import SpcPerfCounters
+from .store import SpcChanges, SpcStore, async_remove_store
 from .utils import get_host
 
 _LOGGER = logging.getLogger(__name__)
 
 DATA_API = "spc_api"
+DATA_RESOLVER: HassKey[SpcDeviceResolver] = HassKey(f"{DOMAIN}_resolver")
+
+REFRESH_RETRY_INTERVAL = 30  # s
+RECONCILE_COOLDOWN = 5  # s
+BULK_COMMAND_CONCURRENCY = 4
+PROFILE_DURATION = 30  # s
+# Interval of the health sensors, they only read counters kept in memory
+HEALTH_UPDATE_INTERVAL = timedelta(seconds=30)
+
+# Options that are applied without reloading the entry
+LIVE_OPTIONS = {
+    CONF_AREAS_INCLUDE_DATA,
+    CONF_ZONES_INCLUDE_DATA,
+    CONF_OUTPUTS_INCLUDE_DATA,
+    CONF_DOORS_INCLUDE_DATA,
+    CONF_USER_IDENTIFY_METHOD,
+    CONF_USERS_DATA,
+    CONF_COALESCE_WINDOW,
+    CONF_SLOW_EVENT_THRESHOLD,
+    CONF_RECORD_FRAMES,
+}
+
+# Option values redacted from recorded frames
+CREDENTIAL_OPTIONS = (
+    CONF_GET_USERNAME,
+    CONF_GET_PASSWORD,
+    CONF_PUT_USERNAME,
+    CONF_PUT_PASSWORD,
+    CONF_WS_USERNAME,
+    CONF_WS_PASSWORD,
+)
 
-SIGNAL_UPDATE_PANEL = "spc_update_panel"
-SIGNAL_UPDATE_AREA = "spc_update_area"
-SIGNAL_UPDATE_ZONE = "spc_update_zone"
-SIGNAL_UPDATE_OUTPUT = "spc_update_output"
-SIGNAL_UPDATE_DOOR = "spc_update_door"
+# Option with the include modes of each SPC object type
+INCLUDE_OPTIONS = {
+    "area": CONF_AREAS_INCLUDE_DATA,
+    "zone": CONF_ZONES_INCLUDE_DATA,
+    "output": CONF_OUTPUTS_INCLUDE_DATA,
+    "door": CONF_DOORS_INCLUDE_DATA,
+}
 
 PLATFORMS = [
     Platform.BINARY_SENSOR,
@@ -66,53 +145,36 @@ PLATFORMS = [
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up the SPC component"""
 
+    # Updates from the SPC Bridge are coalesced before they reach the entities
+    dispatcher = SpcDispatcher(
+        hass,
+        entry.options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW),
+        entry.options.get(CONF_SLOW_EVENT_THRESHOLD, DEFAULT_SLOW_EVENT_THRESHOLD),
+    )
+    entry.async_on_unload(dispatcher.async_stop)
+    # Timing of the hot paths, enabled by the profile service
+    perf = SpcPerfCounters()
+
     async def async_update_callback(command, panel_id, spc_objects=None):
         if command == "reload":
-            device_registry = dr.async_get(hass)
-            if device := device_registry.async_get_device(
-                identifiers={(DOMAIN, f"{panel_id}-panel-1")}
-            ):
-                await hass.config_entries.async_reload(device.primary_config_entry)
+            reconcile_debouncer.async_schedule_call()
 
         if command == "update":
-            for _object in spc_objects:
-                if isinstance(_object, Panel):
-                    async_dispatcher_send(
-                        hass, f"{SIGNAL_UPDATE_PANEL}-{panel_id}", _object.id
-                    )
-                elif isinstance(_object, Area):
-                    async_dispatcher_send(
-                        hass, f"{SIGNAL_UPDATE_AREA}-{panel_id}", _object.id
-                    )
-
-                elif isinstance(_object, Zone):
-                    async_dispatcher_send(
-                        hass, f"{SIGNAL_UPDATE_ZONE}-{panel_id}", _object.id
-                    )
-                elif isinstance(_object, Output):
-                    async_dispatcher_send(
-                        hass, f"{SIGNAL_UPDATE_OUTPUT}-{panel_id}", _object.id
-                    )
-                elif isinstance(_object, Door):
-                    async_dispatcher_send(
-                        hass, f"{SIGNAL_UPDATE_DOOR}-{panel_id}", _object.id
-                    )
+            start = time.perf_counter() if perf.enabled else None
+            readiness.async_update(spc_objects)
+            arm_status.async_invalidate(spc_objects)
+            received = FRAME_RECEIVED.get()
+            dispatcher.async_update(panel_id, spc_objects, received)
+            store.async_update(spc_objects, received)
+            if start is not None:
+                perf.add("update_callback", time.perf_counter() - start)
 
     async def async_panel_command(call: ServiceCall) -> None:
         """Panel command"""
-        device_id = call.data[ATTR_DEVICE_ID]
-        device_registry = dr.async_get(hass)
-        if (device_info := device_registry.async_get(device_id)) is None:
-            raise vol.Invalid("Invalid device ID specified")
-        [unique_id] = [
-            identity[1] for identity in device_info.identifiers if identity[0] == DOMAIN
-        ]
-        id = unique_id.split("-")
-        if id[1] == "panel":
+        if target := _async_resolve(hass, call, "panel"):
             command = call.data[ATTR_COMMAND]
             code = call.data[ATTR_CODE]
-            spc = hass.data[DOMAIN][device_info.primary_config_entry]
-            err = await spc._panel.async_command(command, code)
+            err = await target.async_command(command, code)
             if isinstance(err, dict):
                 if err.get("code", 0) > 0:
                     raise ServiceValidationError(err["message"])
@@ -123,131 +185,158 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     async def async_area_command(call: ServiceCall) -> None:
         """Area command"""
-        device_id = call.data[ATTR_DEVICE_ID]
-        device_registry = dr.async_get(hass)
-        if (device_info := device_registry.async_get(device_id)) is None:
-            raise vol.Invalid("Invalid device ID specified")
-
-        [unique_id] = [
-            identity[1] for identity in device_info.identifiers if identity[0] == DOMAIN
-        ]
-        id = unique_id.split("-")
-        if id[1] == "area" and int(id[2]) > 0:
+        if target := _async_resolve(hass, call, "area"):
             command = call.data[ATTR_COMMAND]
             code = call.data[ATTR_CODE]
-            spc = hass.data[DOMAIN][device_info.primary_config_entry]
-            err = await spc._areas[int(id[2])].async_command(command, code)
+            err = await target.async_command(command, code)
             if err["code"] > 0:
                 raise ServiceValidationError(err["message"])
 
     async def async_zone_command(call: ServiceCall) -> None:
         """Zone command"""
-        device_id = call.data[ATTR_DEVICE_ID]
-        device_registry = dr.async_get(hass)
-        if (device_info := device_registry.async_get(device_id)) is None:
-            raise vol.Invalid("Invalid device ID specified")
-        [unique_id] = [
-            identity[1] for identity in device_info.identifiers if identity[0] == DOMAIN
-        ]
-        id = unique_id.split("-")
-        if id[1] == "zone" and int(id[2]) > 0:
+        if target := _async_resolve(hass, call, "zone"):
             command = call.data[ATTR_COMMAND]
             code = call.data[ATTR_CODE]
-            spc = hass.data[DOMAIN][device_info.primary_config_entry]
-            err = await spc._zones[int(id[2])].async_command(command, code)
+            err = await target.async_command(command, code)
             if err["code"] > 0:
                 raise ServiceValidationError(err["message"])
 
     async def async_output_command(call: ServiceCall) -> None:
         """Output command"""
-        device_id = call.data[ATTR_DEVICE_ID]
-        device_registry = dr.async_get(hass)
-        if (device_info := device_registry.async_get(device_id)) is None:
-            raise vol.Invalid("Invalid device ID specified")
-        [unique_id] = [
-            identity[1] for identity in device_info.identifiers if identity[0] == DOMAIN
-        ]
-        id = unique_id.split("-")
-        if id[1] == "output" and int(id[2]) > 0:
+        if target := _async_resolve(hass, call, "output"):
             command = call.data[ATTR_COMMAND]
             code = call.data[ATTR_CODE]
-            spc = hass.data[DOMAIN][device_info.primary_config_entry]
-            err = await spc._outputs[int(id[2])].async_command(command, code)
+            err = await target.async_command(command, code)
             if err["code"] > 0:
                 raise ServiceValidationError(err["message"])
 
     async def async_door_command(call: ServiceCall) -> None:
         """Door command"""
-        device_id = call.data[ATTR_DEVICE_ID]
-        device_registry = dr.async_get(hass)
-        if (device_info := device_registry.async_get(device_id)) is None:
-            raise vol.Invalid("Invalid device ID specified")
-        [unique_id] = [
-            identity[1] for identity in device_info.identifiers if identity[0] == DOMAIN
-        ]
-        id = unique_id.split("-")
-        if id[1] == "door" and int(id[2]) > 0:
+        if target := _async_resolve(hass, call, "door"):
             command = call.data[ATTR_COMMAND]
             code = call.data[ATTR_CODE]
-            spc = hass.data[DOMAIN][device_info.primary_config_entry]
-            err = await spc._doors[int(id[2])].async_command(command, code)
+            err = await target.async_command(command, code)
             if err["code"] > 0:
                 raise ServiceValidationError(err["message"])
 
+    async def async_bulk_command(call: ServiceCall) -> ServiceResponse:
+        """Send one command to several SPC objects"""
+        await _async_check_admin(hass, call)
+
+        # Entity targets are resolved to their devices
+        targets = {device_id: device_id for device_id in call.data[ATTR_DEVICE_ID]}
+        entity_registry = er.async_get(hass)
+        for entity_id in call.data[ATTR_ENTITY_ID]:
+            entity = entity_registry.async_get(entity_id)
+            targets[entity_id] = entity.device_id if entity else None
+
+        resolver = hass.data[DATA_RESOLVER]
+        command = call.data[ATTR_COMMAND]
+        code = call.data[ATTR_CODE]
+        # Replaces the limit of the command queue of the bridges
+        concurrency = call.data[ATTR_CONCURRENCY]
+
+        async def async_command(device_id: str | None) -> dict[str, Any]:
+            if (
+                device_id is None
+                or (target := resolver.async_resolve(device_id)) is None
+            ):
+                return {"success": False, "error": "Invalid device ID specified"}
+            try:
+                result = await target.async_command(command, code, concurrency)
+            except Exception as err:
+                return {"success": False, "error": str(err)}
+            if message := _command_error(result):
+                return {"success": False, "error": message}
+            return {"success": True}
+
+        results = dict(
+            zip(
+                targets,
+                await asyncio.gather(*map(async_command, targets.values())),
+                strict=True,
+            )
+        )
+        if not call.return_response:
+            if failed := [t for t, r in results.items() if not r["success"]]:
+                raise ServiceValidationError(
+                    f"Command {command} failed for {', '.join(failed)}"
+                )
+            return None
+        return {"results": results}
+
+    async def async_profile_service(call: ServiceCall) -> ServiceResponse:
+        """Profile the event pipeline of all SPC Bridges"""
+        await _async_check_admin(hass, call)
+        counters = {
+            loaded.title: loaded.runtime_data.perf
+            for loaded in hass.config_entries.async_entries(DOMAIN)
+            if loaded.state is ConfigEntryState.LOADED
+        }
+        result = await async_profile(hass, counters, call.data[ATTR_DURATION])
+        _LOGGER.info("SPC Bridge profile written to %s", result["path"])
+        return result if call.return_response else None
+
+    async def async_replay_service(call: ServiceCall) -> ServiceResponse:
+        """Replay recorded websocket frames through a SPC Bridge"""
+        await _async_check_admin(hass, call)
+        target = hass.config_entries.async_get_entry(call.data[ATTR_CONFIG_ENTRY_ID])
+        if (
+            target is None
+            or target.domain != DOMAIN
+            or target.state is not ConfigEntryState.LOADED
+        ):
+            raise ServiceValidationError("The SPC Bridge is not loaded")
+        if ATTR_FILE in call.data:
+            path = hass.config.path(call.data[ATTR_FILE])
+        else:
+            path = recording_path(hass, target)
+        try:
+            frames = await async_load_recording(hass, path)
+        except (OSError, ValueError) as err:
+            raise ServiceValidationError(
+                f"Failed to read recording {path}: {err}"
+            ) from err
+
+        start = time.monotonic()
+        replayed = await target.runtime_data.connection.async_replay(
+            frames, call.data[ATTR_SPEED]
+        )
+        result = {"frames": replayed, "duration": round(time.monotonic() - start, 3)}
+        return result if call.return_response else None
+
     async def async_get_panel_arm_status(call: ServiceCall) -> dict | None:
         """Get area arm status"""
-        arm_mode = ""
-        _arm_mode = call.data["arm_mode"]
-        if _arm_mode.startswith("set_a"):
-            arm_mode = "set_a"
-        elif _arm_mode.startswith("set_b"):
-            arm_mode = "set_b"
-        elif _arm_mode.startswith("set"):
-            arm_mode = "set"
-        elif _arm_mode.startswith("disarm"):
-            arm_mode = "disarm"
-
-        device_id = call.data[ATTR_DEVICE_ID]
-        device_registry = dr.async_get(hass)
-        if (device_info := device_registry.async_get(device_id)) is None:
-            raise vol.Invalid("Invalid device ID specified")
-        [unique_id] = [
-            identity[1] for identity in device_info.identifiers if identity[0] == DOMAIN
-        ]
-        id = unique_id.split("-")
-        if arm_mode != "" and id[1] == "panel":
+        arm_mode = _arm_status_mode(call.data["arm_mode"])
+
+        target = _async_resolve(hass, call, "panel")
+        if arm_mode != "" and target:
+            if not call.data[ATTR_VERIFY]:
+                # Answered by the readiness model
+                data = target.data.readiness.arm_status(arm_mode)
+                return {"area": {item["area_id"]: item["reasons"] for item in data}}
             try:
-                spc = hass.data[DOMAIN][device_info.primary_config_entry]
-                data = await spc.async_get_arm_status(arm_mode)
+                data = await target.data.arm_status.async_get_arm_status(
+                    target.data.spc, arm_mode
+                )
                 return {"area": {item["area_id"]: item["reasons"] for item in data}}
             except Exception as err:
                 raise ServiceValidationError(err) from err
 
     async def async_get_area_arm_status(call: ServiceCall) -> dict | None:
         """Get area arm status"""
-        arm_mode = ""
-        _arm_mode = call.data["arm_mode"]
-        if _arm_mode.startswith("set_a"):
-            arm_mode = "set_a"
-        elif _arm_mode.startswith("set_b"):
-            arm_mode = "set_b"
-        elif _arm_mode.startswith("set"):
-            arm_mode = "set"
-        elif _arm_mode.startswith("disarm"):
-            arm_mode = "disarm"
-
-        device_id = call.data[ATTR_DEVICE_ID]
-        device_registry = dr.async_get(hass)
-        if (device_info := device_registry.async_get(device_id)) is None:
-            raise vol.Invalid("Invalid device ID specified")
-        [unique_id] = [
-            identity[1] for identity in device_info.identifiers if identity[0] == DOMAIN
-        ]
-        id = unique_id.split("-")
-        if arm_mode != "" and id[1] == "area" and int(id[2]) > 0:
+        arm_mode = _arm_status_mode(call.data["arm_mode"])
+
+        target = _async_resolve(hass, call, "area")
+        if arm_mode != "" and target:
+            if not call.data[ATTR_VERIFY]:
+                # Answered by the readiness model
+                data = target.data.readiness.arm_status(arm_mode, target.spc_object.id)
+                return {"area": {item["area_id"]: item["reasons"] for item in data}}
             try:
-                spc = hass.data[DOMAIN][device_info.primary_config_entry]
-                data = await spc.async_get_arm_status(arm_mode, int(id[2]))
+                data = await target.data.arm_status.async_get_arm_status(
+                    target.data.spc, arm_mode, target.spc_object.id
+                )
                 return {"area": {item["area_id"]: item["reasons"] for item in data}}
             except Exception as err:
                 raise ServiceValidationError(err) from err
@@ -255,8 +344,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Websockets client
     session = aiohttp_client.async_get_clientsession(hass, verify_ssl=False)
 
-    # HTTP client
-    http_client = get_http_client(hass, verify_ssl=False)
+    # HTTP client with a connection pool of its own, not shared with other
+    # integrations
+    http_stats = SpcHttpStats()
+    http_client = create_http_client(hass, entry, http_stats)
 
     # SPC Bridge data and communication object
     spc = SpcBridge(
@@ -280,12 +371,79 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = spc
 
-    # Load SPC configuration and current status
-    try:
-        await spc.async_load_config()
-    except Exception as err:
-        _LOGGER.error("Failed to load configuration from SPC. Retrying. Err: %s", err)
-        raise ConfigEntryNotReady from err
+    # Load SPC configuration and status from the last start, or from the
+    # SPC Bridge if there is none
+    store = SpcStore(hass, entry, spc)
+    if not (stored := await store.async_load()):
+        try:
+            await store.async_load_live()
+        except Exception as err:
+            _LOGGER.error(
+                "Failed to load configuration from SPC. Retrying. Err: %s", err
+            )
+            raise ConfigEntryNotReady from err
+
+    # Commands to the SPC Bridge are scheduled by a queue per bridge, arm
+    # readiness is derived from the zone updates and arm status answers of
+    # the bridge are cached until a zone or area changes
+    readiness = SpcReadiness(hass, entry, store)
+    readiness.async_rebuild(spc)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{SIGNAL_RECONCILE}-{entry.entry_id}", readiness.async_rebuild
+        )
+    )
+    arm_status = SpcArmStatusCache()
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            f"{SIGNAL_RECONCILE}-{entry.entry_id}",
+            arm_status.async_clear,
+        )
+    )
+
+    async def async_resync() -> bool:
+        """Apply the current states, return True if any changed."""
+        try:
+            changed = await store.async_resync()
+        except Exception as err:
+            _LOGGER.warning("Failed to resync status from SPC. Err: %s", err)
+            return False
+        if changed is None:
+            reconcile_debouncer.async_schedule_call()
+            return True
+        return changed
+
+    # Websocket frames are appended to a file in the configuration directory
+    # while recording is enabled in the options
+    recorder = SpcFrameRecorder(
+        hass,
+        recording_path(hass, entry),
+        {entry.options.get(key, "") for key in CREDENTIAL_OPTIONS},
+    )
+    recorder.enabled = entry.options.get(CONF_RECORD_FRAMES, DEFAULT_RECORD_FRAMES)
+    entry.async_on_unload(recorder.async_flush)
+
+    # The websocket reconnects with backoff and resyncs the states, while it
+    # is down the states are polled
+    connection = SpcConnection(hass, entry, spc, session, async_resync, recorder)
+    entry.async_on_unload(connection.async_stop)
+    entry.runtime_data = SpcRuntimeData(
+        spc=spc,
+        commands=SpcCommandQueue(hass),
+        readiness=readiness,
+        arm_status=arm_status,
+        connection=connection,
+        http_client=http_client,
+        http_stats=http_stats,
+        dispatcher=dispatcher,
+        perf=perf,
+        store=store,
+    )
+
+    # Services resolve their target device through the device index
+    resolver = hass.data.setdefault(DATA_RESOLVER, SpcDeviceResolver(hass))
+    entry.async_on_unload(resolver.async_add_entry(entry))
 
     # Register SPC Bridge
     device_registry = dr.async_get(hass)
@@ -305,8 +463,59 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Create new devices and recreate changed devices with the new settings.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # start listening for incoming events over websocket
-    spc.ws_start()
+    async def async_refresh() -> None:
+        """Apply the live SPC data, retrying while the bridge is unreachable."""
+        while True:
+            try:
+                changes = await store.async_refresh()
+                break
+            except SpcException as err:
+                _LOGGER.warning(
+                    "Failed to refresh configuration from SPC. Retrying. Err: %s", err
+                )
+            await asyncio.sleep(REFRESH_RETRY_INTERVAL)
+        if changes:
+            async_apply_changes(hass, entry, spc, changes)
+        else:
+            # Entities with restored states are available again
+            async_dispatcher_send(hass, f"{SIGNAL_RECONCILE}-{entry.entry_id}", spc)
+
+    async def async_reconcile() -> None:
+        """Reload the SPC configuration and update the changed objects."""
+        try:
+            changes = await store.async_refresh()
+        except Exception as err:
+            _LOGGER.warning("Failed to reload configuration from SPC. Err: %s", err)
+            return
+        if changes:
+            async_apply_changes(hass, entry, spc, changes)
+
+    # The panel may request several reloads in a row when it is configured
+    reconcile_debouncer = Debouncer(
+        hass,
+        _LOGGER,
+        cooldown=RECONCILE_COOLDOWN,
+        immediate=False,
+        function=async_reconcile,
+    )
+    entry.async_on_unload(reconcile_debouncer.async_shutdown)
+
+    @callback
+    def async_update_health(now=None) -> None:
+        async_dispatcher_send(hass, f"{SIGNAL_UPDATE_HEALTH}-{entry.entry_id}")
+
+    entry.async_on_unload(
+        async_track_time_interval(hass, async_update_health, HEALTH_UPDATE_INTERVAL)
+    )
+
+    if stored:
+        # Entities are created from stored data, refresh it in the background
+        entry.async_create_background_task(
+            hass, async_refresh(), f"{DOMAIN}_refresh_{entry.entry_id}"
+        )
+    # start listening for incoming events over websocket, updates received
+    # during the refresh are kept
+    connection.async_start()
 
     # Register service calls
     if not hass.services.has_service(DOMAIN, "panel_command"):
@@ -380,6 +589,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             ),
         )
 
+    if not hass.services.has_service(DOMAIN, "bulk_command"):
+        hass.services.async_register(
+            DOMAIN,
+            "bulk_command",
+            async_bulk_command,
+            vol.Schema(
+                {
+                    vol.Optional(ATTR_DEVICE_ID, default=[]): vol.All(
+                        cv.ensure_list, [cv.string]
+                    ),
+                    vol.Optional(ATTR_ENTITY_ID, default=[]): cv.entity_ids,
+                    vol.Required(ATTR_CODE, default=""): cv.string,
+                    vol.Required(ATTR_COMMAND): cv.string,
+                    vol.Optional(
+                        ATTR_CONCURRENCY, default=BULK_COMMAND_CONCURRENCY
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+                }
+            ),
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
     if not hass.services.has_service(DOMAIN, "get_panel_arm_status"):
         hass.services.async_register(
             DOMAIN,
@@ -389,6 +619,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 {
                     vol.Required(ATTR_DEVICE_ID): cv.string,
                     vol.Required("arm_mode"): cv.string,
+                    vol.Optional(ATTR_VERIFY, default=False): cv.boolean,
                 }
             ),
             supports_response=SupportsResponse.ONLY,
@@ -403,20 +634,51 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 {
                     vol.Required(ATTR_DEVICE_ID): cv.string,
                     vol.Required("arm_mode"): cv.string,
+                    vol.Optional(ATTR_VERIFY, default=False): cv.boolean,
                 }
             ),
             supports_response=SupportsResponse.ONLY,
         )
 
+    if not hass.services.has_service(DOMAIN, "profile"):
+        hass.services.async_register(
+            DOMAIN,
+            "profile",
+            async_profile_service,
+            vol.Schema(
+                {
+                    vol.Optional(ATTR_DURATION, default=PROFILE_DURATION): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=600)
+                    ),
+                }
+            ),
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+    if not hass.services.has_service(DOMAIN, "replay"):
+        hass.services.async_register(
+            DOMAIN,
+            "replay",
+            async_replay_service,
+            vol.Schema(
+                {
+                    vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+                    vol.Optional(ATTR_FILE): cv.string,
+                    vol.Optional(ATTR_SPEED, default=1): vol.All(
+                        vol.Coerce(float), vol.Range(min=0, max=1000)
+                    ),
+                }
+            ),
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
     async def async_websocket_close(_: Event | None = None) -> None:
         """Close websocket connection to the Bridge."""
-        if spc is not None:
-            spc.ws_stop()
+        connection.async_stop()
 
     entry.async_on_unload(
         hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_websocket_close)
     )
-    entry.async_on_unload(async_websocket_close)
 
     current_options = {**entry.options}
 
@@ -428,7 +690,29 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if new_options == current_options:
             return
 
-        spc.ws_stop()
+        changed = {
+            key
+            for key in current_options.keys() | new_options.keys()
+            if current_options.get(key) != new_options.get(key)
+        }
+        if changed <= LIVE_OPTIONS:
+            # Include modes, users and tuning are applied without a reload
+            old_options = current_options
+            current_options = new_options
+            dispatcher.set_coalesce_window(
+                new_options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW)
+            )
+            dispatcher.set_slow_event_threshold(
+                new_options.get(CONF_SLOW_EVENT_THRESHOLD, DEFAULT_SLOW_EVENT_THRESHOLD)
+            )
+            await recorder.async_set_enabled(
+                new_options.get(CONF_RECORD_FRAMES, DEFAULT_RECORD_FRAMES)
+            )
+            store.set_users_config(new_options[CONF_USERS_DATA])
+            async_apply_options(hass, entry, old_options, new_options)
+            return
+
+        connection.async_stop()
         await hass.config_entries.async_reload(entry.entry_id)
 
     # Listen on configuration changes
@@ -454,12 +738,134 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.services.async_remove(DOMAIN, "zone_command")
         hass.services.async_remove(DOMAIN, "output_command")
         hass.services.async_remove(DOMAIN, "door_command")
+        hass.services.async_remove(DOMAIN, "bulk_command")
         hass.services.async_remove(DOMAIN, "get_panel_arm_status")
         hass.services.async_remove(DOMAIN, "get_area_arm_status")
+        hass.services.async_remove(DOMAIN, "profile")
+        hass.services.async_remove(DOMAIN, "replay")
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored SPC data of a removed config entry."""
+    await async_remove_store(hass, entry)
+
+
+async def _async_check_admin(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Raise if the service is not called by an admin user."""
+    if call.context.user_id:
+        user = await hass.auth.async_get_user(call.context.user_id)
+        if user is None:
+            raise UnknownUser(context=call.context)
+        if not user.is_admin:
+            raise Unauthorized(context=call.context)
+
+
+def _arm_status_mode(arm_mode: str) -> str:
+    """Return the arm mode of the SPC Bridge arm status, "" if there is none.
+
+    The forced and delayed modes are answered like their normal mode.
+    """
+    for mode in ("set_a", "set_b", "set", "disarm"):
+        if arm_mode.startswith(mode):
+            return mode
+    return ""
+
+
+def _command_error(err: dict | list | None) -> str | None:
+    """Return the error message of a command result, if it failed."""
+    if isinstance(err, dict):
+        # Panel commands return the result of each area
+        err = [err] if "code" in err else list(err.values())
+    for e in err or []:
+        if isinstance(e, dict) and e.get("code", 0) > 0:
+            return e.get("message", f"Error {e['code']}")
+    return None
+
+
+@callback
+def _async_resolve(
+    hass: HomeAssistant, call: ServiceCall, object_type: str
+) -> SpcTarget | None:
+    """Return the SPC object of the device of a service call.
+
+    None is returned if the device is a SPC device of another type.
+    """
+    resolver = hass.data[DATA_RESOLVER]
+    if (target := resolver.async_resolve(call.data[ATTR_DEVICE_ID])) is None:
+        raise vol.Invalid("Invalid device ID specified")
+    if target.object_type != object_type:
+        return None
+    return target
+
+
+@callback
+def async_apply_changes(
+    hass: HomeAssistant, entry: ConfigEntry, spc: SpcBridge, changes: SpcChanges
+) -> None:
+    """Update devices and entities to a changed SPC configuration."""
+    device_registry = dr.async_get(hass)
+    for object_type, id in changes.removed:
+        if device := device_registry.async_get_device(
+            identifiers={(DOMAIN, f"{entry.unique_id}-{object_type}-{id}")}
+        ):
+            device_registry.async_remove_device(device.id)
+
+    # Renamed objects
+    for object_type, objects in (
+        ("area", spc.areas),
+        ("zone", spc.zones),
+        ("output", spc.outputs),
+        ("door", spc.doors),
+    ):
+        for id, spc_object in objects.items():
+            if (
+                device := device_registry.async_get_device(
+                    identifiers={(DOMAIN, f"{entry.unique_id}-{object_type}-{id}")}
+                )
+            ) and device.name != spc_object.name:
+                device_registry.async_update_device(device.id, name=spc_object.name)
+
+    async_dispatcher_send(hass, f"{SIGNAL_RECONCILE}-{entry.entry_id}", spc)
+    async_dispatcher_send(
+        hass, f"{SIGNAL_ADD_ENTITIES}-{entry.entry_id}", changes.added
+    )
+
+
+@callback
+def async_apply_options(
+    hass: HomeAssistant, entry: ConfigEntry, old_options: dict, new_options: dict
+) -> None:
+    """Add and remove devices and entities for changed include modes."""
+    device_registry = dr.async_get(hass)
+    added = set()
+    for object_type, option in INCLUDE_OPTIONS.items():
+        old_modes = old_options.get(option, {})
+        new_modes = new_options.get(option, {})
+        for id in old_modes.keys() | new_modes.keys():
+            was_included = _is_included(object_type, old_modes.get(id))
+            is_included = _is_included(object_type, new_modes.get(id))
+            if is_included and not was_included:
+                added.add((object_type, int(id)))
+            elif was_included and not is_included:
+                if device := device_registry.async_get_device(
+                    identifiers={(DOMAIN, f"{entry.unique_id}-{object_type}-{id}")}
+                ):
+                    device_registry.async_remove_device(device.id)
+
+    # Zones changing between include modes update their device class
+    async_dispatcher_send(hass, f"{SIGNAL_OPTIONS_UPDATED}-{entry.entry_id}")
+    if added:
+        async_dispatcher_send(hass, f"{SIGNAL_ADD_ENTITIES}-{entry.entry_id}", added)
+
+
+def _is_included(object_type: str, mode: str | None) -> bool:
+    if object_type == "zone":
+        return mode not in (None, "exclude")
+    return mode == "include"
+
+
 async def async_remove_changed_devices(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -9,7 +9,9 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from pyspcbridge import SpcBridge
 from pyspcbridge.area import Area
@@ -22,8 +24,19 @@ from .const import (
     CONF_OUTPUTS_INCLUDE_DATA,
     CONF_ZONES_INCLUDE_DATA,
     DOMAIN,
+    SIGNAL_ADD_ENTITIES,
+    SIGNAL_OPTIONS_UPDATED,
+    SIGNAL_UPDATE_READINESS,
 )
-from .entity import SpcAreaEntity, SpcOutputEntity, SpcPanelEntity, SpcZoneEntity
+from .entity import (
+    SpcAreaEntity,
+    SpcBridgeEntity,
+    SpcOutputEntity,
+    SpcPanelEntity,
+    SpcZoneEntity,
+)
+from .models import SpcRuntimeData
+from .readiness import SpcReadiness
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -44,39 +57,63 @@ async def async_setup_entry(
 ) -> None:
     """Set up SPC binary sensors based on config entry."""
     api: SpcBridge = hass.data[DOMAIN][entry.entry_id]
-    entities = []
-    entities.append(SpcPanelIntrusionBinarySensor(entry, api.panel))
-    entities.append(SpcPanelFireBinarySensor(entry, api.panel))
-    entities.append(SpcPanelTamperBinarySensor(entry, api.panel))
-    entities.append(SpcPanelProblemBinarySensor(entry, api.panel))
-    entities.append(SpcPanelVerifiedBinarySensor(entry, api.panel))
-
-    included_areas = entry.options[CONF_AREAS_INCLUDE_DATA]
-    for area in api.areas.values():
-        if included_areas.get(str(area.id)) == "include":
-            entities.append(SpcAreaIntrusionBinarySensor(entry, area))
-            entities.append(SpcAreaFireBinarySensor(entry, area))
-            entities.append(SpcAreaTamperBinarySensor(entry, area))
-            entities.append(SpcAreaProblemBinarySensor(entry, area))
-            entities.append(SpcAreaVerifiedBinarySensor(entry, area))
-
-    included_zones = entry.options[CONF_ZONES_INCLUDE_DATA]
-    for zone in api.zones.values():
-        if id := included_zones.get(str(zone.id)):
-            if device_class := _get_device_class(id):
-                entities.append(SpcZoneStateBinarySensor(entry, zone, device_class))
-                entities.append(SpcZoneAlarmBinarySensor(entry, zone))
-                entities.append(SpcZoneTamperBinarySensor(entry, zone))
-                entities.append(SpcZoneProblemBinarySensor(entry, zone))
-                entities.append(SpcZoneInhibitedBinarySensor(entry, zone))
-                entities.append(SpcZoneIsolatedBinarySensor(entry, zone))
-
-    included_outputs = entry.options[CONF_OUTPUTS_INCLUDE_DATA]
-    for output in api.outputs.values():
-        if included_outputs.get(str(output.id)) == "include":
-            entities.append(SpcOutputStateBinarySensor(entry, output))
-
-    async_add_entities(entities)
+
+    @callback
+    def async_add_spc_entities(keys: set[tuple[str, int]] | None = None) -> None:
+        """Add entities of all SPC objects, or only of the objects in keys."""
+        entities = []
+        if keys is None:
+            entities.append(SpcPanelIntrusionBinarySensor(entry, api.panel))
+            entities.append(SpcPanelFireBinarySensor(entry, api.panel))
+            entities.append(SpcPanelTamperBinarySensor(entry, api.panel))
+            entities.append(SpcPanelProblemBinarySensor(entry, api.panel))
+            entities.append(SpcPanelVerifiedBinarySensor(entry, api.panel))
+            entities.append(SpcBridgeConnectedBinarySensor(entry, entry.runtime_data))
+
+        included_areas = entry.options[CONF_AREAS_INCLUDE_DATA]
+        for area in api.areas.values():
+            if keys is not None and ("area", area.id) not in keys:
+                continue
+            if included_areas.get(str(area.id)) == "include":
+                entities.append(SpcAreaIntrusionBinarySensor(entry, area))
+                entities.append(SpcAreaFireBinarySensor(entry, area))
+                entities.append(SpcAreaTamperBinarySensor(entry, area))
+                entities.append(SpcAreaProblemBinarySensor(entry, area))
+                entities.append(SpcAreaVerifiedBinarySensor(entry, area))
+                entities.append(
+                    SpcAreaReadyBinarySensor(entry, area, entry.runtime_data.readiness)
+                )
+
+        included_zones = entry.options[CONF_ZONES_INCLUDE_DATA]
+        for zone in api.zones.values():
+            if keys is not None and ("zone", zone.id) not in keys:
+                continue
+            if id := included_zones.get(str(zone.id)):
+                if device_class := _get_device_class(id):
+                    entities.append(SpcZoneStateBinarySensor(entry, zone, device_class))
+                    entities.append(SpcZoneAlarmBinarySensor(entry, zone))
+                    entities.append(SpcZoneTamperBinarySensor(entry, zone))
+                    entities.append(SpcZoneProblemBinarySensor(entry, zone))
+                    entities.append(SpcZoneInhibitedBinarySensor(entry, zone))
+                    entities.append(SpcZoneIsolatedBinarySensor(entry, zone))
+
+        included_outputs = entry.options[CONF_OUTPUTS_INCLUDE_DATA]
+        for output in api.outputs.values():
+            if keys is not None and ("output", output.id) not in keys:
+                continue
+            if included_outputs.get(str(output.id)) == "include":
+                entities.append(SpcOutputStateBinarySensor(entry, output))
+
+        async_add_entities(entities)
+
+    async_add_spc_entities()
+
+    # Entities of SPC objects added to the configuration of the panel
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{SIGNAL_ADD_ENTITIES}-{entry.entry_id}", async_add_spc_entities
+        )
+    )
 
 
 class SpcPanelIntrusionBinarySensor(SpcPanelEntity, BinarySensorEntity):
@@ -89,12 +126,10 @@ class SpcPanelIntrusionBinarySensor(SpcPanelEntity, BinarySensorEntity):
         super().__init__(entry=entry, panel=panel, suffix="intrusion")
         self._attr_device_class = None  # There is no specific class for alarm
 
-    @property
-    def is_on(self) -> bool:
-        _LOGGER.debug(
-            "Entity: %s, State: %s", self._attr_unique_id, self._panel.intrusion
-        )
-        return self._panel.intrusion
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_is_on = self._panel.intrusion
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
 
 
 class SpcPanelFireBinarySensor(SpcPanelEntity, BinarySensorEntity):
@@ -107,10 +142,10 @@ class SpcPanelFireBinarySensor(SpcPanelEntity, BinarySensorEntity):
         super().__init__(entry=entry, panel=panel, suffix="fire")
         self._attr_device_class = None  # There is no specific class for alarm
 
-    @property
-    def is_on(self) -> bool:
-        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._panel.fire)
-        return self._panel.fire
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_is_on = self._panel.fire
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
 
 
 class SpcPanelTamperBinarySensor(SpcPanelEntity, BinarySensorEntity):
@@ -123,10 +158,10 @@ class SpcPanelTamperBinarySensor(SpcPanelEntity, BinarySensorEntity):
         super().__init__(entry=entry, panel=panel, suffix="tamper")
         self._attr_device_class = None  # There is no specific class for alarm
 
-    @property
-    def is_on(self) -> bool:
-        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._panel.tamper)
-        return self._panel.tamper
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_is_on = self._panel.tamper
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
 
 
 class SpcPanelProblemBinarySensor(SpcPanelEntity, BinarySensorEntity):
@@ -139,12 +174,10 @@ class SpcPanelProblemBinarySensor(SpcPanelEntity, BinarySensorEntity):
         super().__init__(entry=entry, panel=panel, suffix="problem")
         self._attr_device_class = None  # There is no specific class for alarm
 
-    @property
-    def is_on(self) -> bool:
-        _LOGGER.debug(
-            "Entity: %s, State: %s", self._attr_unique_id, self._panel.problem
-        )
-        return self._panel.problem
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_is_on = self._panel.problem
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
 
 
 class SpcPanelVerifiedBinarySensor(SpcPanelEntity, BinarySensorEntity):
@@ -157,12 +190,10 @@ class SpcPanelVerifiedBinarySensor(SpcPanelEntity, BinarySensorEntity):
         super().__init__(entry=entry, panel=panel, suffix="verified")
         self._attr_device_class = None  # There is no specific class for alarm
 
-    @property
-    def is_on(self) -> bool:
-        _LOGGER.debug(
-            "Entity: %s, State: %s", self._attr_unique_id, self._panel.verified
-        )
-        return self._panel.verified
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_is_on = self._panel.verified
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
 
 
 class SpcAreaIntrusionBinarySensor(SpcAreaEntity, BinarySensorEntity):
@@ -175,12 +206,10 @@ class SpcAreaIntrusionBinarySensor(SpcAreaEntity, BinarySensorEntity):
         super().__init__(entry=entry, area=area, suffix="intrusion")
         self._attr_device_class = None  # There is no specific class for alarm
 
-    @property
-    def is_on(self) -> bool:
-        _LOGGER.debug(
-            "Entity: %s, State: %s", self._attr_unique_id, self._area.intrusion
-        )
-        return self._area.intrusion
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_is_on = self._area.intrusion
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
 
 
 class SpcAreaFireBinarySensor(SpcAreaEntity, BinarySensorEntity):
@@ -193,10 +222,10 @@ class SpcAreaFireBinarySensor(SpcAreaEntity, BinarySensorEntity):
         super().__init__(entry=entry, area=area, suffix="fire")
         self._attr_device_class = None  # There is no specific class for alarm
 
-    @property
-    def is_on(self) -> bool:
-        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._area.fire)
-        return self._area.fire
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_is_on = self._area.fire
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
 
 
 class SpcAreaTamperBinarySensor(SpcAreaEntity, BinarySensorEntity):
@@ -209,10 +238,10 @@ class SpcAreaTamperBinarySensor(SpcAreaEntity, BinarySensorEntity):
         super().__init__(entry=entry, area=area, suffix="tamper")
         self._attr_device_class = None  # There is no specific class for alarm
 
-    @property
-    def is_on(self) -> bool:
-        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._area.tamper)
-        return self._area.tamper
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_is_on = self._area.tamper
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
 
 
 class SpcAreaProblemBinarySensor(SpcAreaEntity, BinarySensorEntity):
@@ -225,10 +254,10 @@ class SpcAreaProblemBinarySensor(SpcAreaEntity, BinarySensorEntity):
         super().__init__(entry=entry, area=area, suffix="problem")
         self._attr_device_class = None  # There is no specific class for alarm
 
-    @property
-    def is_on(self) -> bool:
-        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._area.problem)
-        return self._area.problem
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_is_on = self._area.problem
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
 
 
 class SpcAreaVerifiedBinarySensor(SpcAreaEntity, BinarySensorEntity):
@@ -241,12 +270,30 @@ class SpcAreaVerifiedBinarySensor(SpcAreaEntity, BinarySensorEntity):
         super().__init__(entry=entry, area=area, suffix="verified")
         self._attr_device_class = None  # There is no specific class for alarm
 
-    @property
-    def is_on(self) -> bool:
-        _LOGGER.debug(
-            "Entity: %s, State: %s", self._attr_unique_id, self._area.verified
-        )
-        return self._area.verified
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_is_on = self._area.verified
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
+
+
+class SpcAreaReadyBinarySensor(SpcAreaEntity, BinarySensorEntity):
+    """Representation of the readiness of a SPC area to be set."""
+
+    _attr_translation_key = "area_ready"
+
+    def __init__(self, entry: ConfigEntry, area: Area, readiness: SpcReadiness) -> None:
+        """Initialize the sensor device."""
+        super().__init__(entry=entry, area=area, suffix="ready")
+        # Updated by the readiness model instead of the area
+        self._signal = f"{SIGNAL_UPDATE_READINESS}-{entry.unique_id}-{area.id}"
+        self._readiness = readiness
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        reasons = self._readiness.reasons(self._area.id, "set")
+        self._attr_is_on = not reasons
+        self._attr_extra_state_attributes = {"reasons": reasons}
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
 
 
 class SpcZoneStateBinarySensor(SpcZoneEntity, BinarySensorEntity):
@@ -257,22 +304,49 @@ class SpcZoneStateBinarySensor(SpcZoneEntity, BinarySensorEntity):
         super().__init__(entry=entry, zone=zone, suffix="state")
         self._attr_device_class = device_class
 
-    @property
-    def extra_state_attributes(self):
-        return {
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to updates and option changes"""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"{SIGNAL_OPTIONS_UPDATED}-{self._entry.entry_id}",
+                self._options_callback,
+            )
+        )
+
+    @callback
+    def _options_callback(self) -> None:
+        """Apply a changed include mode of the zone."""
+        device_class = _get_device_class(
+            self._entry.options[CONF_ZONES_INCLUDE_DATA].get(str(self._zone.id))
+        )
+        if device_class is None or device_class == self._attr_device_class:
+            return
+        self._attr_device_class = device_class
+        # The registry update writes the state
+        er.async_get(self.hass).async_update_entity(
+            self.entity_id, original_device_class=device_class
+        )
+
+    def _update_static_attrs(self) -> None:
+        self._static_attrs = {
             "unique_id": self._attr_unique_id,
             "name": self._zone.name,
+            "area_name": self._zone._area.name,
+        }
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_is_on = self._zone.state
+        self._attr_extra_state_attributes = {
+            **self._static_attrs,
             "input": self._zone.input,
             "inhibited": self._zone.inhibited,
             "isolated": self._zone.isolated,
             "alarm_status": self._zone.alarm_status,
-            "area_name": self._zone._area.name,
         }
-
-    @property
-    def is_on(self) -> bool:
-        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._zone.state)
-        return self._zone.state
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
 
 
 class SpcZoneAlarmBinarySensor(SpcZoneEntity, BinarySensorEntity):
@@ -285,15 +359,16 @@ class SpcZoneAlarmBinarySensor(SpcZoneEntity, BinarySensorEntity):
         super().__init__(entry=entry, zone=zone, suffix="alarm")
         self._attr_device_class = None  # There is no specific class for alarm
 
-    @property
-    def is_on(self) -> bool:
+    @callback
+    def _async_update_attrs(self) -> None:
+        alarm_status = self._zone.alarm_status
         _LOGGER.debug(
             "Entity: %s, Intrusion: %s, Fire: %s",
             self._attr_unique_id,
-            self._zone.intrusion,
-            self._zone.fire,
+            alarm_status["intrusion"],
+            alarm_status["fire"],
         )
-        return self._zone.intrusion or self._zone.fire
+        self._attr_is_on = alarm_status["intrusion"] or alarm_status["fire"]
 
 
 class SpcZoneTamperBinarySensor(SpcZoneEntity, BinarySensorEntity):
@@ -306,10 +381,10 @@ class SpcZoneTamperBinarySensor(SpcZoneEntity, BinarySensorEntity):
         super().__init__(entry=entry, zone=zone, suffix="tamper")
         self._attr_device_class = None
 
-    @property
-    def is_on(self) -> bool:
-        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._zone.tamper)
-        return self._zone.tamper
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_is_on = self._zone.tamper
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
 
 
 class SpcZoneProblemBinarySensor(SpcZoneEntity, BinarySensorEntity):
@@ -322,10 +397,10 @@ class SpcZoneProblemBinarySensor(SpcZoneEntity, BinarySensorEntity):
         super().__init__(entry=entry, zone=zone, suffix="problem")
         self._attr_device_class = None
 
-    @property
-    def is_on(self) -> bool:
-        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._zone.problem)
-        return self._zone.problem
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_is_on = self._zone.problem
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
 
 
 class SpcZoneInhibitedBinarySensor(SpcZoneEntity, BinarySensorEntity):
@@ -338,12 +413,10 @@ class SpcZoneInhibitedBinarySensor(SpcZoneEntity, BinarySensorEntity):
         super().__init__(entry=entry, zone=zone, suffix="inhibited")
         self._attr_device_class = None
 
-    @property
-    def is_on(self) -> bool:
-        _LOGGER.debug(
-            "Entity: %s, State: %s", self._attr_unique_id, self._zone.inhibited
-        )
-        return self._zone.inhibited
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_is_on = self._zone.inhibited
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
 
 
 class SpcZoneIsolatedBinarySensor(SpcZoneEntity, BinarySensorEntity):
@@ -356,12 +429,10 @@ class SpcZoneIsolatedBinarySensor(SpcZoneEntity, BinarySensorEntity):
         super().__init__(entry=entry, zone=zone, suffix="isolated")
         self._attr_device_class = None
 
-    @property
-    def is_on(self) -> bool:
-        _LOGGER.debug(
-            "Entity: %s, State: %s", self._attr_unique_id, self._zone.isolated
-        )
-        return self._zone.isolated
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_is_on = self._zone.isolated
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
 
 
 class SpcOutputStateBinarySensor(SpcOutputEntity, BinarySensorEntity):
@@ -374,15 +445,33 @@ class SpcOutputStateBinarySensor(SpcOutputEntity, BinarySensorEntity):
         super().__init__(entry=entry, output=output, suffix="state")
         self._attr_device_class = None  # There is no specific class for alarm
 
-    @property
-    def is_on(self) -> bool:
-        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._output.state)
-        return self._output.state
-
-    @property
-    def extra_state_attributes(self):
-        return {
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_is_on = self._output.state
+        self._attr_extra_state_attributes = {
             "unique_id": self._attr_unique_id,
             "name": self._output.name,
             "state": self._output.state,
         }
+        _LOGGER.debug("Entity: %s, State: %s", self._attr_unique_id, self._attr_is_on)
+
+
+class SpcBridgeConnectedBinarySensor(SpcBridgeEntity, BinarySensorEntity):
+    """Representation of the websocket connection to the SPC Bridge."""
+
+    _attr_translation_key = "bridge_connected"
+    _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
+
+    def __init__(self, entry: ConfigEntry, data: SpcRuntimeData) -> None:
+        """Initialize the sensor device."""
+        super().__init__(entry=entry, data=data, suffix="connected")
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        connection = self._data.connection
+        self._attr_is_on = connection.connected
+        self._attr_extra_state_attributes = {
+            "polling": connection.poll_interval is not None,
+            "poll_interval": connection.poll_interval,
+            "polls": connection.polls,
+        }
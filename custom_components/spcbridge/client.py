@@ -0,0 +1,125 @@
+"""HTTP client of a SPC Bridge."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any
+
+import httpx
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.httpx_client import create_async_httpx_client
+from homeassistant.util.ssl import get_default_no_verify_context
+
+HTTP_CONNECT_TIMEOUT = 3  # s
+HTTP_READ_TIMEOUT = 8  # s, arming commands may take a while
+HTTP_MAX_CONNECTIONS = 4
+HTTP_KEEPALIVE_EXPIRY = 60  # s
+HTTP_LATENCY_SAMPLES = 100  # requests the round-trip percentiles are based on
+
+HTTP_TIMEOUT = httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+
+# Request extension with the state of a request of the bridge
+EXTENSION_REQUEST = "spcbridge_request"
+
+
+class SpcDelivery:
+    """Whether a request of a caller was sent to the SPC Bridge."""
+
+    sent = False
+
+
+# Set by a caller that needs to know whether its requests reached the bridge,
+# e.g. to retry a command only if it was never sent. The requests are sent in
+# the task of the caller, so they see its delivery.
+REQUEST_DELIVERY: ContextVar[SpcDelivery | None] = ContextVar(
+    "spc_request_delivery", default=None
+)
+
+
+class _SpcRequest:
+    """Start, delivery and failure of one request, reported by httpcore."""
+
+    def __init__(self, stats: SpcHttpStats) -> None:
+        self._stats = stats
+        self._delivery = REQUEST_DELIVERY.get()
+        self.start = time.monotonic()
+        self.failed = False
+
+    async def async_trace(self, event_name: str, info: dict[str, Any]) -> None:
+        if self._delivery is not None and event_name.endswith(
+            ".send_request_headers.started"
+        ):
+            # Once sending started, the bridge may act on the request
+            self._delivery.sent = True
+        elif event_name.endswith(".failed") and not self.failed:
+            self.failed = True
+            self._stats.failures += 1
+
+
+class SpcHttpStats:
+    """Round-trip times of the requests to one SPC Bridge.
+
+    Tracked by event hooks of the HTTP client, the round-trip times of the
+    last requests are kept for the health sensors. pyspcbridge passes a flat
+    timeout with every request, the request hook replaces it by the connect
+    and read timeouts of the bridge.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self._latencies: deque[float] = deque(maxlen=HTTP_LATENCY_SAMPLES)
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def event_hooks(self) -> dict[str, list]:
+        """Return the event hooks of the HTTP client."""
+        return {"request": [self._async_request], "response": [self._async_response]}
+
+    def latency(self, percentile: int) -> float | None:
+        """Return a percentile (ms) of the round-trip times of the last requests."""
+        if not self._latencies:
+            return None
+        latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, len(latencies) * percentile // 100)
+        return round(latencies[index] * 1000, 1)
+
+    async def _async_request(self, request: httpx.Request) -> None:
+        self.requests += 1
+        spc_request = _SpcRequest(self)
+        request.extensions[EXTENSION_REQUEST] = spc_request
+        request.extensions["timeout"] = HTTP_TIMEOUT.as_dict()
+        request.extensions["trace"] = spc_request.async_trace
+
+    async def _async_response(self, response: httpx.Response) -> None:
+        if spc_request := response.request.extensions.get(EXTENSION_REQUEST):
+            self._latencies.append(time.monotonic() - spc_request.start)
+
+
+def create_http_client(
+    hass: HomeAssistant, entry: ConfigEntry, stats: SpcHttpStats
+) -> httpx.AsyncClient:
+    """Create the HTTP client of a SPC Bridge.
+
+    The client has a connection pool of its own, not shared with other
+    integrations, which is closed when the entry is unloaded.
+    """
+    transport = httpx.AsyncHTTPTransport(
+        verify=get_default_no_verify_context(),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+    entry.async_on_unload(transport.aclose)
+    return create_async_httpx_client(
+        hass,
+        verify_ssl=False,
+        transport=transport,
+        timeout=HTTP_TIMEOUT,
+        event_hooks=stats.event_hooks,
+    )
@@ -0,0 +1,175 @@
+"""Schedule commands sent to a SPC Bridge."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .client import REQUEST_DELIVERY, SpcDelivery
+from .stats import LatencyHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+COMMAND_CONCURRENCY = 2
+COMMAND_TIMEOUT = 10  # s
+COMMAND_RETRIES = 2
+COMMAND_BACKOFF = 1  # s, doubled for every retry
+
+# Error code returned by pyspcbridge when the bridge could not be reached
+ERROR_COMMUNICATION = 998
+# Result of a command without reply, the bridge may have executed it
+RESULT_NO_REPLY = {
+    "code": 999,
+    "message": "ERROR: No reply from the SPC Bridge, the command may have been "
+    "executed",
+}
+
+
+def _communication_failed(result: Any) -> bool:
+    return isinstance(result, dict) and result.get("code") == ERROR_COMMUNICATION
+
+
+class SpcCommandQueue:
+    """Command scheduler of one SPC Bridge.
+
+    At most `concurrency` commands are sent to the bridge at the same time,
+    the others wait in order. A caller may pass its own limit for a command,
+    e.g. the bulk command, which then waits until fewer commands than its
+    limit are running. An identical command for the same SPC object
+    that is still pending is not sent again, the callers share its result.
+    Commands that failed before they were sent to the bridge are retried with
+    backoff. A command that was sent is never repeated, as arming or
+    unsetting twice is not harmless. If it is not answered in time, its
+    outcome is unknown and reported as such.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, concurrency: int = COMMAND_CONCURRENCY
+    ) -> None:
+        """Initialize the command queue."""
+        self._hass = hass
+        self._concurrency = concurrency
+        self._condition = asyncio.Condition()
+        self._running = 0
+        self._pending: dict[tuple, asyncio.Task] = {}
+        self._waiting = 0
+        self._max_pending = 0
+        self._max_waiting = 0
+        self._commands = 0
+        self._merged = 0
+        self._retries = 0
+        self._failures = 0
+        self._latency_last = 0.0
+        self._latency_max = 0.0
+        self._latency_total = 0.0
+        self._latency = LatencyHistogram()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth, counters and latency (ms) of the commands."""
+        return {
+            "pending": len(self._pending),
+            "waiting": self._waiting,
+            "max_pending": self._max_pending,
+            "max_waiting": self._max_waiting,
+            "commands": self._commands,
+            "merged": self._merged,
+            "retries": self._retries,
+            "failures": self._failures,
+            "latency_last": round(self._latency_last * 1000, 1),
+            "latency_max": round(self._latency_max * 1000, 1),
+            "latency_avg": round(
+                self._latency_total * 1000 / self._commands if self._commands else 0,
+                1,
+            ),
+            "latency_histogram": self._latency.as_dict(),
+        }
+
+    async def async_command(
+        self,
+        object_type: str,
+        spc_object: Any,
+        command: str,
+        code: str | None,
+        concurrency: int | None = None,
+    ) -> Any:
+        """Send a command to a SPC object and return the result.
+
+        concurrency replaces the limit of the queue for this command.
+        """
+        key = (object_type, spc_object.id, command, code)
+        if (task := self._pending.get(key)) is not None:
+            self._merged += 1
+        else:
+            task = self._hass.async_create_task(
+                self._async_run(
+                    spc_object, command, code, concurrency or self._concurrency
+                ),
+                f"spcbridge {object_type} {spc_object.id} {command}",
+                eager_start=False,
+            )
+            self._pending[key] = task
+            self._max_pending = max(self._max_pending, len(self._pending))
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        # A cancelled caller does not cancel the command of the others
+        return await asyncio.shield(task)
+
+    async def _async_run(
+        self, spc_object: Any, command: str, code: str | None, concurrency: int
+    ) -> Any:
+        """Send a command, retrying if it could not be sent to the bridge."""
+        start = time.monotonic()
+        self._waiting += 1
+        self._max_waiting = max(self._max_waiting, self._waiting)
+        try:
+            async with self._condition:
+                await self._condition.wait_for(lambda: self._running < concurrency)
+                self._running += 1
+        finally:
+            self._waiting -= 1
+        try:
+            for attempt in range(COMMAND_RETRIES + 1):
+                if attempt:
+                    self._retries += 1
+                    await asyncio.sleep(COMMAND_BACKOFF * 2 ** (attempt - 1))
+                delivery = SpcDelivery()
+                token = REQUEST_DELIVERY.set(delivery)
+                try:
+                    async with asyncio.timeout(COMMAND_TIMEOUT):
+                        result = await spc_object.async_command(command, code)
+                except TimeoutError:
+                    self._failures += 1
+                    result = dict(RESULT_NO_REPLY)
+                    break
+                finally:
+                    REQUEST_DELIVERY.reset(token)
+                if not _communication_failed(result):
+                    break
+                if delivery.sent:
+                    # pyspcbridge also reports a lost reply as communication
+                    # error, the bridge may have executed the command
+                    self._failures += 1
+                    break
+            else:
+                self._failures += 1
+        finally:
+            async with self._condition:
+                self._running -= 1
+                self._condition.notify_all()
+        latency = time.monotonic() - start
+        self._commands += 1
+        self._latency_last = latency
+        self._latency_max = max(self._latency_max, latency)
+        self._latency_total += latency
+        self._latency.add(latency)
+        _LOGGER.debug(
+            "Command %s sent in %.3f s, %d pending",
+            command,
+            latency,
+            len(self._pending),
+        )
+        return result
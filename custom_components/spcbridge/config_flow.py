@@ -28,12 +28,15 @@ from pyspcbridge.const import ZoneType
 
 from .const import (
     CONF_AREAS_INCLUDE_DATA,
+    CONF_COALESCE_WINDOW,
     CONF_DOORS_INCLUDE_DATA,
     CONF_GET_PASSWORD,
     CONF_GET_USERNAME,
     CONF_OUTPUTS_INCLUDE_DATA,
     CONF_PUT_PASSWORD,
     CONF_PUT_USERNAME,
+    CONF_RECORD_FRAMES,
+    CONF_SLOW_EVENT_THRESHOLD,
     CONF_USER_IDENTIFY_BY_ID,
     CONF_USER_IDENTIFY_BY_MAP,
     CONF_USER_IDENTIFY_METHOD,
@@ -48,6 +51,9 @@ from .const import (
     DEFAULT_BRIDGE_PUT_USERNAME,
     DEFAULT_BRIDGE_WS_PASSWORD,
     DEFAULT_BRIDGE_WS_USERNAME,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_RECORD_FRAMES,
+    DEFAULT_SLOW_EVENT_THRESHOLD,
     DOMAIN,
 )
 
@@ -832,6 +838,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 "option_alarm_zones",
                 "option_outputs",
                 "option_doors",
+                "option_advanced",
             ],
         )
 
@@ -1142,6 +1149,39 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             errors={},
         )
 
+    async def async_step_option_advanced(self, user_input=None):
+        """Handle the advanced option step."""
+        if user_input is not None:
+            options = deepcopy({**self.config_entry.options})
+            options.update(user_input)
+            return self.async_create_entry(title="", data=options)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="option_advanced",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_COALESCE_WINDOW,
+                        default=options.get(
+                            CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+                    vol.Required(
+                        CONF_SLOW_EVENT_THRESHOLD,
+                        default=options.get(
+                            CONF_SLOW_EVENT_THRESHOLD, DEFAULT_SLOW_EVENT_THRESHOLD
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10000)),
+                    vol.Required(
+                        CONF_RECORD_FRAMES,
+                        default=options.get(CONF_RECORD_FRAMES, DEFAULT_RECORD_FRAMES),
+                    ): bool,
+                }
+            ),
+            errors={},
+        )
+
 
 class CannotConnect(exceptions.HomeAssistantError):
     """Error to indicate we cannot connect."""
@@ -0,0 +1,328 @@
+"""Supervise the websocket connection to a SPC Bridge."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Mapping
+from datetime import datetime
+from typing import Any
+
+import aiohttp
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_DEVICE_ID, CONF_IP_ADDRESS, CONF_PORT
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+from pyspcbridge import SpcBridge
+from yarl import URL
+
+from .const import (
+    CONF_WS_PASSWORD,
+    CONF_WS_USERNAME,
+    DOMAIN,
+    EVENT_SPC,
+    SIGNAL_UPDATE_HEALTH,
+)
+from .dispatcher import FRAME_RECEIVED
+from .recorder import SpcFrameRecorder
+from .utils import parse_event
+
+_LOGGER = logging.getLogger(__name__)
+
+WS_BACKOFF_MIN = 1  # s
+WS_BACKOFF_MAX = 300  # s
+WS_RECEIVE_TIMEOUT = 30  # s, reconnect a silent websocket, as pyspcbridge
+WS_RATE_WINDOW = 60  # s, window of the frames per minute
+POLL_INTERVAL_MIN = 2  # s, after a poll with changed states
+POLL_INTERVAL_MAX = 60  # s, doubled for every poll without changes
+
+
+def websocket_url(options: Mapping[str, Any]) -> URL:
+    """Return the URL of the websocket of a SPC Bridge.
+
+    With credentials the websocket is served over TLS, as by pyspcbridge.
+    """
+    username = options.get(CONF_WS_USERNAME)
+    password = options.get(CONF_WS_PASSWORD)
+    if not (username and password):
+        return URL.build(
+            scheme="ws",
+            host=options[CONF_IP_ADDRESS],
+            port=options[CONF_PORT],
+            path="/ws/spc",
+        )
+    return URL.build(
+        scheme="wss",
+        host=options[CONF_IP_ADDRESS],
+        port=options[CONF_PORT],
+        path="/ws/spc",
+        query={
+            "username": username,
+            "password": password,
+            "flexc_poll_events": 1,
+        },
+    )
+
+
+class SpcConnection:
+    """Websocket connection of a SPC Bridge.
+
+    The websocket is run by the integration instead of pyspcbridge, which
+    reconnects a dropped websocket after a fixed 15 s. It is reconnected
+    with a jittered exponential backoff, and when the connection is up
+    again the states that changed meanwhile are resynced with one fetch
+    instead of reloading the entry. While it is down, the states are
+    polled, fast after a change and backing off while nothing changes. The
+    received frames are counted for the health sensors of the bridge, and
+    their receipt time is passed to the dispatcher to trace the latency.
+    The SIA event of every frame is fired on the event bus, as pyspcbridge
+    only keeps the last event of a burst on the panel. Frames are recorded
+    while the recorder is enabled, and recordings are replayed through the
+    same frame handling.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        spc: SpcBridge,
+        session: aiohttp.ClientSession,
+        async_resync: Callable[[], Awaitable[bool]],
+        recorder: SpcFrameRecorder,
+    ) -> None:
+        """Initialize the connection."""
+        self._hass = hass
+        self._entry = entry
+        self._spc = spc
+        self._session = session
+        self._url = websocket_url(entry.options)
+        self._async_resync = async_resync
+        # pyspcbridge has no public entry point for frames, its handler is
+        # called as is while the websocket is run by the integration
+        self._async_ws_handler = spc._ws_client._async_ws_handler
+        self.recorder = recorder
+        self._attempt = 0
+        self._connected = False
+        self._dropped = False
+        self._task: asyncio.Task | None = None
+        self._unsub_reconnect: CALLBACK_TYPE | None = None
+        self._unsub_poll: CALLBACK_TYPE | None = None
+        self._frame_times: deque[float] = deque()
+        self.reconnects = 0
+        self.frames = 0
+        self.last_frame: datetime | None = None
+        self.reconnect_delay: float | None = None
+        self.polls = 0
+        self.poll_interval: float | None = None
+        self.last_event: dict | None = None
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the websocket is connected."""
+        return self._connected
+
+    @property
+    def frames_per_minute(self) -> int:
+        """Return the number of frames received in the last minute."""
+        self._expire_frames(time.monotonic())
+        return len(self._frame_times)
+
+    @callback
+    def async_start(self) -> None:
+        """Connect the websocket in the background until the entry is unloaded."""
+        if self._task is None or self._task.done():
+            self._task = self._entry.async_create_background_task(
+                self._hass,
+                self._async_connect(),
+                f"spcbridge_websocket_{self._entry.entry_id}",
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Close the websocket and stop reconnecting and polling."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._unsub_reconnect is not None:
+            self._unsub_reconnect()
+            self._unsub_reconnect = None
+        self._async_stop_polling()
+        self._connected = False
+
+    async def async_replay(self, frames: list[tuple[float, dict]], speed: float) -> int:
+        """Handle recorded frames as if received, return the number of frames.
+
+        The frames keep their recorded intervals divided by speed, a speed of
+        0 handles one frame per event loop iteration. Returns when all frames
+        are handled.
+        """
+        if not frames:
+            return 0
+        first = frames[0][0]
+        start = time.monotonic()
+        tasks: list[asyncio.Task] = []
+        for received, frame in frames:
+            if speed:
+                delay = start + (received - first) / speed - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            # Every frame is handled in its own task, as by the websocket
+            tasks.append(
+                self._entry.async_create_task(
+                    self._hass, self._async_handle_frame(frame), eager_start=False
+                )
+            )
+            if not speed:
+                await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return len(frames)
+
+    async def _async_frame(self, data: dict) -> None:
+        """Handle a frame received by the websocket."""
+        if self.recorder.enabled:
+            self.recorder.async_record(data)
+        await self._async_handle_frame(data)
+
+    async def _async_handle_frame(self, data: dict) -> None:
+        # Copied into the update tasks created for the frame
+        token = FRAME_RECEIVED.set(time.monotonic())
+        self._count_frame()
+        frame = data.get("data") or {}
+        if event := frame.get("sia") or frame.get("event"):
+            self._async_fire_event(event)
+        try:
+            await self._async_ws_handler(data)
+        finally:
+            FRAME_RECEIVED.reset(token)
+
+    async def _async_connect(self) -> None:
+        """Receive the frames of the websocket until it is closed."""
+        try:
+            async with self._session.ws_connect(
+                self._url, receive_timeout=WS_RECEIVE_TIMEOUT
+            ) as websocket:
+                self._async_connected()
+                async for message in websocket:
+                    if message.type != aiohttp.WSMsgType.TEXT:
+                        continue
+                    try:
+                        frame = json.loads(message.data)
+                    except ValueError:
+                        _LOGGER.debug("Invalid websocket frame: %s", message.data)
+                        continue
+                    # Every frame is handled in its own task, a frame waiting
+                    # for a request to the bridge does not hold up the next
+                    self._entry.async_create_task(
+                        self._hass, self._async_frame(frame), eager_start=False
+                    )
+        except (aiohttp.ClientError, TimeoutError) as err:
+            _LOGGER.debug("Websocket to SPC Bridge failed: %s", err)
+        self._async_disconnected()
+
+    @callback
+    def _async_connected(self) -> None:
+        self._attempt = 0
+        self._connected = True
+        self.reconnect_delay = None
+        self._async_stop_polling()
+        self._async_signal()
+        if self._dropped:
+            self._dropped = False
+            self.reconnects += 1
+            _LOGGER.info("Websocket to SPC Bridge reconnected, resyncing states")
+            self._entry.async_create_background_task(
+                self._hass,
+                self._async_resync(),
+                f"spcbridge_resync_{self._entry.entry_id}",
+            )
+
+    @callback
+    def _async_disconnected(self) -> None:
+        """Schedule a reconnect and poll the states meanwhile."""
+        if self._connected:
+            self._connected = False
+            self._async_signal()
+        if self.poll_interval is None:
+            _LOGGER.info("Polling SPC Bridge while the websocket is down")
+            self.poll_interval = POLL_INTERVAL_MIN
+            self._async_schedule_poll()
+        self._dropped = True
+        delay = min(WS_BACKOFF_MAX, WS_BACKOFF_MIN * 2**self._attempt)
+        self.reconnect_delay = random.uniform(delay / 2, delay)
+        self._attempt += 1
+        self._unsub_reconnect = async_call_later(
+            self._hass, self.reconnect_delay, self._async_reconnect
+        )
+        _LOGGER.warning(
+            "Websocket to SPC Bridge lost, reconnecting in %.1f s",
+            self.reconnect_delay,
+        )
+
+    @callback
+    def _async_schedule_poll(self) -> None:
+        self._unsub_poll = async_call_later(
+            self._hass, self.poll_interval, self._async_poll
+        )
+
+    async def _async_poll(self, _now: datetime) -> None:
+        """Poll the states until the websocket is connected again."""
+        self._unsub_poll = None
+        self.polls += 1
+        changed = await self._async_resync()
+        if self.poll_interval is None:
+            # Connected while polling
+            return
+        if changed:
+            self.poll_interval = POLL_INTERVAL_MIN
+        else:
+            self.poll_interval = min(POLL_INTERVAL_MAX, self.poll_interval * 2)
+        self._async_schedule_poll()
+        self._async_signal()
+
+    @callback
+    def _async_stop_polling(self) -> None:
+        if self._unsub_poll is not None:
+            self._unsub_poll()
+            self._unsub_poll = None
+        self.poll_interval = None
+
+    @callback
+    def _async_reconnect(self, _now: datetime) -> None:
+        self._unsub_reconnect = None
+        self.async_start()
+
+    @callback
+    def _async_fire_event(self, event: dict) -> None:
+        # Parsed once, the event sensor of the panel shows the same data
+        self.last_event = parse_event(event)
+        device = dr.async_get(self._hass).async_get_device(
+            identifiers={(DOMAIN, f"{self._spc.panel.id}-panel-1")}
+        )
+        self._hass.bus.async_fire(
+            EVENT_SPC,
+            {ATTR_DEVICE_ID: device.id if device else None, **self.last_event},
+        )
+
+    def _count_frame(self) -> None:
+        now = time.monotonic()
+        self.frames += 1
+        self.last_frame = dt_util.utcnow()
+        self._frame_times.append(now)
+        self._expire_frames(now)
+
+    def _expire_frames(self, now: float) -> None:
+        while self._frame_times and self._frame_times[0] < now - WS_RATE_WINDOW:
+            self._frame_times.popleft()
+
+    @callback
+    def _async_signal(self) -> None:
+        async_dispatcher_send(
+            self._hass, f"{SIGNAL_UPDATE_HEALTH}-{self._entry.entry_id}"
+        )
@@ -6,6 +6,19 @@ LOGGER = logging.getLogger(__package__)
 
 DOMAIN = "spcbridge"
 
+SIGNAL_UPDATE_PANEL = "spc_update_panel"
+SIGNAL_UPDATE_AREA = "spc_update_area"
+SIGNAL_UPDATE_ZONE = "spc_update_zone"
+SIGNAL_UPDATE_OUTPUT = "spc_update_output"
+SIGNAL_UPDATE_DOOR = "spc_update_door"
+SIGNAL_RECONCILE = "spc_reconcile"
+SIGNAL_ADD_ENTITIES = "spc_add_entities"
+SIGNAL_OPTIONS_UPDATED = "spc_options_updated"
+SIGNAL_UPDATE_READINESS = "spc_update_readiness"
+SIGNAL_UPDATE_HEALTH = "spc_update_health"
+
+EVENT_SPC = "spcbridge_event"
+
 CONF_SECURE_COM = "secure_com"
 CONF_GET_USERNAME = "get_username"
 CONF_GET_PASSWORD = "get_password"
@@ -18,6 +31,9 @@ CONF_AREAS_INCLUDE_DATA = "areas_include_data"
 CONF_ZONES_INCLUDE_DATA = "zones_include_data"
 CONF_OUTPUTS_INCLUDE_DATA = "outputs_include_data"
 CONF_DOORS_INCLUDE_DATA = "doors_include_data"
+CONF_COALESCE_WINDOW = "coalesce_window"
+CONF_SLOW_EVENT_THRESHOLD = "slow_event_threshold"
+CONF_RECORD_FRAMES = "record_frames"
 
 CONF_USER_IDENTIFY_METHOD = "user_identify_method"
 CONF_USER_IDENTIFY_BY_ID = "user_identify_by_id"
@@ -31,6 +47,9 @@ DEFAULT_BRIDGE_PUT_PASSWORD = "put_pwd"
 DEFAULT_BRIDGE_WS_USERNAME = "ws_user"
 DEFAULT_BRIDGE_WS_PASSWORD = "ws_pwd"
 DEFAULT_CONF_CODE = ""
+DEFAULT_COALESCE_WINDOW = 0  # ms, 0 = merge updates within one event loop tick
+DEFAULT_SLOW_EVENT_THRESHOLD = 0  # ms, 0 = do not log slow updates
+DEFAULT_RECORD_FRAMES = False
 
 ATTR_ENTRY_DELAY_AWAY = "entry_delay_away"
 ATTR_ENTRY_DELAY_HOME = "entry_delay_home"
@@ -38,3 +57,10 @@ ATTR_EXIT_DELAY_AWAY = "exit_delay_away"
 ATTR_EXIT_DELAY_HOME = "exit_delay_home"
 
 ATTR_COMMAND = "command"
+ATTR_CONCURRENCY = "concurrency"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_DURATION = "duration"
+ATTR_FILE = "file"
+ATTR_SPEED = "speed"
+ATTR_VERIFY = "verify"
+ATTR_SIA_CODE = "sia_code"
@@ -0,0 +1,113 @@
+"""Provides device triggers for SPC events."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.components.homeassistant.triggers import event as event_trigger
+from homeassistant.const import (
+    ATTR_DEVICE_ID,
+    CONF_DEVICE_ID,
+    CONF_DOMAIN,
+    CONF_EVENT_DATA,
+    CONF_PLATFORM,
+    CONF_TYPE,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+
+from .const import ATTR_SIA_CODE, DOMAIN, EVENT_SPC
+
+TRIGGER_TYPE_EVENT = "spc_event"
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
+    {
+        vol.Required(CONF_TYPE): vol.In([TRIGGER_TYPE_EVENT]),
+        vol.Optional(ATTR_SIA_CODE): cv.string,
+    }
+)
+
+# Event data key identifying the SPC object of each device type
+OBJECT_ID_KEYS = {
+    "area": "area_id",
+    "zone": "zone_id",
+    "output": "output_id",
+    "door": "door_id",
+}
+
+
+def _get_spc_object(hass: HomeAssistant, device_id: str) -> tuple[str, str, int] | None:
+    """Return panel serial, object type and object id of a SPC device."""
+    device_registry = dr.async_get(hass)
+    if (device := device_registry.async_get(device_id)) is None:
+        return None
+    for domain, unique_id in device.identifiers:
+        if domain != DOMAIN:
+            continue
+        id = unique_id.split("-")
+        if len(id) == 3 and (id[1] == "panel" or id[1] in OBJECT_ID_KEYS):
+            return id[0], id[1], int(id[2])
+    return None
+
+
+async def async_get_triggers(
+    hass: HomeAssistant, device_id: str
+) -> list[dict[str, str]]:
+    """List device triggers for SPC devices."""
+    if _get_spc_object(hass, device_id) is None:
+        return []
+
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: device_id,
+            CONF_TYPE: TRIGGER_TYPE_EVENT,
+        }
+    ]
+
+
+async def async_get_trigger_capabilities(
+    hass: HomeAssistant, config: ConfigType
+) -> dict[str, vol.Schema]:
+    """List trigger capabilities."""
+    return {"extra_fields": vol.Schema({vol.Optional(ATTR_SIA_CODE): cv.string})}
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Attach a trigger."""
+    if (spc_object := _get_spc_object(hass, config[CONF_DEVICE_ID])) is None:
+        raise vol.Invalid(f"Invalid SPC device {config[CONF_DEVICE_ID]}")
+    serial, object_type, object_id = spc_object
+
+    # SPC events are fired with the device id of the panel
+    event_data = {}
+    if object_type == "panel":
+        event_data[ATTR_DEVICE_ID] = config[CONF_DEVICE_ID]
+    else:
+        device_registry = dr.async_get(hass)
+        if panel := device_registry.async_get_device(
+            identifiers={(DOMAIN, f"{serial}-panel-1")}
+        ):
+            event_data[ATTR_DEVICE_ID] = panel.id
+        event_data[OBJECT_ID_KEYS[object_type]] = object_id
+    if ATTR_SIA_CODE in config:
+        event_data[ATTR_SIA_CODE] = config[ATTR_SIA_CODE]
+
+    event_config = event_trigger.TRIGGER_SCHEMA(
+        {
+            event_trigger.CONF_PLATFORM: "event",
+            event_trigger.CONF_EVENT_TYPE: EVENT_SPC,
+            CONF_EVENT_DATA: event_data,
+        }
+    )
+    return await event_trigger.async_attach_trigger(
+        hass, event_config, action, trigger_info, platform_type="device"
+    )
@@ -0,0 +1,102 @@
+"""Diagnostics support for the SPC Bridge integration."""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .const import (
+    CONF_GET_PASSWORD,
+    CONF_GET_USERNAME,
+    CONF_PUT_PASSWORD,
+    CONF_PUT_USERNAME,
+    CONF_WS_PASSWORD,
+    CONF_WS_USERNAME,
+)
+from .models import SpcRuntimeData
+
+TO_REDACT = {
+    CONF_GET_USERNAME,
+    CONF_GET_PASSWORD,
+    CONF_PUT_USERNAME,
+    CONF_PUT_PASSWORD,
+    CONF_WS_USERNAME,
+    CONF_WS_PASSWORD,
+    # Keypad codes and SPC passwords of CONF_USERS_DATA
+    "ha_pincode",
+    "spc_password",
+    "serial",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data: SpcRuntimeData = entry.runtime_data
+    spc = data.spc
+    panel = spc.panel
+    connection = data.connection
+    http_stats = data.http_stats
+
+    entities = Counter()
+    disabled = Counter()
+    for entity in er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id):
+        entities[entity.domain] += 1
+        if entity.disabled:
+            disabled[entity.domain] += 1
+
+    return {
+        "options": async_redact_data(dict(entry.options), TO_REDACT),
+        "panel": async_redact_data(
+            {
+                "type": panel.type,
+                "model": panel.model,
+                "serial": panel.serial,
+                "firmware": panel.firmware,
+                "pincode_length": panel.pincode_length,
+            },
+            TO_REDACT,
+        ),
+        "objects": {
+            "users": len(spc.users),
+            "areas": len(spc.areas),
+            "zones": len(spc.zones),
+            "outputs": len(spc.outputs),
+            "doors": len(spc.doors),
+        },
+        "entities": {
+            domain: {"total": count, "disabled": disabled[domain]}
+            for domain, count in sorted(entities.items())
+        },
+        "connection": {
+            "connected": connection.connected,
+            "frames": connection.frames,
+            "frames_per_minute": connection.frames_per_minute,
+            "last_frame": connection.last_frame,
+            "reconnects": connection.reconnects,
+            "reconnect_delay": connection.reconnect_delay,
+            "polls": connection.polls,
+            "poll_interval": connection.poll_interval,
+        },
+        "http": {
+            "requests": http_stats.requests,
+            "failures": http_stats.failures,
+            "latency_p50": http_stats.latency(50),
+            "latency_p95": http_stats.latency(95),
+        },
+        "dispatcher": data.dispatcher.stats,
+        "event_latency": {
+            object_type: histogram.as_dict()
+            for object_type, histogram in sorted(data.dispatcher.latency.items())
+        },
+        "commands": data.commands.stats,
+        "arm_status_cache": data.arm_status.stats,
+        # Timing histograms of the last profile
+        "perf": data.perf.stats,
+    }
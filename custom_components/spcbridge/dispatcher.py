@@ -0,0 +1,226 @@
+"""Route SPC object updates to the entities bound to each object."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from pyspcbridge.area import Area
+from pyspcbridge.door import Door
+from pyspcbridge.output import Output
+from pyspcbridge.panel import Panel
+from pyspcbridge.zone import Zone
+
+from .const import (
+    SIGNAL_UPDATE_AREA,
+    SIGNAL_UPDATE_DOOR,
+    SIGNAL_UPDATE_OUTPUT,
+    SIGNAL_UPDATE_PANEL,
+    SIGNAL_UPDATE_ZONE,
+)
+from .stats import EVENT_BUCKETS, LatencyHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+# Receipt time of the websocket frame being processed. pyspcbridge creates a
+# task per update, which copies the context, so the update callback of a
+# frame sees the time it was received.
+FRAME_RECEIVED: ContextVar[float | None] = ContextVar(
+    "spc_frame_received", default=None
+)
+
+
+# Update signal and object type of each SPC object class
+OBJECT_SIGNALS = (
+    (Panel, SIGNAL_UPDATE_PANEL, "panel"),
+    (Area, SIGNAL_UPDATE_AREA, "area"),
+    (Zone, SIGNAL_UPDATE_ZONE, "zone"),
+    (Output, SIGNAL_UPDATE_OUTPUT, "output"),
+    (Door, SIGNAL_UPDATE_DOOR, "door"),
+)
+
+
+def object_signal(panel_id, spc_object) -> str | None:
+    """Return the update signal of a SPC object."""
+    for object_class, signal, _ in OBJECT_SIGNALS:
+        if isinstance(spc_object, object_class):
+            return f"{signal}-{panel_id}-{spc_object.id}"
+    return None
+
+
+def object_type(spc_object) -> str | None:
+    """Return the object type of a SPC object."""
+    for object_class, _, _object_type in OBJECT_SIGNALS:
+        if isinstance(spc_object, object_class):
+            return _object_type
+    return None
+
+
+class SpcDispatcher:
+    """Coalesce bursts of SPC updates into one state write per object.
+
+    Updates are collected for `coalesce_window` ms (0 = until the next event
+    loop tick) and repeated updates of the same object are merged. A zone
+    whose intrusion, fire or tamper status changed is flushed immediately.
+    The entities count their state writes here, so the statistics show how
+    many updates ended in a state write.
+
+    Updates of a websocket frame carry the time the frame was received, the
+    oldest one is kept when updates are merged. The entities write their
+    state while the signal is dispatched, so the time from the frame to the
+    first state write of the object is measured once per flushed object and
+    object type, and logged if it exceeds `slow_event_threshold` ms (0 =
+    disabled).
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coalesce_window: int, slow_event_threshold: int = 0
+    ) -> None:
+        """Initialize the dispatcher."""
+        self._hass = hass
+        self._coalesce_window = coalesce_window / 1000
+        self._slow_event_threshold = slow_event_threshold / 1000
+        # Signal -> object type, object id and receipt time of the frame
+        self._pending: dict[str, tuple[str, int, float | None]] = {}
+        self._flush_handle: asyncio.Handle | None = None
+        self._alarm_status: dict[int, tuple[bool, bool, bool]] = {}
+        self._updates = 0
+        self._coalesced = 0
+        self._dispatched = 0
+        self._flushes = 0
+        self._urgent_flushes = 0
+        self._max_pending = 0
+        self._state_writes = 0
+        self._skipped_writes = 0
+        self._latency: dict[str, LatencyHistogram] = {}
+        self._trace: tuple[str, int, float] | None = None
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return the update, dispatch and state write counters."""
+        return {
+            "updates": self._updates,
+            "coalesced": self._coalesced,
+            "dispatched": self._dispatched,
+            "flushes": self._flushes,
+            "urgent_flushes": self._urgent_flushes,
+            "max_pending": self._max_pending,
+            "state_writes": self._state_writes,
+            "skipped_writes": self._skipped_writes,
+        }
+
+    @property
+    def latency(self) -> dict[str, LatencyHistogram]:
+        """Return the frame to state write latency of each object type."""
+        return self._latency
+
+    def set_coalesce_window(self, coalesce_window: int) -> None:
+        """Change the coalesce window (ms) for following updates."""
+        self._coalesce_window = coalesce_window / 1000
+
+    def set_slow_event_threshold(self, slow_event_threshold: int) -> None:
+        """Change the latency (ms) above which state writes are logged."""
+        self._slow_event_threshold = slow_event_threshold / 1000
+
+    @callback
+    def async_update(
+        self, panel_id, spc_objects, received: float | None = None
+    ) -> None:
+        """Queue updated SPC objects for dispatch.
+
+        received is the monotonic time the websocket frame with the updates
+        was received, None for updates that were fetched.
+        """
+        urgent = False
+        for _object in spc_objects:
+            if (signal := object_signal(panel_id, _object)) is None:
+                continue
+            self._updates += 1
+            object_received = received
+            if (pending := self._pending.get(signal)) is not None:
+                self._coalesced += 1
+                # Measure from the oldest frame of the merged updates
+                if pending[2] is not None and (
+                    object_received is None or pending[2] < object_received
+                ):
+                    object_received = pending[2]
+            self._pending[signal] = (object_type(_object), _object.id, object_received)
+            if isinstance(_object, Zone) and self._alarm_changed(_object):
+                urgent = True
+
+        self._max_pending = max(self._max_pending, len(self._pending))
+        if urgent:
+            self._urgent_flushes += 1
+            self.async_flush()
+        elif self._pending and self._flush_handle is None:
+            if self._coalesce_window > 0:
+                self._flush_handle = self._hass.loop.call_later(
+                    self._coalesce_window, self.async_flush
+                )
+            else:
+                self._flush_handle = self._hass.loop.call_soon(self.async_flush)
+
+    @callback
+    def async_flush(self) -> None:
+        """Dispatch all pending updates."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending = self._pending
+        self._pending = {}
+        self._flushes += 1
+        self._dispatched += len(pending)
+        for signal, (_object_type, object_id, received) in pending.items():
+            if received is not None:
+                self._trace = (_object_type, object_id, received)
+            async_dispatcher_send(self._hass, signal)
+            self._trace = None
+
+    @callback
+    def async_stop(self) -> None:
+        """Drop pending updates."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending = {}
+
+    def count_write(self, written: bool) -> None:
+        """Count an entity update that wrote its state or was skipped."""
+        if not written:
+            self._skipped_writes += 1
+            return
+        self._state_writes += 1
+        if self._trace is None:
+            return
+        # Measured once per dispatched object, its entities share the latency
+        _object_type, object_id, received = self._trace
+        self._trace = None
+        latency = time.monotonic() - received
+        if (histogram := self._latency.get(_object_type)) is None:
+            histogram = self._latency[_object_type] = LatencyHistogram(EVENT_BUCKETS)
+        histogram.add(latency)
+        if self._slow_event_threshold and latency > self._slow_event_threshold:
+            _LOGGER.warning(
+                "Slow update of %s %s: state written %.0f ms after the websocket frame",
+                _object_type,
+                object_id,
+                latency * 1000,
+            )
+
+    def _alarm_changed(self, zone: Zone) -> bool:
+        """Return True if the alarm class status of the zone changed."""
+        alarm_status = zone.alarm_status
+        status = (
+            alarm_status["intrusion"],
+            alarm_status["fire"],
+            alarm_status["tamper"],
+        )
+        if self._alarm_status.get(zone.id, (False, False, False)) == status:
+            return False
+        self._alarm_status[zone.id] = status
+        return True
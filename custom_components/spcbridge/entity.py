@@ -1,38 +1,167 @@
-"""A SPC zone entity base class."""
+"""SPC entity base classes."""
 
 from __future__ import annotations
 
+import time
+
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity
+from pyspcbridge import SpcBridge
 from pyspcbridge.area import Area
 from pyspcbridge.door import Door
 from pyspcbridge.output import Output
 from pyspcbridge.panel import Panel
 from pyspcbridge.zone import Zone
 
-from . import (
+from .const import (
+    DOMAIN,
+    SIGNAL_RECONCILE,
     SIGNAL_UPDATE_AREA,
     SIGNAL_UPDATE_DOOR,
+    SIGNAL_UPDATE_HEALTH,
     SIGNAL_UPDATE_OUTPUT,
     SIGNAL_UPDATE_PANEL,
     SIGNAL_UPDATE_ZONE,
 )
-from .const import DOMAIN
+from .dispatcher import SpcDispatcher
+from .models import SpcRuntimeData
+from .stats import SpcPerfCounters
 
 
-class SpcPanelEntity(Entity):
-    """Spc panel entity base class."""
+class SpcEntity(Entity):
+    """Spc entity base class.
+
+    The values exposed by an entity are materialized by
+    `_async_update_attrs` when the SPC object is updated, and the state is
+    only written when any of them changed. Values that only change with the
+    SPC configuration are built by `_update_static_attrs`.
+    """
 
     _attr_should_poll = False
     _attr_has_entity_name = True
+    # State writes are counted as event pipeline statistics by the dispatcher
+    _count_writes = True
 
-    def __init__(self, entry: ConfigEntry, panel: Panel, suffix: str) -> None:
-        """Init the panel."""
+    def __init__(self, entry: ConfigEntry, signal: str) -> None:
+        """Init the entity."""
         super().__init__()
         self._entry = entry
+        self._signal = signal
+        self._snapshot = None
+        self._dispatcher: SpcDispatcher | None = None
+        self._perf: SpcPerfCounters | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to updates"""
+        self._dispatcher = self._entry.runtime_data.dispatcher
+        self._perf = self._entry.runtime_data.perf
+        self._update_static_attrs()
+        self._async_update_attrs()
+        self._snapshot = self._async_snapshot()
+        self.async_on_remove(
+            async_dispatcher_connect(self.hass, self._signal, self._update_callback)
+        )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                f"{SIGNAL_RECONCILE}-{self._entry.entry_id}",
+                self._reconcile_callback,
+            )
+        )
+
+    @callback
+    def _reconcile_callback(self, spc: SpcBridge) -> None:
+        """Bind the entity to the SPC objects of a changed configuration."""
+        if not self._async_bind(spc):
+            # The object was removed, its device is removed with the entity
+            return
+        self._update_static_attrs()
+        self._async_update_attrs()
+        self._snapshot = self._async_snapshot()
+        # Names may have changed even if the state did not
+        self.async_write_ha_state()
+
+    @callback
+    def _async_bind(self, spc: SpcBridge) -> bool:
+        """Bind to the SPC object of spc, return False if it does not exist."""
+        return True
+
+    @property
+    def available(self) -> bool:
+        """Return False while the states are restored from the last start."""
+        return self._entry.runtime_data.store.live
+
+    def _update_static_attrs(self) -> None:
+        """Update the entity attributes that only change with configuration."""
+
+    @callback
+    def _update_callback(self) -> None:
+        """Write the state if any value exposed by the entity changed."""
+        perf = self._perf
+        start = time.perf_counter() if perf.enabled else None
+        self._async_update_attrs()
+        if start is not None:
+            perf.add(f"attrs.{type(self).__name__}", time.perf_counter() - start)
+        snapshot = self._async_snapshot()
+        written = snapshot != self._snapshot
+        if written:
+            self._snapshot = snapshot
+            self.async_write_ha_state()
+        if self._count_writes:
+            self._dispatcher.count_write(written)
+        if start is not None:
+            perf.add("entity_update", time.perf_counter() - start)
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the entity attributes from the SPC object."""
+
+    @callback
+    def _async_snapshot(self) -> tuple:
+        """Return the values exposed by the entity."""
+        return (
+            getattr(self, "_attr_is_on", None),
+            getattr(self, "_attr_native_value", None),
+            getattr(self, "_attr_extra_state_attributes", None),
+        )
+
+
+class SpcBridgeEntity(SpcEntity):
+    """Spc bridge health entity base class.
+
+    The entities read the counters of the connection, the HTTP client and the
+    command queue of the bridge when the health signal is sent.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    # Refreshed by the health signal, not by events of the bridge
+    _count_writes = False
+
+    def __init__(self, entry: ConfigEntry, data: SpcRuntimeData, suffix: str) -> None:
+        """Init the bridge entity."""
+        super().__init__(entry=entry, signal=f"{SIGNAL_UPDATE_HEALTH}-{entry.entry_id}")
+        self._data = data
+        self._attr_unique_id = f"{entry.unique_id}-bridge-{suffix}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, entry.unique_id)})
+
+    @property
+    def available(self) -> bool:
+        """Return True, the health of the bridge is known without live data."""
+        return True
+
+
+class SpcPanelEntity(SpcEntity):
+    """Spc panel entity base class."""
+
+    def __init__(self, entry: ConfigEntry, panel: Panel, suffix: str) -> None:
+        """Init the panel."""
+        super().__init__(
+            entry=entry, signal=f"{SIGNAL_UPDATE_PANEL}-{entry.unique_id}-{panel.id}"
+        )
         self._panel = panel
         device_unique_id = f"{entry.unique_id}-panel-1"
         self._attr_unique_id = f"{device_unique_id}-{suffix}"
@@ -46,33 +175,21 @@ class SpcPanelEntity(Entity):
             via_device=(DOMAIN, entry.unique_id),
         )
 
-    async def async_added_to_hass(self) -> None:
-        """Subscribe to updates"""
-        self.async_on_remove(
-            async_dispatcher_connect(
-                self.hass,
-                f"{SIGNAL_UPDATE_PANEL}-{self._entry.unique_id}",
-                self._update_callback,
-            )
-        )
-
     @callback
-    def _update_callback(self, id) -> None:
-        """Call update method."""
-        if self._panel.id == id:
-            self.async_schedule_update_ha_state(True)
+    def _async_bind(self, spc: SpcBridge) -> bool:
+        """Bind to the panel of spc."""
+        self._panel = spc.panel
+        return True
 
 
-class SpcAreaEntity(Entity):
+class SpcAreaEntity(SpcEntity):
     """Spc area entity base class."""
 
-    _attr_should_poll = False
-    _attr_has_entity_name = True
-
     def __init__(self, entry: ConfigEntry, area: Area, suffix: str) -> None:
         """Init the area."""
-        super().__init__()
-        self._entry = entry
+        super().__init__(
+            entry=entry, signal=f"{SIGNAL_UPDATE_AREA}-{entry.unique_id}-{area.id}"
+        )
         self._area = area
         device_unique_id = f"{entry.unique_id}-area-{area.id}"
         self._attr_unique_id = f"{device_unique_id}-{suffix}"
@@ -84,33 +201,23 @@ class SpcAreaEntity(Entity):
             via_device=(DOMAIN, entry.unique_id),
         )
 
-    async def async_added_to_hass(self) -> None:
-        """Subscribe to updates"""
-        self.async_on_remove(
-            async_dispatcher_connect(
-                self.hass,
-                f"{SIGNAL_UPDATE_AREA}-{self._entry.unique_id}",
-                self._update_callback,
-            )
-        )
-
     @callback
-    def _update_callback(self, id) -> None:
-        """Call update method."""
-        if self._area.id == id:
-            self.async_schedule_update_ha_state(True)
+    def _async_bind(self, spc: SpcBridge) -> bool:
+        """Bind to the area of spc with the same id."""
+        if (area := spc.areas.get(self._area.id)) is None:
+            return False
+        self._area = area
+        return True
 
 
-class SpcZoneEntity(Entity):
+class SpcZoneEntity(SpcEntity):
     """Spc zone entity base class."""
 
-    _attr_should_poll = False
-    _attr_has_entity_name = True
-
     def __init__(self, entry: ConfigEntry, zone: Zone, suffix: str) -> None:
         """Init the zone."""
-        super().__init__()
-        self._entry = entry
+        super().__init__(
+            entry=entry, signal=f"{SIGNAL_UPDATE_ZONE}-{entry.unique_id}-{zone.id}"
+        )
         self._zone = zone
         device_unique_id = f"{entry.unique_id}-zone-{zone.id}"
         self._attr_unique_id = f"{device_unique_id}-{suffix}"
@@ -122,33 +229,23 @@ class SpcZoneEntity(Entity):
             via_device=(DOMAIN, entry.unique_id),
         )
 
-    async def async_added_to_hass(self) -> None:
-        """Subscribe to updates"""
-        self.async_on_remove(
-            async_dispatcher_connect(
-                self.hass,
-                f"{SIGNAL_UPDATE_ZONE}-{self._entry.unique_id}",
-                self._update_callback,
-            )
-        )
-
     @callback
-    def _update_callback(self, id) -> None:
-        """Call update method."""
-        if self._zone.id == id:
-            self.async_schedule_update_ha_state(True)
+    def _async_bind(self, spc: SpcBridge) -> bool:
+        """Bind to the zone of spc with the same id."""
+        if (zone := spc.zones.get(self._zone.id)) is None:
+            return False
+        self._zone = zone
+        return True
 
 
-class SpcOutputEntity(Entity):
+class SpcOutputEntity(SpcEntity):
     """Spc output entity base class."""
 
-    _attr_should_poll = False
-    _attr_has_entity_name = True
-
     def __init__(self, entry: ConfigEntry, output: Output, suffix: str) -> None:
         """Init the output."""
-        super().__init__()
-        self._entry = entry
+        super().__init__(
+            entry=entry, signal=f"{SIGNAL_UPDATE_OUTPUT}-{entry.unique_id}-{output.id}"
+        )
         self._output = output
         device_unique_id = f"{entry.unique_id}-output-{output.id}"
         self._attr_unique_id = f"{device_unique_id}-{suffix}"
@@ -160,33 +257,23 @@ class SpcOutputEntity(Entity):
             via_device=(DOMAIN, entry.unique_id),
         )
 
-    async def async_added_to_hass(self) -> None:
-        """Subscribe to updates"""
-        self.async_on_remove(
-            async_dispatcher_connect(
-                self.hass,
-                f"{SIGNAL_UPDATE_OUTPUT}-{self._entry.unique_id}",
-                self._update_callback,
-            )
-        )
-
     @callback
-    def _update_callback(self, id) -> None:
-        """Call update method."""
-        if self._output.id == id:
-            self.async_schedule_update_ha_state(True)
+    def _async_bind(self, spc: SpcBridge) -> bool:
+        """Bind to the output of spc with the same id."""
+        if (output := spc.outputs.get(self._output.id)) is None:
+            return False
+        self._output = output
+        return True
 
 
-class SpcDoorEntity(Entity):
+class SpcDoorEntity(SpcEntity):
     """Spc door entity base class."""
 
-    _attr_should_poll = False
-    _attr_has_entity_name = True
-
     def __init__(self, entry: ConfigEntry, door: Door, suffix: str) -> None:
         """Init the output."""
-        super().__init__()
-        self._entry = entry
+        super().__init__(
+            entry=entry, signal=f"{SIGNAL_UPDATE_DOOR}-{entry.unique_id}-{door.id}"
+        )
         self._door = door
         device_unique_id = f"{entry.unique_id}-door-{door.id}"
         self._attr_unique_id = f"{device_unique_id}-{suffix}"
@@ -198,18 +285,10 @@ class SpcDoorEntity(Entity):
             via_device=(DOMAIN, entry.unique_id),
         )
 
-    async def async_added_to_hass(self) -> None:
-        """Subscribe to updates"""
-        self.async_on_remove(
-            async_dispatcher_connect(
-                self.hass,
-                f"{SIGNAL_UPDATE_DOOR}-{self._entry.unique_id}",
-                self._update_callback,
-            )
-        )
-
     @callback
-    def _update_callback(self, id) -> None:
-        """Call update method."""
-        if self._door.id == id:
-            self.async_schedule_update_ha_state(True)
+    def _async_bind(self, spc: SpcBridge) -> bool:
+        """Bind to the door of spc with the same id."""
+        if (door := spc.doors.get(self._door.id)) is None:
+            return False
+        self._door = door
+        return True
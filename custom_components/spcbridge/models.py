@@ -0,0 +1,32 @@
+"""Runtime data of the SPC Bridge integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import httpx
+from pyspcbridge import SpcBridge
+
+from .client import SpcHttpStats
+from .commands import SpcCommandQueue
+from .connection import SpcConnection
+from .dispatcher import SpcDispatcher
+from .readiness import SpcArmStatusCache, SpcReadiness
+from .stats import SpcPerfCounters
+from .store import SpcStore
+
+
+@dataclass(slots=True)
+class SpcRuntimeData:
+    """Objects of a loaded SPC Bridge config entry."""
+
+    spc: SpcBridge
+    commands: SpcCommandQueue
+    readiness: SpcReadiness
+    arm_status: SpcArmStatusCache
+    connection: SpcConnection
+    http_client: httpx.AsyncClient
+    http_stats: SpcHttpStats
+    dispatcher: SpcDispatcher
+    perf: SpcPerfCounters
+    store: SpcStore
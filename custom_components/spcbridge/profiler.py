@@ -0,0 +1,79 @@
+"""Profile the SPC Bridge event pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import json
+import pstats
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+from .stats import SpcPerfCounters
+
+# Functions of the integration and pyspcbridge shown in the report
+PROFILE_FILTER = r"spcbridge"
+PROFILE_LINES = 60
+
+DATA_PROFILING: HassKey[bool] = HassKey(f"{DOMAIN}_profiling")
+
+
+def _write_report(
+    path: str, profiler: cProfile.Profile, duration: int, counters: dict[str, dict]
+) -> None:
+    stream = io.StringIO()
+    stream.write(f"SPC Bridge profile of {duration} s\n\n")
+    stream.write("Timing histograms (ms)\n")
+    stream.write(json.dumps(counters, indent=2))
+    stream.write("\n\n")
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    stats.print_stats(PROFILE_FILTER, PROFILE_LINES)
+    with open(path, "w", encoding="utf-8") as report:
+        report.write(stream.getvalue())
+
+
+async def async_profile(
+    hass: HomeAssistant, counters: dict[str, SpcPerfCounters], duration: int
+) -> dict[str, dict]:
+    """Profile the event loop for duration seconds and write a report.
+
+    cProfile sees every function called in the event loop, the report only
+    lists the functions of the integration and pyspcbridge by cumulative
+    time. The perf counters of the entries, keyed by entry title, are
+    enabled while profiling. Returns the path of the report and the timing
+    histograms.
+    """
+    if hass.data.get(DATA_PROFILING):
+        raise ServiceValidationError("A profile of the SPC Bridge is already running")
+    hass.data[DATA_PROFILING] = True
+    profiler = cProfile.Profile()
+    for perf in counters.values():
+        perf.reset()
+        perf.enabled = True
+    try:
+        try:
+            profiler.enable()
+        except ValueError as err:
+            # Only one cProfile can run, e.g. not with the profiler integration
+            raise ServiceValidationError(
+                f"Cannot profile the SPC Bridge: {err}"
+            ) from err
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profiler.disable()
+    finally:
+        for perf in counters.values():
+            perf.enabled = False
+        hass.data[DATA_PROFILING] = False
+
+    stats = {title: perf.stats for title, perf in counters.items()}
+    path = hass.config.path(f"spcbridge_profile_{dt_util.now():%Y%m%d_%H%M%S}.txt")
+    await hass.async_add_executor_job(_write_report, path, profiler, duration, stats)
+    return {"path": path, "timers": stats}
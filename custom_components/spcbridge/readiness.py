@@ -0,0 +1,197 @@
+"""Arm readiness of the SPC areas."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from pyspcbridge import SpcBridge
+from pyspcbridge.area import Area
+from pyspcbridge.const import ZoneInput, ZoneType
+from pyspcbridge.zone import Zone
+
+from .const import SIGNAL_UPDATE_READINESS
+from .store import SpcStore
+
+# Zone types whose open input prevents setting
+INTRUSION_ZONE_TYPES = {
+    ZoneType.ALARM,
+    ZoneType.ENTRY_EXIT,
+    ZoneType.ENTRY_EXIT_2,
+    ZoneType.EXIT_TERMINATOR,
+    ZoneType.GLASSBREAK,
+}
+
+
+def _zone_state(zone: Zone, intrusion: bool) -> tuple[bool, bool]:
+    """Return (open, fault) of a zone, inhibited or isolated zones are neither."""
+    if zone.inhibited or zone.isolated:
+        return False, False
+    alarm_status = zone.alarm_status
+    fault = (
+        alarm_status["intrusion"] or alarm_status["tamper"] or alarm_status["problem"]
+    )
+    is_open = intrusion and zone.input == ZoneInput.OPEN
+    return is_open, fault
+
+
+class SpcReadiness:
+    """Arm readiness model of the areas of a SPC Bridge.
+
+    The open and faulty zones of each area are maintained from the zone
+    updates received from the bridge, so the arm status can be answered
+    without asking the bridge. Open intrusion zones and zones with an alarm,
+    tamper or problem prevent setting. The bridge does not report which
+    zones belong to partset A or B, so all zones of the area are considered
+    for a partset.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, store: SpcStore
+    ) -> None:
+        """Initialize the readiness model."""
+        self._hass = hass
+        self._entry = entry
+        self._store = store
+        self._spc: SpcBridge | None = None
+        self._zone_areas: dict[int, int] = {}
+        self._intrusion_zones: set[int] = set()
+        self._open: dict[int, set[int]] = {}
+        self._fault: dict[int, set[int]] = {}
+
+    @callback
+    def async_rebuild(self, spc: SpcBridge) -> None:
+        """Build the model from all SPC zones, e.g. after a reconcile."""
+        self._spc = spc
+        self._zone_areas = {}
+        self._intrusion_zones = {
+            id
+            for id, zone_type in self._store.zone_types().items()
+            if zone_type in INTRUSION_ZONE_TYPES
+        }
+        self._open = {}
+        self._fault = {}
+        for area in spc.areas.values():
+            self._open[area.id] = set()
+            self._fault[area.id] = set()
+            for zone in area.zones:
+                self._zone_areas[zone.id] = area.id
+                self._apply(area.id, zone)
+            self._async_signal(area.id)
+
+    @callback
+    def async_update(self, spc_objects) -> None:
+        """Apply updated SPC zones to the model."""
+        for _object in spc_objects:
+            if not isinstance(_object, Zone):
+                continue
+            if (area_id := self._zone_areas.get(_object.id)) is None:
+                continue
+            if self._apply(area_id, _object):
+                self._async_signal(area_id)
+
+    def reasons(self, area_id: int, arm_mode: str) -> list[str]:
+        """Return the reasons preventing an area from being set in arm_mode.
+
+        arm_mode is an arm mode of the SPC Bridge arm status, set, set_a,
+        set_b or disarm. The reasons use its format too, e.g. zone_3.
+        """
+        if arm_mode == "disarm" or area_id not in self._open:
+            return []
+        area = self._spc.areas[area_id]
+        if (arm_mode == "set_a" and not area.a_enabled) or (
+            arm_mode == "set_b" and not area.b_enabled
+        ):
+            return ["undefined"]
+        zone_ids = self._open[area_id] | self._fault[area_id]
+        return [f"zone_{id}" for id in sorted(zone_ids)]
+
+    def arm_status(self, arm_mode: str, area_id: int | None = None) -> list[dict]:
+        """Return the arm status of one or all areas like the SPC Bridge."""
+        area_ids = [area_id] if area_id is not None else list(self._open)
+        return [
+            {"area_id": id, "reasons": self.reasons(id, arm_mode)} for id in area_ids
+        ]
+
+    def _apply(self, area_id: int, zone: Zone) -> bool:
+        """Apply the state of a zone, return True if the area changed."""
+        changed = False
+        for zone_ids, member in zip(
+            (self._open[area_id], self._fault[area_id]),
+            _zone_state(zone, zone.id in self._intrusion_zones),
+            strict=True,
+        ):
+            if member != (zone.id in zone_ids):
+                changed = True
+                if member:
+                    zone_ids.add(zone.id)
+                else:
+                    zone_ids.discard(zone.id)
+        return changed
+
+    @callback
+    def _async_signal(self, area_id: int) -> None:
+        async_dispatcher_send(
+            self._hass,
+            f"{SIGNAL_UPDATE_READINESS}-{self._entry.unique_id}-{area_id}",
+        )
+
+
+class SpcArmStatusCache:
+    """Cache of the arm status answered by the SPC Bridge.
+
+    A result is reused for the same area (or panel) and arm mode until a zone
+    or area changes, which increments the state version.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._version = 0
+        self._cache: dict[tuple[str, int | None], tuple[int, list[dict]]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return the hit and miss counts and the hit rate of the cache."""
+        requests = self._hits + self._misses
+        return {
+            "version": self._version,
+            "entries": len(self._cache),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / requests, 3) if requests else None,
+        }
+
+    @callback
+    def async_invalidate(self, spc_objects) -> None:
+        """Invalidate the cached results if a zone or area changed."""
+        if any(isinstance(_object, (Zone, Area)) for _object in spc_objects):
+            self.async_clear()
+
+    @callback
+    def async_clear(self, spc: SpcBridge | None = None) -> None:
+        """Invalidate all cached results, e.g. after a reconcile."""
+        self._version += 1
+        self._cache.clear()
+
+    async def async_get_arm_status(
+        self, spc: SpcBridge, arm_mode: str, area_id: int | None = None
+    ) -> list[dict]:
+        """Return the arm status from the cache or the SPC Bridge."""
+        key = (arm_mode, area_id)
+        if (cached := self._cache.get(key)) is not None and cached[0] == self._version:
+            self._hits += 1
+            return cached[1]
+        self._misses += 1
+        version = self._version
+        if area_id is None:
+            data = await spc.async_get_arm_status(arm_mode)
+        else:
+            data = await spc.async_get_arm_status(arm_mode, area_id)
+        # Not cached if the state changed while waiting for the bridge
+        if version == self._version:
+            self._cache[key] = (version, data)
+        return data
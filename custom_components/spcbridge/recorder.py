@@ -0,0 +1,114 @@
+"""Record and replay the websocket frames of a SPC Bridge."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+RECORD_FLUSH_INTERVAL = 5  # s
+REDACTED = "**REDACTED**"
+
+
+def recording_path(hass: HomeAssistant, entry: ConfigEntry) -> str:
+    """Return the path of the recording of an entry."""
+    return hass.config.path(f"spcbridge_frames_{entry.entry_id}.jsonl")
+
+
+def _strip(value: Any, secrets: set[str]) -> Any:
+    """Replace the strings of value that are credentials."""
+    if isinstance(value, dict):
+        return {k: _strip(v, secrets) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_strip(v, secrets) for v in value]
+    if isinstance(value, str) and value in secrets:
+        return REDACTED
+    return value
+
+
+def _append(path: str, data: str) -> None:
+    with open(path, "a", encoding="utf-8") as recording:
+        recording.write(data)
+
+
+def _read(path: str, config_dir: str) -> list[tuple[float, dict]]:
+    if not Path(path).resolve().is_relative_to(Path(config_dir).resolve()):
+        raise ValueError("recordings must be in the configuration directory")
+    with open(path, encoding="utf-8") as recording:
+        return [tuple(json.loads(line)) for line in recording if line.strip()]
+
+
+async def async_load_recording(
+    hass: HomeAssistant, path: str
+) -> list[tuple[float, dict]]:
+    """Return the receipt times and frames of a recording.
+
+    Raises ValueError if the recording is not in the configuration directory.
+    """
+    return await hass.async_add_executor_job(_read, path, hass.config.config_dir)
+
+
+class SpcFrameRecorder:
+    """Append the websocket frames of a SPC Bridge to a file.
+
+    Each line of the file is a JSON array of the receipt time (Unix time in
+    s) and the frame, with the strings equal to a credential of the bridge
+    redacted. Lines are buffered and appended in the executor every few
+    seconds, so a recorded frame costs one json.dumps in the event loop and
+    a disabled recorder one attribute lookup.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str, secrets: set[str]) -> None:
+        """Initialize the recorder."""
+        self._hass = hass
+        self._secrets = {secret for secret in secrets if secret}
+        self._buffer: list[str] = []
+        self._lock = asyncio.Lock()
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self.path = path
+        self.enabled = False
+        self.frames = 0
+
+    @callback
+    def async_record(self, frame: dict) -> None:
+        """Buffer a frame, called when it is received."""
+        self._buffer.append(
+            json.dumps(
+                [round(time.time(), 3), _strip(frame, self._secrets)],
+                separators=(",", ":"),
+            )
+        )
+        self.frames += 1
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self._hass, RECORD_FLUSH_INTERVAL, self._async_flush_later
+            )
+
+    async def async_set_enabled(self, enabled: bool) -> None:
+        """Start or stop recording, the buffered frames are written on stop."""
+        self.enabled = enabled
+        if not enabled:
+            await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """Append the buffered frames to the recording."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        async with self._lock:
+            if not self._buffer:
+                return
+            data = "\n".join(self._buffer) + "\n"
+            self._buffer = []
+            await self._hass.async_add_executor_job(_append, self.path, data)
+
+    async def _async_flush_later(self, _now: datetime) -> None:
+        self._unsub_flush = None
+        await self.async_flush()
@@ -0,0 +1,137 @@
+"""Resolve device ids of SPC devices to SPC objects."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN
+from .models import SpcRuntimeData
+
+# SPC object types with a device of their own
+OBJECT_TYPES = ("panel", "area", "zone", "output", "door")
+
+
+@dataclass(frozen=True, slots=True)
+class SpcDevice:
+    """SPC object represented by a device."""
+
+    entry_id: str
+    object_type: str
+    object_id: int
+
+
+@dataclass(slots=True)
+class SpcTarget:
+    """SPC object addressed by a service call."""
+
+    data: SpcRuntimeData
+    object_type: str
+    spc_object: Any
+
+    async def async_command(
+        self, command: str, code: str | None, concurrency: int | None = None
+    ) -> Any:
+        """Send a command to the SPC object through the command queue."""
+        return await self.data.commands.async_command(
+            self.object_type, self.spc_object, command, code, concurrency
+        )
+
+
+def _get_spc_device(
+    device: dr.DeviceEntry, entries: dict[str, Any]
+) -> SpcDevice | None:
+    """Return the SPC object of a device, if it belongs to one of the entries."""
+    if device.primary_config_entry in entries:
+        entry_id = device.primary_config_entry
+    elif config_entries := [e for e in device.config_entries if e in entries]:
+        entry_id = config_entries[0]
+    else:
+        return None
+    for domain, unique_id in device.identifiers:
+        if domain != DOMAIN:
+            continue
+        id = unique_id.split("-")
+        if len(id) == 3 and id[1] in OBJECT_TYPES and id[2].isdigit():
+            return SpcDevice(entry_id, id[1], int(id[2]))
+    return None
+
+
+class SpcDeviceResolver:
+    """Index of the SPC devices of all loaded config entries.
+
+    The services address SPC objects by device id. The index is built when an
+    entry is loaded and kept current with the device registry events, so a
+    service call is resolved with a dictionary lookup.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the resolver."""
+        self._hass = hass
+        self._entries: dict[str, SpcRuntimeData] = {}
+        self._devices: dict[str, SpcDevice] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_entry(self, entry: ConfigEntry) -> CALLBACK_TYPE:
+        """Index the devices of a config entry, return a callback removing them."""
+        self._entries[entry.entry_id] = entry.runtime_data
+        device_registry = dr.async_get(self._hass)
+        for device in dr.async_entries_for_config_entry(
+            device_registry, entry.entry_id
+        ):
+            if spc_device := _get_spc_device(device, self._entries):
+                self._devices[device.id] = spc_device
+        if self._unsub is None:
+            self._unsub = self._hass.bus.async_listen(
+                dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_updated
+            )
+
+        @callback
+        def async_remove_entry() -> None:
+            self._entries.pop(entry.entry_id, None)
+            self._devices = {
+                device_id: spc_device
+                for device_id, spc_device in self._devices.items()
+                if spc_device.entry_id != entry.entry_id
+            }
+            if not self._entries and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+
+        return async_remove_entry
+
+    @callback
+    def async_resolve(self, device_id: str) -> SpcTarget | None:
+        """Return the SPC object of a device."""
+        if (spc_device := self._devices.get(device_id)) is None:
+            return None
+        data = self._entries[spc_device.entry_id]
+        spc = data.spc
+        if spc_device.object_type == "panel":
+            spc_object = spc.panel
+        else:
+            spc_objects = getattr(spc, f"{spc_device.object_type}s")
+            spc_object = spc_objects.get(spc_device.object_id)
+        if spc_object is None:
+            return None
+        return SpcTarget(data, spc_device.object_type, spc_object)
+
+    @callback
+    def _async_device_updated(
+        self, event: Event[dr.EventDeviceRegistryUpdatedData]
+    ) -> None:
+        """Update the index with a created, changed or removed device."""
+        device_id = event.data["device_id"]
+        if event.data["action"] == "remove":
+            self._devices.pop(device_id, None)
+            return
+        device = dr.async_get(self._hass).async_get(device_id)
+        if device and (spc_device := _get_spc_device(device, self._entries)):
+            self._devices[device_id] = spc_device
+        else:
+            self._devices.pop(device_id, None)
@@ -4,18 +4,29 @@ from __future__ import annotations
 
 import logging
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util.json import json_loads
 from pyspcbridge import SpcBridge
 from pyspcbridge.area import Area
 from pyspcbridge.door import Door
 from pyspcbridge.panel import Panel
 
-from .const import CONF_AREAS_INCLUDE_DATA, CONF_DOORS_INCLUDE_DATA, DOMAIN
-from .entity import SpcAreaEntity, SpcDoorEntity, SpcPanelEntity
+from .const import (
+    CONF_AREAS_INCLUDE_DATA,
+    CONF_DOORS_INCLUDE_DATA,
+    DOMAIN,
+    SIGNAL_ADD_ENTITIES,
+)
+from .entity import SpcAreaEntity, SpcBridgeEntity, SpcDoorEntity, SpcPanelEntity
+from .models import SpcRuntimeData
 from .utils import arm_mode_to_name, door_mode_to_name
 
 _LOGGER = logging.getLogger(__name__)
@@ -26,23 +37,52 @@ async def async_setup_entry(
 ) -> None:
     """Set up SPC sensors based on config entry."""
     api: SpcBridge = hass.data[DOMAIN][entry.entry_id]
-    entities = []
-    entities.append(SpcPanelArmModeSensor(entry, api.panel))
-    entities.append(SpcPanelEventSensor(entry, api.panel))
 
-    for area in api.areas.values():
-        if entry.options[CONF_AREAS_INCLUDE_DATA].get(str(area.id)) == "include":
-            entities.append(SpcAreaArmModeSensor(entry, area))
-
-    for door in api.doors.values():
-        if entry.options[CONF_DOORS_INCLUDE_DATA].get(str(door.id)) == "include":
-            entities.append(SpcDoorModeSensor(entry, door))
-            entities.append(SpcDoorEntryGrantedSensor(entry, door))
-            entities.append(SpcDoorEntryDeniedSensor(entry, door))
-            entities.append(SpcDoorExitGrantedSensor(entry, door))
-            entities.append(SpcDoorExitDeniedSensor(entry, door))
-
-    async_add_entities(entities)
+    @callback
+    def async_add_spc_entities(keys: set[tuple[str, int]] | None = None) -> None:
+        """Add entities of all SPC objects, or only of the objects in keys."""
+        entities = []
+        if keys is None:
+            entities.append(SpcPanelArmModeSensor(entry, api.panel))
+            entities.append(SpcPanelEventSensor(entry, api.panel))
+            data = entry.runtime_data
+            entities.append(SpcBridgeLastFrameSensor(entry, data))
+            entities.append(SpcBridgeReconnectsSensor(entry, data))
+            entities.append(SpcBridgeRestLatencySensor(entry, data, 50))
+            entities.append(SpcBridgeRestLatencySensor(entry, data, 95))
+            entities.append(SpcBridgeCommandLatencySensor(entry, data))
+            entities.append(SpcBridgeEventRateSensor(entry, data))
+            entities.extend(
+                SpcBridgeEventLatencySensor(entry, data, object_type)
+                for object_type in ("panel", "area", "zone", "output", "door")
+            )
+
+        for area in api.areas.values():
+            if keys is not None and ("area", area.id) not in keys:
+                continue
+            if entry.options[CONF_AREAS_INCLUDE_DATA].get(str(area.id)) == "include":
+                entities.append(SpcAreaArmModeSensor(entry, area))
+
+        for door in api.doors.values():
+            if keys is not None and ("door", door.id) not in keys:
+                continue
+            if entry.options[CONF_DOORS_INCLUDE_DATA].get(str(door.id)) == "include":
+                entities.append(SpcDoorModeSensor(entry, door))
+                entities.append(SpcDoorEntryGrantedSensor(entry, door))
+                entities.append(SpcDoorEntryDeniedSensor(entry, door))
+                entities.append(SpcDoorExitGrantedSensor(entry, door))
+                entities.append(SpcDoorExitDeniedSensor(entry, door))
+
+        async_add_entities(entities)
+
+    async_add_spc_entities()
+
+    # Entities of SPC objects added to the configuration of the panel
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, f"{SIGNAL_ADD_ENTITIES}-{entry.entry_id}", async_add_spc_entities
+        )
+    )
 
 
 class SpcPanelArmModeSensor(SpcPanelEntity, SensorEntity):
@@ -65,28 +105,31 @@ class SpcPanelArmModeSensor(SpcPanelEntity, SensorEntity):
             "unknown",
         ]
 
-    @property
-    def native_value(self) -> str | None:
-        return arm_mode_to_name(self._panel.mode)
-
-    @property
-    def extra_state_attributes(self):
-        return {
+    def _update_static_attrs(self) -> None:
+        self._static_attrs = {
             "title": "System",
             "unique_id": self._attr_unique_id,
-            "arm_mode": self._panel.mode,
-            "mode": self._panel.mode,
-            "alarm_status": self._panel.alarm_status,
             "partset_a_enabled": self._panel.a_enabled,
             "partset_a_name": self._panel.a_name,
             "partset_b_enabled": self._panel.b_enabled,
             "partset_b_name": self._panel.b_name,
             "exittime": self._panel.exittime,
             "entrytime": self._panel.entrytime,
-            "spc_event": self._panel.event,
             "area_ids": [a.id for a in self._panel._areas],
         }
 
+    @callback
+    def _async_update_attrs(self) -> None:
+        mode = self._panel.mode
+        self._attr_native_value = arm_mode_to_name(mode)
+        self._attr_extra_state_attributes = {
+            **self._static_attrs,
+            "arm_mode": mode,
+            "mode": mode,
+            "alarm_status": self._panel.alarm_status,
+            "spc_event": self._panel.event,
+        }
+
     @property
     def changed_by(self) -> str:
         """Return the user who last changed panel arm mode"""
@@ -102,19 +145,23 @@ class SpcPanelEventSensor(SpcPanelEntity, SensorEntity):
         """Initialize the sensor device."""
         super().__init__(entry=entry, panel=panel, suffix="event")
         self._attr_device_class = None  # There is no specific class for alarm
-
-    @property
-    def native_value(self) -> str | None:
-        value = ""
-        if self._panel.event != "":
-            m = []
-            event = json_loads(self._panel.event)
-            keys = ["ev_desc", "area_name", "zone_name", "mg_name", "door_name"]
-            for key in keys:
-                if v := event.get(key):
-                    m.append(v)
-            value = " - ".join(m)
-        return value
+        self._event = None
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        # The panel is updated by all area changes, events are parsed once
+        # by the connection, which also fires them on the event bus
+        if (event := self._entry.runtime_data.connection.last_event) is self._event:
+            return
+        self._event = event
+        if event is None:
+            self._attr_native_value = ""
+            self._attr_extra_state_attributes = None
+            return
+        self._attr_native_value = event["message"]
+        self._attr_extra_state_attributes = {
+            key: value for key, value in event.items() if key != "message"
+        }
 
 
 class SpcAreaArmModeSensor(SpcAreaEntity, SensorEntity):
@@ -128,17 +175,10 @@ class SpcAreaArmModeSensor(SpcAreaEntity, SensorEntity):
         self._attr_device_class = SensorDeviceClass.ENUM
         self._attr_options = ["disarmed", "partset_a", "partset_b", "armed", "unknown"]
 
-    @property
-    def native_value(self) -> str | None:
-        return arm_mode_to_name(self._area.mode)
-
-    @property
-    def extra_state_attributes(self):
-        return {
+    def _update_static_attrs(self) -> None:
+        self._static_attrs = {
             "unique_id": self._attr_unique_id,
             "title": self._area.name or f"Area {self._area.id}",
-            "mode": self._area.mode,
-            "alarm_status": self._area.alarm_status,
             "partset_a_enabled": self._area.a_enabled,
             "partset_a_name": self._area.a_name,
             "partset_b_enabled": self._area.b_enabled,
@@ -146,6 +186,15 @@ class SpcAreaArmModeSensor(SpcAreaEntity, SensorEntity):
             "exittime": self._area.exittime,
             "entrytime": self._area.entrytime,
             "zone_ids": [z.id for z in self._area.zones],
+        }
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_native_value = arm_mode_to_name(self._area.mode)
+        self._attr_extra_state_attributes = {
+            **self._static_attrs,
+            "mode": self._area.mode,
+            "alarm_status": self._area.alarm_status,
             "last_disarmed_user": self._area.unset_user,
             "last_armed_user": self._area.set_user,
         }
@@ -177,13 +226,10 @@ class SpcDoorModeSensor(SpcDoorEntity, SensorEntity):
         self._attr_device_class = SensorDeviceClass.ENUM
         self._attr_options = ["unlocked", "normal", "locked", "unknown"]
 
-    @property
-    def native_value(self) -> str | None:
-        return door_mode_to_name(self._door.mode)
-
-    @property
-    def extra_state_attributes(self):
-        return {
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_native_value = door_mode_to_name(self._door.mode)
+        self._attr_extra_state_attributes = {
             "unique_id": self._attr_unique_id,
             "name": self._door.name,
             "mode": self._door.mode,
@@ -200,9 +246,9 @@ class SpcDoorEntryGrantedSensor(SpcDoorEntity, SensorEntity):
         super().__init__(entry=entry, door=door, suffix="entry_granted")
         self._attr_device_class = None  # There is no specific class for alarm
 
-    @property
-    def native_value(self) -> str | None:
-        return self._door.entry_granted
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_native_value = self._door.entry_granted
 
 
 class SpcDoorEntryDeniedSensor(SpcDoorEntity, SensorEntity):
@@ -215,9 +261,9 @@ class SpcDoorEntryDeniedSensor(SpcDoorEntity, SensorEntity):
         super().__init__(entry=entry, door=door, suffix="entry_denied")
         self._attr_device_class = None  # There is no specific class for alarm
 
-    @property
-    def native_value(self) -> str | None:
-        return self._door.entry_denied
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_native_value = self._door.entry_denied
 
 
 class SpcDoorExitGrantedSensor(SpcDoorEntity, SensorEntity):
@@ -230,9 +276,9 @@ class SpcDoorExitGrantedSensor(SpcDoorEntity, SensorEntity):
         super().__init__(entry=entry, door=door, suffix="exit_granted")
         self._attr_device_class = None  # There is no specific class for alarm
 
-    @property
-    def native_value(self) -> str | None:
-        return self._door.exit_granted
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_native_value = self._door.exit_granted
 
 
 class SpcDoorExitDeniedSensor(SpcDoorEntity, SensorEntity):
@@ -245,6 +291,130 @@ class SpcDoorExitDeniedSensor(SpcDoorEntity, SensorEntity):
         super().__init__(entry=entry, door=door, suffix="exit_denied")
         self._attr_device_class = None  # There is no specific class for alarm
 
-    @property
-    def native_value(self) -> str | None:
-        return self._door.exit_denied
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_native_value = self._door.exit_denied
+
+
+class SpcBridgeLastFrameSensor(SpcBridgeEntity, SensorEntity):
+    """Representation of the time of the last websocket frame."""
+
+    _attr_translation_key = "bridge_last_frame"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    def __init__(self, entry: ConfigEntry, data: SpcRuntimeData) -> None:
+        """Initialize the sensor device."""
+        super().__init__(entry=entry, data=data, suffix="last_frame")
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_native_value = self._data.connection.last_frame
+
+
+class SpcBridgeReconnectsSensor(SpcBridgeEntity, SensorEntity):
+    """Representation of the websocket reconnect count."""
+
+    _attr_translation_key = "bridge_reconnects"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, entry: ConfigEntry, data: SpcRuntimeData) -> None:
+        """Initialize the sensor device."""
+        super().__init__(entry=entry, data=data, suffix="reconnects")
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_native_value = self._data.connection.reconnects
+
+
+class SpcBridgeRestLatencySensor(SpcBridgeEntity, SensorEntity):
+    """Representation of a percentile of the REST round-trip time."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    def __init__(
+        self, entry: ConfigEntry, data: SpcRuntimeData, percentile: int
+    ) -> None:
+        """Initialize the sensor device."""
+        super().__init__(entry=entry, data=data, suffix=f"rest_latency_p{percentile}")
+        self._percentile = percentile
+        self._attr_translation_key = f"bridge_rest_latency_p{percentile}"
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        http_stats = self._data.http_stats
+        self._attr_native_value = http_stats.latency(self._percentile)
+        self._attr_extra_state_attributes = {
+            "requests": http_stats.requests,
+            "failures": http_stats.failures,
+        }
+
+
+class SpcBridgeCommandLatencySensor(SpcBridgeEntity, SensorEntity):
+    """Representation of the latency of the last command."""
+
+    _attr_translation_key = "bridge_command_latency"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    def __init__(self, entry: ConfigEntry, data: SpcRuntimeData) -> None:
+        """Initialize the sensor device."""
+        super().__init__(entry=entry, data=data, suffix="command_latency")
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        stats = self._data.commands.stats
+        self._attr_native_value = stats["latency_last"] if stats["commands"] else None
+        self._attr_extra_state_attributes = {
+            "average": stats["latency_avg"],
+            "max": stats["latency_max"],
+            "commands": stats["commands"],
+            "failures": stats["failures"],
+        }
+
+
+class SpcBridgeEventRateSensor(SpcBridgeEntity, SensorEntity):
+    """Representation of the websocket frames received per minute."""
+
+    _attr_translation_key = "bridge_event_rate"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "events/min"
+
+    def __init__(self, entry: ConfigEntry, data: SpcRuntimeData) -> None:
+        """Initialize the sensor device."""
+        super().__init__(entry=entry, data=data, suffix="event_rate")
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        self._attr_native_value = self._data.connection.frames_per_minute
+
+
+class SpcBridgeEventLatencySensor(SpcBridgeEntity, SensorEntity):
+    """Representation of the latency from websocket frame to state write."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    def __init__(
+        self, entry: ConfigEntry, data: SpcRuntimeData, object_type: str
+    ) -> None:
+        """Initialize the sensor device."""
+        super().__init__(entry=entry, data=data, suffix=f"event_latency_{object_type}")
+        self._object_type = object_type
+        self._attr_translation_key = f"bridge_event_latency_{object_type}"
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        if (histogram := self._data.dispatcher.latency.get(self._object_type)) is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {"updates": 0}
+            return
+        latency = histogram.as_dict()
+        self._attr_native_value = latency["avg"]
+        self._attr_extra_state_attributes = {
+            "updates": latency["count"],
+            "max": latency["max"],
+        }
@@ -0,0 +1,81 @@
+"""Statistics of the SPC Bridge pipeline."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# Upper bounds (ms) of the latency histogram buckets
+LATENCY_BUCKETS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+# Upper bounds (ms) of the buckets of callbacks running in the event loop
+CALLBACK_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 50)
+# Upper bounds (ms) of the buckets from websocket frame to state write
+EVENT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class LatencyHistogram:
+    """Histogram of latencies with fixed buckets.
+
+    Adding a sample is a bisect and an increment, so it can be used on hot
+    paths without keeping the samples.
+    """
+
+    def __init__(self, buckets: tuple[int, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize the histogram."""
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def add(self, latency: float) -> None:
+        """Add a latency in seconds."""
+        ms = latency * 1000
+        self._counts[bisect_left(self._buckets, ms)] += 1
+        self._count += 1
+        self._total += ms
+        self._max = max(self._max, ms)
+
+    @property
+    def count(self) -> int:
+        """Return the number of samples."""
+        return self._count
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the sample count, average and maximum (ms) and the buckets."""
+        buckets = {f"le_{bound}": n for bound, n in zip(self._buckets, self._counts)}
+        buckets["inf"] = self._counts[-1]
+        return {
+            "count": self._count,
+            "avg": round(self._total / self._count, 3) if self._count else None,
+            "max": round(self._max, 3),
+            "buckets": buckets,
+        }
+
+
+class SpcPerfCounters:
+    """Timing histograms of the hot paths of the event pipeline.
+
+    The callers only read the clock while the counters are enabled, e.g. by
+    the profile service, so disabled counters cost one attribute lookup.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.enabled = False
+        self._timers: dict[str, LatencyHistogram] = {}
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return the histogram of each timed path."""
+        return {name: timer.as_dict() for name, timer in sorted(self._timers.items())}
+
+    def add(self, name: str, duration: float) -> None:
+        """Add the duration (s) of a timed path."""
+        if (timer := self._timers.get(name)) is None:
+            timer = self._timers[name] = LatencyHistogram(CALLBACK_BUCKETS)
+        timer.add(duration)
+
+    def reset(self) -> None:
+        """Remove all histograms."""
+        self._timers = {}
@@ -0,0 +1,415 @@
+"""Persist the SPC configuration and status between restarts."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from pyspcbridge import SpcBridge
+from pyspcbridge.area import Area
+from pyspcbridge.const import ZoneType
+from pyspcbridge.door import Door
+from pyspcbridge.output import Output
+from pyspcbridge.panel import Panel
+from pyspcbridge.user import User
+from pyspcbridge.zone import Zone
+
+from .const import DOMAIN
+from .dispatcher import object_type
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STATUS_SAVE_DELAY = 10  # s
+
+# Values that define the devices and entities, a change requires a reload
+TOPOLOGY_KEYS = {
+    "panel": ["type", "model", "serial", "firmware", "pincode_length"],
+    "users": ["id", "name"],
+    "areas": [
+        "id",
+        "name",
+        "a_enabled",
+        "a_name",
+        "b_enabled",
+        "b_name",
+        "exittime",
+        "entrytime",
+    ],
+    "zones": ["id", "name", "type", "area_id"],
+    "outputs": ["id", "name"],
+    "doors": ["id", "name"],
+}
+
+
+# Device type of the SPC objects of each resource
+OBJECT_TYPES = {
+    "areas": "area",
+    "zones": "zone",
+    "outputs": "output",
+    "doors": "door",
+}
+
+
+@dataclass
+class SpcChanges:
+    """SPC objects added and removed by a configuration change."""
+
+    added: set[tuple[str, int]]
+    removed: set[tuple[str, int]]
+
+
+def _topology(spc_data: dict) -> dict:
+    """Return the part of the SPC data that defines devices and entities."""
+    topology = {"panel": [spc_data["panel"].get(k) for k in TOPOLOGY_KEYS["panel"]]}
+    for resource in ("users", "areas", "zones", "outputs", "doors"):
+        topology[resource] = [
+            [item.get(k) for k in TOPOLOGY_KEYS[resource]]
+            for item in spc_data[resource]
+        ]
+    return topology
+
+
+def _get_store(hass: HomeAssistant, entry: ConfigEntry) -> Store[dict]:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+
+
+async def async_remove_store(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored SPC data of a config entry."""
+    await _get_store(hass, entry).async_remove()
+
+
+class SpcStore:
+    """Last known SPC configuration and status of a SPC Bridge.
+
+    The SPC objects are created from the stored data at startup, so entities
+    exist without waiting for the bridge. The live data is fetched afterwards
+    and only the differences are applied. Until then the stored states may be
+    outdated, `live` is False. The status of the SPC objects is saved shortly
+    after it changes and at shutdown.
+
+    Websocket frames keep updating the SPC objects while the bridge is
+    fetched. Their updates are newer than the fetched data, so the objects
+    they updated keep their status, also when the objects are recreated.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, spc: SpcBridge):
+        """Initialize the store."""
+        self._spc = spc
+        self._store = _get_store(hass, entry)
+        self._spc_data: dict | None = None
+        self._save_scheduled = False
+        # Sequence number of the last update by a websocket frame, per object
+        self._update_seq = 0
+        self._frame_updates: dict[tuple[str, int], int] = {}
+        self.live = False
+
+    async def async_load(self) -> bool:
+        """Create the SPC objects from the stored data, if any."""
+        if (spc_data := await self._store.async_load()) is None:
+            return False
+        try:
+            self._create_objects(spc_data)
+        except (KeyError, TypeError) as err:
+            _LOGGER.warning("Ignoring invalid stored SPC data: %s", err)
+            return False
+        self._spc_data = spc_data
+        return True
+
+    async def async_fetch(self) -> dict | None:
+        """Fetch configuration and status from the SPC Bridge."""
+        http_client = self._spc._http_client
+        panel_data = await http_client.async_get_panel()
+        await asyncio.sleep(0.1)
+        users_data = await http_client.async_get_users()
+        await asyncio.sleep(0.1)
+        areas_data = await http_client.async_get_areas()
+        await asyncio.sleep(0.1)
+        zones_data = await http_client.async_get_zones()
+        await asyncio.sleep(0.1)
+        outputs_data = await http_client.async_get_outputs()
+        await asyncio.sleep(0.1)
+        doors_data = await http_client.async_get_doors()
+
+        # Get exit and entry times for each area
+        for a in areas_data:
+            a["exittime"] = 0
+            a["entrytime"] = 0
+            if (id := a.get("id")) is not None:
+                await asyncio.sleep(0.1)
+                config = await http_client.async_get_area_configs(id=id)
+                if config and list(config):
+                    a["exittime"] = config[0].get("exittime", 0)
+                    a["entrytime"] = config[0].get("entrytime", 0)
+
+        if not zones_data or not areas_data:
+            return None
+
+        return {
+            "panel": panel_data,
+            "users": users_data,
+            "areas": areas_data,
+            "zones": zones_data,
+            "outputs": outputs_data or [],
+            "doors": doors_data or [],
+        }
+
+    async def async_load_live(self) -> bool:
+        """Create the SPC objects from the live data of the SPC Bridge."""
+        if (spc_data := await self.async_fetch()) is None:
+            return False
+        self._create_objects(spc_data)
+        self._spc_data = spc_data
+        self.live = True
+        await self._async_save(spc_data)
+        return True
+
+    async def async_refresh(self) -> SpcChanges | None:
+        """Apply the live data of the SPC Bridge to the SPC objects.
+
+        If the configuration changed, the SPC objects are recreated and the
+        added and removed objects are returned.
+        """
+        seq = self._update_seq
+        if (spc_data := await self.async_fetch()) is None:
+            return None
+        updated = self._updated_since(seq)
+        self.live = True
+        old_data = self._spc_data
+        self._spc_data = spc_data
+        if _topology(spc_data) == _topology(old_data):
+            self._apply_status(spc_data, updated)
+            await self._async_save(self._data_to_save())
+            return None
+
+        _LOGGER.debug("SPC configuration changed")
+        self._create_objects(self._with_status(spc_data, updated))
+        await self._async_save(self._data_to_save())
+        changes = SpcChanges(set(), set())
+        for resource, _object_type in OBJECT_TYPES.items():
+            old_ids = {item["id"] for item in old_data[resource]}
+            new_ids = {item["id"] for item in spc_data[resource]}
+            changes.added.update((_object_type, id) for id in new_ids - old_ids)
+            changes.removed.update((_object_type, id) for id in old_ids - new_ids)
+        return changes
+
+    async def async_resync(self) -> bool | None:
+        """Apply the current status of the SPC Bridge to the SPC objects.
+
+        Only the status is fetched, e.g. after the websocket reconnected, and
+        only SPC objects that changed meanwhile are updated. Returns whether
+        any SPC object changed, or None if the objects of the bridge changed,
+        which requires a refresh.
+        """
+        http_client = self._spc._http_client
+        seq = self._update_seq
+        status = {}
+        for resource, async_get in (
+            ("areas", http_client.async_get_areas),
+            ("zones", http_client.async_get_zones),
+            ("outputs", http_client.async_get_outputs),
+            ("doors", http_client.async_get_doors),
+        ):
+            if status:
+                await asyncio.sleep(0.1)
+            status[resource] = await async_get() or []
+            old_ids = [item["id"] for item in self._spc_data[resource]]
+            if [item.get("id") for item in status[resource]] != old_ids:
+                return None
+        changed = self._apply_status(status, self._updated_since(seq))
+        self.live = True
+        return changed
+
+    @callback
+    def async_update(self, spc_objects, received: float | None) -> None:
+        """Note updated SPC objects and save their status after a delay.
+
+        received is the receipt time of the websocket frame with the updates,
+        None for updates that were fetched.
+        """
+        if received is not None:
+            self._update_seq += 1
+            for _object in spc_objects:
+                if (_object_type := object_type(_object)) is not None:
+                    self._frame_updates[(_object_type, _object.id)] = self._update_seq
+        self.async_schedule_save()
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Save the status of the SPC objects after a delay.
+
+        Called for every update, the save is scheduled once and saves the
+        status at the time it is written.
+        """
+        if self._spc_data is None or self._save_scheduled:
+            return
+        self._save_scheduled = True
+        self._store.async_delay_save(self._data_to_save, STATUS_SAVE_DELAY)
+
+    async def _async_save(self, spc_data: dict) -> None:
+        # Replaces a scheduled save
+        self._save_scheduled = False
+        await self._store.async_save(spc_data)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        """Return the SPC data with the current status of the SPC objects."""
+        self._save_scheduled = False
+        return self._with_status(self._spc_data)
+
+    def _with_status(
+        self, spc_data: dict, keys: set[tuple[str, int]] | None = None
+    ) -> dict:
+        """Return spc_data with the current status of the SPC objects.
+
+        keys limits the status to the objects (object type, id) in it.
+        """
+        spc = self._spc
+
+        def _current(object_type: str, objects: dict, item: dict) -> object | None:
+            if keys is not None and (object_type, item["id"]) not in keys:
+                return None
+            return objects.get(item["id"])
+
+        return {
+            **spc_data,
+            "areas": [
+                {
+                    **a,
+                    "mode": area.mode,
+                    "set_user": area.set_user,
+                    "unset_user": area.unset_user,
+                }
+                if (area := _current("area", spc.areas, a))
+                else a
+                for a in spc_data["areas"]
+            ],
+            "zones": [
+                {**z, "input": zone.input, "status": zone.values["status"]}
+                if (zone := _current("zone", spc.zones, z))
+                else z
+                for z in spc_data["zones"]
+            ],
+            "outputs": [
+                {**o, "state": 1 if output.state else 0}
+                if (output := _current("output", spc.outputs, o))
+                else o
+                for o in spc_data["outputs"]
+            ],
+            "doors": [
+                {**d, "mode": door.mode}
+                if (door := _current("door", spc.doors, d))
+                else d
+                for d in spc_data["doors"]
+            ],
+        }
+
+    def _updated_since(self, seq: int) -> set[tuple[str, int]]:
+        """Return the SPC objects updated by websocket frames after seq."""
+        return {key for key, _seq in self._frame_updates.items() if _seq > seq}
+
+    def zone_types(self) -> dict[int, ZoneType | None]:
+        """Return the configured type of each SPC zone, None if unknown."""
+        zone_types = {}
+        for z in self._spc_data["zones"]:
+            try:
+                zone_types[z["id"]] = ZoneType(int(z.get("type", 0)))
+            except ValueError:
+                zone_types[z["id"]] = None
+        return zone_types
+
+    def set_users_config(self, users_config: dict) -> None:
+        """Recreate the SPC users with a changed keypad code mapping."""
+        spc = self._spc
+        users = {}
+        for u in self._spc_data["users"]:
+            user = User(u, users_config)
+            users[user.id] = user
+        spc._users_config = users_config
+        spc._users = users
+
+    def _create_objects(self, spc_data: dict) -> None:
+        """Create the SPC objects like SpcBridge.async_load_config."""
+        spc = self._spc
+        areas = {}
+        zones = {}
+        for a in spc_data["areas"]:
+            area = Area(spc, a)
+            area.zones = [
+                Zone(spc, area, z)
+                for z in spc_data["zones"]
+                if z.get("area_id") == a.get("id")
+            ]
+            areas[area.id] = area
+            zones.update({z.id: z for z in area.zones})
+        panel = Panel(spc, spc_data["panel"], areas.values())
+        users = {}
+        for u in spc_data["users"]:
+            user = User(u, spc._users_config)
+            users[user.id] = user
+        outputs = {}
+        for o in spc_data["outputs"]:
+            output = Output(spc, o)
+            outputs[output.id] = output
+        doors = {}
+        for d in spc_data["doors"]:
+            door = Door(spc, d)
+            doors[door.id] = door
+
+        spc._panel = panel
+        spc._users = users
+        spc._areas = areas
+        spc._zones = zones
+        spc._outputs = outputs
+        spc._doors = doors
+
+    def _current_status(self) -> tuple[list, ...]:
+        """Return the status values of the SPC objects."""
+        spc = self._spc
+        return (
+            [(a.mode, a.set_user, a.unset_user) for a in spc.areas.values()],
+            [(z.input, z.values["status"]) for z in spc.zones.values()],
+            [o.state for o in spc.outputs.values()],
+            [d.mode for d in spc.doors.values()],
+        )
+
+    @callback
+    def _apply_status(self, spc_data: dict, skip: set[tuple[str, int]]) -> bool:
+        """Update the SPC objects with changed status values.
+
+        The objects (object type, id) in skip are not updated. Returns True
+        if any SPC object changed.
+        """
+        spc = self._spc
+        status = self._current_status()
+        for a in spc_data["areas"]:
+            if ("area", a["id"]) in skip:
+                continue
+            area = spc.areas[a["id"]]
+            # Users are not compared by the area, only pass changed ones
+            values = {"mode": a.get("mode")}
+            for key in ("set_user", "unset_user"):
+                if a.get(key) != getattr(area, key):
+                    values[key] = a.get(key)
+            spc.set_value("area", area.id, values)
+        for z in spc_data["zones"]:
+            if ("zone", z["id"]) in skip:
+                continue
+            spc.set_value(
+                "zone",
+                z["id"],
+                {"input": z.get("input", 0), "status": z.get("status", 0)},
+            )
+        for o in spc_data["outputs"]:
+            if ("output", o["id"]) in skip:
+                continue
+            spc.set_value("output", o["id"], {"state": o.get("state", 0) == 1})
+        for d in spc_data["doors"]:
+            if ("door", d["id"]) in skip:
+                continue
+            spc.set_value("door", d["id"], {"mode": d.get("mode", 0)})
+        return self._current_status() != status
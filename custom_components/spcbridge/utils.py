@@ -1,5 +1,6 @@
 from ipaddress import IPv6Address, ip_address
 
+from homeassistant.util import dt as dt_util
 from pyspcbridge.const import ArmMode, DoorMode
 
 ARM_MODE_TO_NAME = {
@@ -28,6 +29,36 @@ def door_mode_to_name(mode):
     return DOOR_MODE_TO_NAME.get(mode, "unknown")
 
 
+EVENT_MESSAGE_KEYS = ["ev_desc", "area_name", "zone_name", "mg_name", "door_name"]
+
+
+def _event_id(event: dict, key: str) -> int | None:
+    try:
+        return int(event[key])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def parse_event(data: dict) -> dict:
+    """Parse the SIA event of a websocket frame into structured event data."""
+    return {
+        "message": " - ".join(v for key in EVENT_MESSAGE_KEYS if (v := data.get(key))),
+        "event_id": _event_id(data, "ev_id"),
+        "sia_code": data.get("sia_code"),
+        "description": data.get("ev_desc"),
+        "area_id": _event_id(data, "area_id"),
+        "area_name": data.get("area_name"),
+        "zone_id": _event_id(data, "zone_id"),
+        "zone_name": data.get("zone_name"),
+        "user_name": data.get("user_name"),
+        "door_id": _event_id(data, "door_id"),
+        "door_name": data.get("door_name"),
+        "output_id": _event_id(data, "mg_id"),
+        "output_name": data.get("mg_name"),
+        "timestamp": dt_util.utcnow().isoformat(),
+    }
+
+
 def get_host(host: str) -> str:
     """Get the device IP address or hostname."""
     try:
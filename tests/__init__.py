@@ -0,0 +1 @@
+"""Tests for the SPC Bridge integration."""
@@ -0,0 +1 @@
+"""Benchmarks for the SPC Bridge integration."""
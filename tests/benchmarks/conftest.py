@@ -0,0 +1,55 @@
+"""Fixtures for the SPC Bridge benchmarks."""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+from collections.abc import Callable, Generator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from homeassistant.const import __version__ as HA_VERSION
+
+# File the results of a benchmark run are written to, if set
+BENCHMARK_JSON = "SPCBRIDGE_BENCHMARK_JSON"
+
+
+@pytest.fixture(scope="session")
+def benchmark_results() -> Generator[list[dict[str, Any]]]:
+    """Collect the results of the session and write them as JSON."""
+    results: list[dict[str, Any]] = []
+    yield results
+    if results and (path := os.environ.get(BENCHMARK_JSON)):
+        Path(path).write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "homeassistant": HA_VERSION,
+                    "machine": platform.machine(),
+                    "results": results,
+                },
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+
+
+@pytest.fixture
+def benchmark(
+    request: pytest.FixtureRequest, benchmark_results: list[dict[str, Any]]
+) -> Callable[[dict[str, Any]], None]:
+    """Return a function recording a result of the benchmark.
+
+    Results are printed as one JSON line and collected for the file named by
+    SPCBRIDGE_BENCHMARK_JSON.
+    """
+
+    def _record(result: dict[str, Any]) -> None:
+        result = {"benchmark": request.node.name, **result}
+        benchmark_results.append(result)
+        print(f"\n{json.dumps(result)}")
+
+    return _record
@@ -0,0 +1,117 @@
+"""Benchmark of the zone update dispatch path.
+
+Feeds zone events through the integration and counts the tasks created and
+the event loop time spent per 1000 events, once with the direct state writes
+of SpcEntity and once with the task based refresh used before.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from unittest.mock import patch
+
+from homeassistant import core as ha_core
+from homeassistant.core import HomeAssistant, callback
+
+from custom_components.spcbridge.const import DOMAIN
+from custom_components.spcbridge.entity import SpcEntity
+
+from ..common import async_settle
+
+EVENTS = 1000
+ZONES = 64
+
+
+class TaskCounter:
+    """Count the tasks created on the event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Init the counter."""
+        self._loop = loop
+        self._factory = loop.get_task_factory()
+        self._create_eager_task = ha_core.create_eager_task
+        self.count = 0
+
+    def __enter__(self) -> TaskCounter:
+        """Start counting."""
+
+        def task_factory(loop, coro, **kwargs):
+            self.count += 1
+            if self._factory is not None:
+                return self._factory(loop, coro, **kwargs)
+            return asyncio.Task(coro, loop=loop, **kwargs)
+
+        def create_eager_task(coro, **kwargs):
+            self.count += 1
+            return self._create_eager_task(coro, **kwargs)
+
+        self._loop.set_task_factory(task_factory)
+        self._patch = patch.object(ha_core, "create_eager_task", create_eager_task)
+        self._patch.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Stop counting."""
+        self._patch.stop()
+        self._loop.set_task_factory(self._factory)
+
+
+async def _async_run_events(hass: HomeAssistant, entry) -> dict:
+    """Toggle zone inputs and return the measured figures."""
+    spc = hass.data[DOMAIN][entry.entry_id]
+    writes = 0
+
+    @callback
+    def _count_write(event) -> None:
+        nonlocal writes
+        # Area readiness sensors follow the zones, only count the zones
+        if event.data["entity_id"].startswith("binary_sensor.zone_"):
+            writes += 1
+
+    unsub = hass.bus.async_listen("state_changed", _count_write)
+    with TaskCounter(hass.loop) as counter:
+        start = time.perf_counter()
+        for i in range(EVENTS):
+            spc.set_value("zone", i % ZONES + 1, {"input": (i // ZONES + 1) % 2})
+            # One websocket frame per loop iteration, as in production
+            await asyncio.sleep(0)
+        await async_settle(hass)
+        elapsed = time.perf_counter() - start
+    unsub()
+
+    return {
+        "tasks": counter.count,
+        "state_writes": writes,
+        "loop_ms": round(elapsed * 1000, 1),
+    }
+
+
+async def test_zone_event_dispatch(
+    hass: HomeAssistant, setup_integration, benchmark: Callable[[dict], None]
+) -> None:
+    """Compare the direct write path with the task based refresh."""
+    entry = await setup_integration(areas=4, zones=ZONES)
+    direct = await _async_run_events(hass, entry)
+
+    @callback
+    def _legacy_update_callback(self) -> None:
+        self.async_schedule_update_ha_state(True)
+
+    async def _legacy_async_update(self) -> None:
+        self._async_update_attrs()
+
+    with (
+        patch.object(SpcEntity, "_update_callback", _legacy_update_callback),
+        patch.object(SpcEntity, "async_update", _legacy_async_update, create=True),
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        await async_settle(hass)
+        legacy = await _async_run_events(hass, entry)
+
+    benchmark(
+        {"zones": ZONES, "events": EVENTS, "direct": direct, "task_based": legacy}
+    )
+    assert direct["state_writes"] == EVENTS
+    assert direct["tasks"] < legacy["tasks"]
@@ -0,0 +1,120 @@
+"""Benchmark of the integration with growing panels.
+
+Sets up panels with 8, 64 and 512 zones and measures the setup time of the
+entry and of its platforms, the zone events per second through the update
+callback, the state writes per event and the memory allocated per entity.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.spcbridge.const import DOMAIN
+
+from ..common import async_settle
+
+EVENTS = 1000
+# Areas of the generated panel by number of zones
+PANELS = {8: 2, 64: 4, 512: 16}
+
+
+async def _async_setup_timed(hass: HomeAssistant, entry) -> tuple[float, float]:
+    """Set up the entry and return the seconds of the setup and the platforms."""
+    forward = hass.config_entries.async_forward_entry_setups
+    platforms = 0.0
+
+    async def _async_forward_timed(*args, **kwargs) -> None:
+        nonlocal platforms
+        start = time.perf_counter()
+        await forward(*args, **kwargs)
+        platforms = time.perf_counter() - start
+
+    with patch.object(
+        hass.config_entries, "async_forward_entry_setups", _async_forward_timed
+    ):
+        start = time.perf_counter()
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        setup = time.perf_counter() - start
+    return setup, platforms
+
+
+async def _async_run_events(hass: HomeAssistant, entry, zones: int) -> dict[str, Any]:
+    """Toggle zone inputs and return the measured figures per event."""
+    spc = hass.data[DOMAIN][entry.entry_id]
+    dispatcher = entry.runtime_data.dispatcher
+    skipped = dispatcher.stats["skipped_writes"]
+    writes = 0
+
+    @callback
+    def _count_write(event) -> None:
+        nonlocal writes
+        writes += 1
+
+    unsub = hass.bus.async_listen("state_changed", _count_write)
+    start = time.perf_counter()
+    for i in range(EVENTS):
+        spc.set_value("zone", i % zones + 1, {"input": (i // zones + 1) % 2})
+        # One websocket frame per loop iteration, as in production
+        await asyncio.sleep(0)
+    await async_settle(hass)
+    elapsed = time.perf_counter() - start
+    unsub()
+
+    return {
+        "events_per_s": round(EVENTS / elapsed),
+        "state_writes_per_event": round(writes / EVENTS, 3),
+        "skipped_writes_per_event": round(
+            (dispatcher.stats["skipped_writes"] - skipped) / EVENTS, 3
+        ),
+    }
+
+
+@pytest.mark.parametrize("zones", sorted(PANELS))
+async def test_panel_scale(
+    hass: HomeAssistant,
+    setup_integration,
+    benchmark: Callable[[dict[str, Any]], None],
+    zones: int,
+) -> None:
+    """Measure setup, event throughput and memory of a panel."""
+    # The first setup loads the panel from the mocked bridge and creates the
+    # entity registry entries, all allocations it keeps count as memory
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        entry = await setup_integration(areas=PANELS[zones], zones=zones)
+        memory = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    entities = len(
+        er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    )
+
+    # Setups after a restart read the panel from the store
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    setup, platforms = await _async_setup_timed(hass, entry)
+    await async_settle(hass)
+
+    events = await _async_run_events(hass, entry, zones)
+    benchmark(
+        {
+            "zones": zones,
+            "areas": PANELS[zones],
+            "entities": entities,
+            "setup_ms": round(setup * 1000, 1),
+            "platforms_ms": round(platforms * 1000, 1),
+            **events,
+            "memory_per_entity_kb": round(memory / entities / 1024, 2),
+        }
+    )
+    assert events["state_writes_per_event"] >= 1
+    assert await hass.config_entries.async_unload(entry.entry_id)
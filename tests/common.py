@@ -0,0 +1,232 @@
+"""Common helpers for the SPC Bridge integration tests."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncGenerator, AsyncIterator, Generator
+from contextlib import asynccontextmanager, contextmanager
+from copy import deepcopy
+from unittest.mock import patch
+
+from aiohttp import ClientConnectionError, ClientSession, WSMessage, WSMsgType
+from homeassistant.const import CONF_IP_ADDRESS, CONF_PORT
+from homeassistant.core import HomeAssistant
+from pyspcbridge.spc_http_client import SpcHttpClient
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.spcbridge.const import (
+    CONF_AREAS_INCLUDE_DATA,
+    CONF_DOORS_INCLUDE_DATA,
+    CONF_GET_PASSWORD,
+    CONF_GET_USERNAME,
+    CONF_OUTPUTS_INCLUDE_DATA,
+    CONF_PUT_PASSWORD,
+    CONF_PUT_USERNAME,
+    CONF_USER_IDENTIFY_BY_ID,
+    CONF_USER_IDENTIFY_METHOD,
+    CONF_USERS_DATA,
+    CONF_WS_PASSWORD,
+    CONF_WS_USERNAME,
+    CONF_ZONES_INCLUDE_DATA,
+    DOMAIN,
+)
+
+PANEL_SERIAL = "123456789"
+
+
+def generate_spc_data(
+    areas: int = 2, zones: int = 8, outputs: int = 1, doors: int = 1
+) -> dict:
+    """Generate SPC data in the format returned by the pyspcbridge http client."""
+    return {
+        "panel": {
+            "type": "SPC6000",
+            "model": "SPC6350.320",
+            "serial": PANEL_SERIAL,
+            "firmware": "3.8.5",
+            "pincode_length": 4,
+        },
+        "users": [{"id": 1, "name": "Engineer"}, {"id": 2, "name": "User 2"}],
+        "areas": [
+            {
+                "id": a,
+                "name": f"Area {a}",
+                "mode": 0,
+                "a_enabled": True,
+                "a_name": "Partset A",
+                "b_enabled": False,
+                "b_name": "Partset B",
+                "set_user": "",
+                "unset_user": "",
+                "exittime": 45,
+                "entrytime": 30,
+            }
+            for a in range(1, areas + 1)
+        ],
+        "zones": [
+            {
+                "id": z,
+                "name": f"Zone {z}",
+                "type": 0,
+                "input": 0,
+                "status": 0,
+                "area_id": (z - 1) % areas + 1,
+                "area_name": f"Area {(z - 1) % areas + 1}",
+            }
+            for z in range(1, zones + 1)
+        ],
+        "outputs": [
+            {"id": o, "name": f"Output {o}", "state": 0} for o in range(1, outputs + 1)
+        ],
+        "doors": [
+            {"id": d, "name": f"Door {d}", "status": 0, "mode": 0}
+            for d in range(1, doors + 1)
+        ],
+    }
+
+
+@contextmanager
+def mock_spc_http_client(spc_data: dict) -> Generator[None]:
+    """Serve spc_data from the pyspcbridge http client."""
+
+    def _get(resource):
+        async def async_get(self, id=None):
+            return deepcopy(spc_data[resource])
+
+        return async_get
+
+    async def async_get_area_configs(self, id=None):
+        for a in spc_data["areas"]:
+            if a["id"] == id:
+                return [{"exittime": a["exittime"], "entrytime": a["entrytime"]}]
+        return []
+
+    with (
+        patch.object(SpcHttpClient, "async_get_panel", _get("panel")),
+        patch.object(SpcHttpClient, "async_get_users", _get("users")),
+        patch.object(SpcHttpClient, "async_get_areas", _get("areas")),
+        patch.object(SpcHttpClient, "async_get_zones", _get("zones")),
+        patch.object(SpcHttpClient, "async_get_outputs", _get("outputs")),
+        patch.object(SpcHttpClient, "async_get_doors", _get("doors")),
+        patch.object(SpcHttpClient, "async_get_area_configs", async_get_area_configs),
+    ):
+        yield
+
+
+def mock_config_entry(
+    spc_data: dict, zone_mode: str = "door", port: int = 8088
+) -> MockConfigEntry:
+    """Return a config entry including all objects of spc_data."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="SPC6000",
+        unique_id=spc_data["panel"]["serial"],
+        data={},
+        options={
+            CONF_IP_ADDRESS: "127.0.0.1",
+            CONF_PORT: port,
+            CONF_GET_USERNAME: "get_user",
+            CONF_GET_PASSWORD: "get_pwd",
+            CONF_PUT_USERNAME: "put_user",
+            CONF_PUT_PASSWORD: "put_pwd",
+            CONF_WS_USERNAME: "ws_user",
+            CONF_WS_PASSWORD: "ws_pwd",
+            CONF_USER_IDENTIFY_METHOD: CONF_USER_IDENTIFY_BY_ID,
+            CONF_USERS_DATA: {},
+            CONF_AREAS_INCLUDE_DATA: {
+                str(a["id"]): "include" for a in spc_data["areas"]
+            },
+            CONF_ZONES_INCLUDE_DATA: {
+                str(z["id"]): zone_mode for z in spc_data["zones"]
+            },
+            CONF_OUTPUTS_INCLUDE_DATA: {
+                str(o["id"]): "include" for o in spc_data["outputs"]
+            },
+            CONF_DOORS_INCLUDE_DATA: {
+                str(d["id"]): "include" for d in spc_data["doors"]
+            },
+        },
+    )
+
+
+class MockWebsocket:
+    """Websocket of a mocked SPC Bridge.
+
+    Frames sent are received on the open connection, close() drops it and
+    while refuse is set connecting fails.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the websocket."""
+        self._messages: asyncio.Queue[str | None] | None = None
+        self.connects = 0
+        self.refuse = False
+
+    @property
+    def connected(self) -> bool:
+        """Return True if a connection is open."""
+        return self._messages is not None
+
+    def send(self, frame: dict) -> None:
+        """Send a frame on the open connection."""
+        self._messages.put_nowait(json.dumps(frame))
+
+    def close(self) -> None:
+        """Close the open connection."""
+        self._messages.put_nowait(None)
+
+    @asynccontextmanager
+    async def async_connect(self) -> AsyncGenerator[AsyncIterator[WSMessage]]:
+        """Open a connection, as ClientSession.ws_connect."""
+        if self.refuse:
+            raise ClientConnectionError("Connection refused")
+        self.connects += 1
+        self._messages = asyncio.Queue()
+        try:
+            yield self._async_receive(self._messages)
+        finally:
+            self._messages = None
+
+    @staticmethod
+    async def _async_receive(
+        messages: asyncio.Queue[str | None],
+    ) -> AsyncGenerator[WSMessage]:
+        while (data := await messages.get()) is not None:
+            yield WSMessage(WSMsgType.TEXT, data, None)
+
+
+@contextmanager
+def mock_websocket() -> Generator[MockWebsocket]:
+    """Connect the websockets of all client sessions to a MockWebsocket."""
+    websocket = MockWebsocket()
+    with patch.object(
+        ClientSession,
+        "ws_connect",
+        lambda session, *args, **kwargs: websocket.async_connect(),
+    ):
+        yield websocket
+
+
+def sia_frame(event: dict) -> dict:
+    """Return a websocket frame of the bridge with a SIA event."""
+    return {"status": "success", "data": {"sia": event}}
+
+
+async def async_settle(hass: HomeAssistant) -> None:
+    """Wait until all tasks are done and coalesced updates are dispatched.
+
+    The websocket connections run until their entries are unloaded, all other
+    background tasks are waited for.
+    """
+    await hass.async_block_till_done()
+    while tasks := [
+        task
+        for task in hass._background_tasks
+        if not task.get_name().startswith("spcbridge_websocket_")
+    ]:
+        await asyncio.wait(tasks)
+        await hass.async_block_till_done()
+    # The dispatcher flushes on the next event loop tick
+    await asyncio.sleep(0)
+    await hass.async_block_till_done()
@@ -0,0 +1,66 @@
+"""Fixtures for the SPC Bridge integration tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
+from contextlib import ExitStack
+from pathlib import Path
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from .common import (
+    MockWebsocket,
+    async_settle,
+    generate_spc_data,
+    mock_config_entry,
+    mock_spc_http_client,
+    mock_websocket,
+)
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Enable custom integrations in all tests."""
+    return
+
+
+@pytest.fixture
+def config_dir(hass: HomeAssistant, tmp_path: Path) -> Path:
+    """Use a temporary configuration directory for the files a test writes."""
+    hass.config.config_dir = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def websocket() -> Generator[MockWebsocket]:
+    """Serve the websocket of the bridge, connected until the end of the test."""
+    with mock_websocket() as websocket:
+        yield websocket
+
+
+@pytest.fixture
+async def setup_integration(
+    hass: HomeAssistant, websocket: MockWebsocket
+) -> AsyncGenerator[Callable[..., Awaitable[MockConfigEntry]]]:
+    """Return a function that sets up the integration with a generated panel.
+
+    The bridge stays mocked until the end of the test, so the entry can be
+    reloaded.
+    """
+    with ExitStack() as stack:
+
+        async def _setup(spc_data: dict | None = None, **kwargs) -> MockConfigEntry:
+            if spc_data is None:
+                spc_data = generate_spc_data(**kwargs)
+            stack.enter_context(mock_spc_http_client(spc_data))
+            entry = mock_config_entry(spc_data)
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await async_settle(hass)
+            return entry
+
+        yield _setup
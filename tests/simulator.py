@@ -0,0 +1,707 @@
+"""Fake SPC Bridge for load and regression tests.
+
+Serves the REST endpoints and the websocket of a SPC Bridge as used by
+pyspcbridge on 127.0.0.1, so the integration runs unmodified against it
+without network access. Like the bridge, requests of the get and put users
+are authenticated by HTTP digest and the websocket user by query parameters,
+over TLS with a self-signed certificate. Without credentials plain HTTP and
+websocket are served.
+
+The panel is generated by generate_spc_data, or given in the same format.
+Commands change the panel state and send the event the panel would send,
+and events are sent one by one or as scripted or random streams at a chosen
+rate.
+
+Run `python -m tests.simulator --zones 64 --rate 5` to point a development
+instance of Home Assistant at a simulated bridge.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import re
+import secrets
+import ssl
+import tempfile
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from contextlib import suppress
+from copy import deepcopy
+from datetime import UTC, datetime, timedelta
+from functools import cache
+from pathlib import Path
+from random import Random
+from typing import Any
+
+from aiohttp import WSCloseCode, web
+
+from .common import generate_spc_data
+
+HOST = "127.0.0.1"
+REALM = "SPC Bridge"
+
+DEFAULT_CREDENTIALS = {
+    "get_username": "get_user",
+    "get_password": "get_pwd",
+    "put_username": "put_user",
+    "put_password": "put_pwd",
+    "ws_username": "ws_user",
+    "ws_password": "ws_pwd",
+}
+
+# Event ids handled by pyspcbridge
+EV_ZONE_OPEN = 1000  # Zone events make pyspcbridge fetch the zone
+EV_ZONE_CLOSED = 1001
+EV_ZONE_STATUS = 1002
+EV_AREA_FULLSET = 3500
+EV_AREA_UNSET = 3501
+EV_AREA_PARTSET_A = 3502
+EV_AREA_PARTSET_B = 3503
+EV_DOOR_ENTRY_GRANTED = 3000
+EV_DOOR_NORMAL = 3007
+EV_DOOR_LOCKED = 3008
+EV_DOOR_UNLOCKED = 3009
+EV_OUTPUT_ON = 7013
+EV_OUTPUT_OFF = 7014
+
+# Arm mode, SIA code and event id of the area commands
+AREA_COMMANDS = {
+    "unset": (0, "OG", EV_AREA_UNSET),
+    "set_a": (1, "NL", EV_AREA_PARTSET_A),
+    "set_b": (2, "NL", EV_AREA_PARTSET_B),
+    "set": (3, "CG", EV_AREA_FULLSET),
+    "set_forced": (3, "CG", EV_AREA_FULLSET),
+    "set_delayed": (3, "CG", EV_AREA_FULLSET),
+    "set_delayed_forced": (3, "CG", EV_AREA_FULLSET),
+}
+ZONE_COMMANDS = {"inhibit": 1, "deinhibit": 0, "isolate": 2, "deisolate": 0}
+OUTPUT_COMMANDS = {"set": True, "reset": False}
+# Door mode (None = unchanged) and event id of the door commands
+DOOR_COMMANDS = {
+    "open_momentarily": (None, EV_DOOR_ENTRY_GRANTED),
+    "open_permanently": (2, EV_DOOR_UNLOCKED),
+    "set_normal_mode": (0, EV_DOOR_NORMAL),
+    "lock": (1, EV_DOOR_LOCKED),
+}
+DOOR_MODE_EVENTS = {0: EV_DOOR_NORMAL, 1: EV_DOOR_LOCKED, 2: EV_DOOR_UNLOCKED}
+
+ERROR_NOT_READY = 20
+ERROR_INVALID_ID = 13
+ERROR_AUTHENTICATION_FAILED = 54
+
+_DIGEST_PARAM = re.compile(r'(\w+)=(?:"([^"]*)"|([^\s,]*))')
+
+
+@cache
+def _certificate() -> tuple[str, str]:
+    """Return the paths of a self-signed certificate and its key."""
+    # Imported here, only TLS needs it
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, HOST)])
+    now = datetime.now(UTC)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=365))
+        .sign(key, hashes.SHA256())
+    )
+    directory = Path(tempfile.mkdtemp(prefix="spcbridge_simulator_"))
+    cert_path = directory / "bridge.crt"
+    key_path = directory / "bridge.key"
+    cert_path.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    return str(cert_path), str(key_path)
+
+
+def _md5(value: str) -> str:
+    return hashlib.md5(value.encode()).hexdigest()
+
+
+def _reply(data: dict, status: int = 200) -> web.Response:
+    return web.json_response({"status": "success", "data": data}, status=status)
+
+
+def _error(code: int, status: int = 200) -> web.Response:
+    return web.json_response(
+        {"status": "error", "data": {"code": str(code)}}, status=status
+    )
+
+
+def _items(items: list[dict]) -> dict | list[dict]:
+    """Return a single item as the bridge does, not as a list."""
+    return items[0] if len(items) == 1 else items
+
+
+class FakeSpcBridge:
+    """SPC Bridge serving a generated panel.
+
+    The state of the panel is kept in `spc_data`, in the format of the
+    pyspcbridge http client, so tests compare it with the entity states.
+    `requests` counts the requests per method and resource.
+    """
+
+    def __init__(
+        self,
+        spc_data: dict | None = None,
+        credentials: dict[str, str] | None = None,
+        **kwargs: int,
+    ) -> None:
+        """Initialize the bridge, kwargs are passed to generate_spc_data."""
+        self.spc_data = (
+            deepcopy(spc_data) if spc_data is not None else generate_spc_data(**kwargs)
+        )
+        self.credentials = dict(
+            DEFAULT_CREDENTIALS if credentials is None else credentials
+        )
+        self.tls = any(self.credentials.values())
+        self.port: int | None = None
+        self.requests: Counter[str] = Counter()
+        self.events_sent = 0
+        self._nonce = secrets.token_hex(16)
+        self._websockets: set[web.WebSocketResponse] = set()
+        self._runner: web.AppRunner | None = None
+        self._areas = {a["id"]: a for a in self.spc_data["areas"]}
+        self._zones = {z["id"]: z for z in self.spc_data["zones"]}
+        self._outputs = {o["id"]: o for o in self.spc_data["outputs"]}
+        self._doors = {d["id"]: d for d in self.spc_data["doors"]}
+
+    @property
+    def url(self) -> str:
+        """Return the base URL of the REST API."""
+        return f"{'https' if self.tls else 'http'}://{HOST}:{self.port}"
+
+    @property
+    def connected(self) -> int:
+        """Return the number of connected websockets."""
+        return len(self._websockets)
+
+    async def __aenter__(self) -> FakeSpcBridge:
+        """Start the bridge."""
+        await self.async_start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Stop the bridge."""
+        await self.async_stop()
+
+    async def async_start(self, port: int = 0) -> None:
+        """Serve the bridge on HOST, on a free port by default."""
+        app = web.Application(middlewares=[self._authenticate])
+        router = app.router
+        router.add_get("/ws/spc", self._handle_websocket)
+        router.add_get("/spc/panel", self._handle_panel)
+        router.add_get("/spc/user", self._handle_users)
+        router.add_get("/spc/area/config", self._handle_area_configs)
+        router.add_get(r"/spc/area/{id:\d+}/config", self._handle_area_configs)
+        router.add_get(r"/spc/area/{id:\d+}/{arm_mode}_status", self._handle_arm_status)
+        router.add_get("/spc/area/{arm_mode}_status", self._handle_arm_status)
+        router.add_put("/spc/alert/clear", self._handle_clear_alerts)
+        router.add_put(r"/spc/area/{id:\d+}/{command}", self._handle_area_command)
+        router.add_put("/spc/area/{command}", self._handle_area_command)
+        for resource in ("area", "zone", "output", "door"):
+            router.add_get(f"/spc/{resource}", self._handle_status)
+            router.add_get(rf"/spc/{resource}/{{id:\d+}}", self._handle_status)
+        router.add_put(r"/spc/zone/{id:\d+}/{command}", self._handle_zone_command)
+        router.add_put(r"/spc/output/{id:\d+}/{command}", self._handle_output_command)
+        router.add_put(r"/spc/door/{id:\d+}/{command}", self._handle_door_command)
+
+        ssl_context = None
+        if self.tls:
+            ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            ssl_context.load_cert_chain(*_certificate())
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, HOST, port, ssl_context=ssl_context)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def async_stop(self) -> None:
+        """Close the websockets and stop serving."""
+        await self.async_drop_websockets()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def async_drop_websockets(self) -> None:
+        """Close the websockets, e.g. to test reconnects."""
+        for websocket in list(self._websockets):
+            await websocket.close(code=WSCloseCode.GOING_AWAY)
+
+    # Events
+
+    async def async_send_event(self, event: dict[str, Any]) -> None:
+        """Send a SIA event to the connected websockets."""
+        frame = {
+            "status": "success",
+            "data": {"sia": {k: str(v) for k, v in event.items()}},
+        }
+        self.events_sent += 1
+        for websocket in list(self._websockets):
+            if not websocket.closed:
+                await websocket.send_json(frame)
+
+    async def async_set_zone(
+        self, zone_id: int, input: int | None = None, status: int | None = None
+    ) -> None:
+        """Change the input or status of a zone and send its event."""
+        zone = self._zones[zone_id]
+        ev_id, sia_code = EV_ZONE_STATUS, "ZS"
+        if input is not None:
+            zone["input"] = input
+            ev_id, sia_code = (EV_ZONE_OPEN, "ZO") if input else (EV_ZONE_CLOSED, "ZC")
+        if status is not None:
+            zone["status"] = status
+        await self.async_send_event(self._zone_event(zone, ev_id, sia_code))
+
+    async def async_set_area(self, area_id: int, command: str, user: str = "") -> None:
+        """Apply an area command as if it was given at a keypad."""
+        area = self._areas[area_id]
+        mode, sia_code, ev_id = AREA_COMMANDS[command]
+        area["mode"] = mode
+        if mode == 0:
+            area["unset_user"] = user
+        elif mode == 3:
+            area["set_user"] = user
+        await self.async_send_event(
+            {
+                "ev_id": ev_id,
+                "sia_code": sia_code,
+                "ev_desc": command,
+                "area_id": area_id,
+                "area_name": area["name"],
+                "user_name": user,
+            }
+        )
+
+    async def async_set_output(self, output_id: int, state: bool) -> None:
+        """Change the state of an output and send its event."""
+        output = self._outputs[output_id]
+        output["state"] = int(state)
+        await self.async_send_event(
+            {
+                "ev_id": EV_OUTPUT_ON if state else EV_OUTPUT_OFF,
+                "sia_code": "",
+                "mg_id": output_id,
+                "mg_name": output["name"],
+            }
+        )
+
+    async def async_set_door(self, door_id: int, mode: int) -> None:
+        """Change the mode of a door and send its event."""
+        door = self._doors[door_id]
+        door["mode"] = mode
+        await self.async_send_event(self._door_event(door, DOOR_MODE_EVENTS[mode]))
+
+    async def async_run_events(
+        self, events: Iterable[dict[str, Any]], rate: float
+    ) -> int:
+        """Apply a stream of events at rate events per second.
+
+        Each event is a dict with the `action` (zone, area, output or door),
+        the `id` and the keyword arguments of the async_set_ method, e.g. as
+        generated by random_events. Returns the number of events sent.
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        count = 0
+        for count, event in enumerate(events, 1):
+            kwargs = dict(event)
+            action = kwargs.pop("action")
+            object_id = kwargs.pop("id")
+            await getattr(self, f"async_set_{action}")(object_id, **kwargs)
+            # Keep the rate independent of the time spent sending
+            if (delay := start + count / rate - loop.time()) > 0:
+                await asyncio.sleep(delay)
+        return count
+
+    def random_events(self, count: int, seed: int = 0) -> Iterator[dict[str, Any]]:
+        """Generate events toggling zone inputs, with some area, output and door
+        events, the same for the same seed."""
+        random = Random(seed)
+        inputs = {z["id"]: z["input"] for z in self.spc_data["zones"]}
+        for _ in range(count):
+            kind = random.random()
+            if kind < 0.9 or not (self._outputs or self._doors):
+                zone_id = random.choice(list(inputs))
+                inputs[zone_id] = 1 - inputs[zone_id]
+                yield {"action": "zone", "id": zone_id, "input": inputs[zone_id]}
+            elif kind < 0.93:
+                yield {
+                    "action": "area",
+                    "id": random.choice(list(self._areas)),
+                    "command": random.choice(["unset", "set_a", "set"]),
+                }
+            elif kind < 0.97 and self._outputs:
+                yield {
+                    "action": "output",
+                    "id": random.choice(list(self._outputs)),
+                    "state": random.random() < 0.5,
+                }
+            elif self._doors:
+                yield {
+                    "action": "door",
+                    "id": random.choice(list(self._doors)),
+                    "mode": random.choice([0, 1, 2]),
+                }
+
+    def _zone_event(self, zone: dict, ev_id: int, sia_code: str) -> dict[str, Any]:
+        return {
+            "ev_id": ev_id,
+            "sia_code": sia_code,
+            "zone_id": zone["id"],
+            "zone_name": zone["name"],
+            "area_id": zone["area_id"],
+            "area_name": zone["area_name"],
+        }
+
+    def _door_event(self, door: dict, ev_id: int, user: str = "") -> dict[str, Any]:
+        return {
+            "ev_id": ev_id,
+            "sia_code": "",
+            "door_id": door["id"],
+            "door_name": door["name"],
+            "user_name": user,
+        }
+
+    # Authentication
+
+    @web.middleware
+    async def _authenticate(self, request: web.Request, handler: Any) -> Any:
+        if request.path == "/ws/spc":
+            return await handler(request)
+        user = "get" if request.method == "GET" else "put"
+        username = self.credentials[f"{user}_username"]
+        password = self.credentials[f"{user}_password"]
+        if (
+            username
+            and password
+            and not self._digest_valid(request, username, password)
+        ):
+            return web.Response(
+                status=401,
+                headers={
+                    "WWW-Authenticate": (
+                        f'Digest realm="{REALM}", nonce="{self._nonce}", '
+                        'qop="auth", algorithm=MD5'
+                    )
+                },
+            )
+        resource = request.match_info.route.resource
+        path = resource.canonical if resource is not None else request.path
+        self.requests[f"{request.method} {path}"] += 1
+        # Commands are given as a SPC user, its password is not checked
+        if request.method == "PUT" and request.query.get("username") not in {
+            u["name"] for u in self.spc_data["users"]
+        }:
+            return _error(ERROR_AUTHENTICATION_FAILED)
+        return await handler(request)
+
+    def _digest_valid(self, request: web.Request, username: str, password: str) -> bool:
+        authorization = request.headers.get("Authorization", "")
+        if not authorization.startswith("Digest "):
+            return False
+        params = {
+            key: quoted or plain
+            for key, quoted, plain in _DIGEST_PARAM.findall(authorization[7:])
+        }
+        if params.get("username") != username or params.get("nonce") != self._nonce:
+            return False
+        ha1 = _md5(f"{username}:{REALM}:{password}")
+        ha2 = _md5(f"{request.method}:{params.get('uri')}")
+        expected = _md5(
+            f"{ha1}:{self._nonce}:{params.get('nc')}:{params.get('cnonce')}:"
+            f"{params.get('qop')}:{ha2}"
+        )
+        return secrets.compare_digest(expected, params.get("response", ""))
+
+    # Websocket
+
+    async def _handle_websocket(self, request: web.Request) -> web.StreamResponse:
+        username = self.credentials["ws_username"]
+        password = self.credentials["ws_password"]
+        if (username and password) and (
+            request.query.get("username") != username
+            or request.query.get("password") != password
+        ):
+            return web.Response(status=401)
+        websocket = web.WebSocketResponse(heartbeat=10)
+        await websocket.prepare(request)
+        self._websockets.add(websocket)
+        try:
+            async for _ in websocket:
+                pass
+        finally:
+            self._websockets.discard(websocket)
+        return websocket
+
+    # REST API
+
+    async def _handle_panel(self, request: web.Request) -> web.Response:
+        panel = self.spc_data["panel"]
+        return _reply(
+            {
+                "panel_summary": {
+                    "spc_type": panel["type"],
+                    "spc_variant": panel["model"],
+                    "spc_serial_no": panel["serial"],
+                    "spc_fw_version": panel["firmware"],
+                    "pin_digits": str(panel["pincode_length"]),
+                }
+            }
+        )
+
+    async def _handle_users(self, request: web.Request) -> web.Response:
+        return _reply(
+            {
+                "user_config": _items(
+                    [
+                        {"user_id": str(u["id"]), "name": u["name"]}
+                        for u in self.spc_data["users"]
+                    ]
+                )
+            }
+        )
+
+    async def _handle_area_configs(self, request: web.Request) -> web.Response:
+        if (areas := self._select(request, self._areas)) is None:
+            return _error(ERROR_INVALID_ID, 404)
+        return _reply(
+            {
+                "area": _items(
+                    [
+                        {
+                            "id": str(a["id"]),
+                            "entrytime": str(a["entrytime"]),
+                            "exittime": str(a["exittime"]),
+                        }
+                        for a in areas
+                    ]
+                )
+            }
+        )
+
+    async def _handle_arm_status(self, request: web.Request) -> web.Response:
+        if (areas := self._select(request, self._areas)) is None:
+            return _error(ERROR_INVALID_ID, 404)
+        forced = request.match_info["arm_mode"] in ("set_forced", "set_delayed_forced")
+        status = []
+        for area in areas:
+            reasons = {}
+            if request.match_info["arm_mode"] != "unset":
+                for zone_id in self._not_ready_zones(area["id"], forced):
+                    reasons[f"reason_{len(reasons)}"] = str(1000 + zone_id)
+            status.append({"area_id": str(area["id"]), **reasons})
+        return _reply(
+            {
+                "reply_get_area_change_mode_status": {
+                    "area_change_mode_status": _items(status)
+                }
+            }
+        )
+
+    async def _handle_status(self, request: web.Request) -> web.Response:
+        resource = request.path.split("/")[2]
+        objects = {
+            "area": self._areas,
+            "zone": self._zones,
+            "output": self._outputs,
+            "door": self._doors,
+        }[resource]
+        if (items := self._select(request, objects)) is None:
+            return _error(ERROR_INVALID_ID, 404)
+        render, key = {
+            "area": (self._render_area, "area_status"),
+            "zone": (self._render_zone, "zone_status"),
+            "output": (self._render_output, "mg_status"),
+            "door": (self._render_door, "door_status"),
+        }[resource]
+        return _reply({key: _items([render(item) for item in items])})
+
+    async def _handle_clear_alerts(self, request: web.Request) -> web.Response:
+        return _reply({"reply_clear_all_alerts": {"result": "0"}})
+
+    async def _handle_area_command(self, request: web.Request) -> web.Response:
+        command = request.match_info["command"]
+        if command not in AREA_COMMANDS:
+            return _error(ERROR_INVALID_ID, 404)
+        if (areas := self._select(request, self._areas)) is None:
+            return _error(ERROR_INVALID_ID, 404)
+        forced = command not in ("set", "set_delayed")
+        results = []
+        for area in areas:
+            result = 0
+            if AREA_COMMANDS[command][0] and self._not_ready_zones(area["id"], forced):
+                result = ERROR_NOT_READY
+            results.append({"area_id": str(area["id"]), "result": str(result)})
+        for area, result in zip(areas, results, strict=True):
+            if result["result"] == "0":
+                await self.async_set_area(
+                    area["id"], command, request.query.get("username", "")
+                )
+        if "id" in request.match_info:
+            results = results[0]
+        return _reply(
+            {"reply_area_change_mode": {"result": "0", "area_change_mode": results}}
+        )
+
+    async def _handle_zone_command(self, request: web.Request) -> web.Response:
+        zone = self._zones.get(int(request.match_info["id"]))
+        command = request.match_info["command"]
+        if zone is None or command not in ZONE_COMMANDS:
+            return _error(ERROR_INVALID_ID, 404)
+        await self.async_set_zone(zone["id"], status=ZONE_COMMANDS[command])
+        return _reply(
+            {
+                "reply_zone_control": {
+                    "result": "0",
+                    "zone_control": {"zone_id": str(zone["id"]), "result": "0"},
+                }
+            }
+        )
+
+    async def _handle_output_command(self, request: web.Request) -> web.Response:
+        output = self._outputs.get(int(request.match_info["id"]))
+        command = request.match_info["command"]
+        if output is None or command not in OUTPUT_COMMANDS:
+            return _error(ERROR_INVALID_ID, 404)
+        await self.async_set_output(output["id"], OUTPUT_COMMANDS[command])
+        return _reply(
+            {
+                "reply_mg_control": {
+                    "result": "0",
+                    "mg_control": {"mg_id": str(output["id"]), "result": "0"},
+                }
+            }
+        )
+
+    async def _handle_door_command(self, request: web.Request) -> web.Response:
+        door = self._doors.get(int(request.match_info["id"]))
+        command = request.match_info["command"]
+        if door is None or command not in DOOR_COMMANDS:
+            return _error(ERROR_INVALID_ID, 404)
+        mode, ev_id = DOOR_COMMANDS[command]
+        if mode is not None:
+            door["mode"] = mode
+        await self.async_send_event(
+            self._door_event(door, ev_id, request.query.get("username", ""))
+        )
+        return _reply(
+            {
+                "reply_door_control": {
+                    "result": "0",
+                    "door_control_result": {"result": "0"},
+                }
+            }
+        )
+
+    def _select(self, request: web.Request, objects: dict[int, dict]) -> list | None:
+        """Return the object of the id in the path, all without id."""
+        if "id" not in request.match_info:
+            return list(objects.values())
+        if (item := objects.get(int(request.match_info["id"]))) is None:
+            return None
+        return [item]
+
+    def _not_ready_zones(self, area_id: int, forced: bool) -> list[int]:
+        """Return the zones of an area that prevent setting it.
+
+        Open zones prevent setting unless forced, zones in tamper or alarm
+        always do. Inhibited and isolated zones are ignored.
+        """
+        return [
+            zone["id"]
+            for zone in self.spc_data["zones"]
+            if zone["area_id"] == area_id
+            and (
+                zone["status"] in (4, 5)
+                or (not forced and zone["input"] and zone["status"] not in (1, 2))
+            )
+        ]
+
+    def _render_area(self, area: dict) -> dict[str, str]:
+        return {
+            "area_id": str(area["id"]),
+            "area_name": area["name"],
+            "mode": str(area["mode"]),
+            "partseta_enable": "1" if area["a_enabled"] else "0",
+            "partseta_name": area["a_name"],
+            "partsetb_enable": "1" if area["b_enabled"] else "0",
+            "partsetb_name": area["b_name"],
+            "last_set_user_name": area["set_user"],
+            "last_unset_user_name": area["unset_user"],
+        }
+
+    def _render_zone(self, zone: dict) -> dict[str, str]:
+        return {
+            "zone_id": str(zone["id"]),
+            "zone_name": zone["name"],
+            "type": str(zone["type"]),
+            "logic_input": str(zone["input"]),
+            "status": str(zone["status"]),
+            "area_id": str(zone["area_id"]),
+            "area_name": zone["area_name"],
+        }
+
+    def _render_output(self, output: dict) -> dict[str, str]:
+        return {
+            "mg_id": str(output["id"]),
+            "mg_name": output["name"],
+            "state": str(output["state"]),
+        }
+
+    def _render_door(self, door: dict) -> dict[str, str]:
+        return {
+            "door_id": str(door["id"]),
+            "zone_name": door["name"],
+            "status": str(door["status"]),
+            "mode": str(door["mode"]),
+        }
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    bridge = FakeSpcBridge(
+        areas=args.areas, zones=args.zones, outputs=args.outputs, doors=args.doors
+    )
+    await bridge.async_start(args.port)
+    print(f"SPC Bridge simulator on {bridge.url}, credentials {bridge.credentials}")
+    try:
+        if args.rate:
+            await bridge.async_run_events(bridge.random_events(args.events), args.rate)
+        await asyncio.Event().wait()
+    finally:
+        await bridge.async_stop()
+
+
+def main() -> None:
+    """Run a simulated bridge until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8088)
+    parser.add_argument("--areas", type=int, default=2)
+    parser.add_argument("--zones", type=int, default=8)
+    parser.add_argument("--outputs", type=int, default=1)
+    parser.add_argument("--doors", type=int, default=1)
+    parser.add_argument("--rate", type=float, default=0, help="random events per s")
+    parser.add_argument("--events", type=int, default=10**9)
+    with suppress(KeyboardInterrupt):
+        asyncio.run(_async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Tests for the SPC Bridge events and device triggers."""
+
+from __future__ import annotations
+
+from homeassistant.components import automation
+from homeassistant.components.device_automation import DeviceAutomationType
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_get_device_automations,
+    async_mock_service,
+)
+
+from custom_components.spcbridge.const import DOMAIN, EVENT_SPC
+
+from .common import PANEL_SERIAL, MockWebsocket, async_settle, sia_frame
+
+ZONE_EVENT = {
+    "ev_id": "1000",
+    "sia_code": "BA",
+    "ev_desc": "Burglary Alarm",
+    "area_id": "1",
+    "area_name": "Area 1",
+    "zone_id": "3",
+    "zone_name": "Zone 3",
+}
+
+
+async def test_spc_event(
+    hass: HomeAssistant, setup_integration, websocket: MockWebsocket
+) -> None:
+    """Every SPC event is fired on the bus, also when repeated."""
+    entry = await setup_integration()
+    spc = hass.data[DOMAIN][entry.entry_id]
+    panel = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, f"{PANEL_SERIAL}-panel-1")}
+    )
+    events = async_capture_events(hass, EVENT_SPC)
+
+    websocket.send(sia_frame(ZONE_EVENT))
+    await async_settle(hass)
+    spc.set_value("area", 1, {"mode": 3})
+    await async_settle(hass)
+
+    assert len(events) == 1
+    data = events[0].data
+    assert data["device_id"] == panel.id
+    assert data["sia_code"] == "BA"
+    assert data["zone_id"] == 3
+    assert data["message"] == "Burglary Alarm - Area 1 - Zone 3"
+
+    for _ in range(2):
+        websocket.send(sia_frame(ZONE_EVENT))
+        await async_settle(hass)
+    assert len(events) == 3
+
+
+async def test_spc_event_burst(
+    hass: HomeAssistant, setup_integration, websocket: MockWebsocket
+) -> None:
+    """Every event of a burst is fired, in the order of the frames."""
+    await setup_integration()
+    events = async_capture_events(hass, EVENT_SPC)
+
+    for id in range(1, 6):
+        websocket.send(sia_frame({**ZONE_EVENT, "zone_id": str(id)}))
+    await async_settle(hass)
+
+    assert [event.data["zone_id"] for event in events] == [1, 2, 3, 4, 5]
+
+
+async def test_device_trigger(
+    hass: HomeAssistant, setup_integration, websocket: MockWebsocket
+) -> None:
+    """Zone device triggers only fire on events of that zone."""
+    await setup_integration()
+    device_registry = dr.async_get(hass)
+    zone_3 = device_registry.async_get_device(
+        identifiers={(DOMAIN, f"{PANEL_SERIAL}-zone-3")}
+    )
+    zone_4 = device_registry.async_get_device(
+        identifiers={(DOMAIN, f"{PANEL_SERIAL}-zone-4")}
+    )
+
+    triggers = await async_get_device_automations(
+        hass, DeviceAutomationType.TRIGGER, zone_3.id
+    )
+    assert [t["type"] for t in triggers if t["domain"] == DOMAIN] == ["spc_event"]
+
+    calls = async_mock_service(hass, "test", "automation")
+    assert await async_setup_component(
+        hass,
+        automation.DOMAIN,
+        {
+            automation.DOMAIN: [
+                {
+                    "trigger": {
+                        "platform": "device",
+                        "domain": DOMAIN,
+                        "device_id": device.id,
+                        "type": "spc_event",
+                        "sia_code": "BA",
+                    },
+                    "action": {
+                        "service": "test.automation",
+                        "data": {"zone": name},
+                    },
+                }
+                for device, name in ((zone_3, "zone_3"), (zone_4, "zone_4"))
+            ]
+        },
+    )
+
+    websocket.send(sia_frame(ZONE_EVENT))
+    await async_settle(hass)
+
+    assert [call.data["zone"] for call in calls] == ["zone_3"]
@@ -0,0 +1,67 @@
+"""Tests for the SPC Bridge diagnostics."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from pyspcbridge.zone import Zone
+
+from custom_components.spcbridge.const import CONF_GET_PASSWORD, CONF_USERS_DATA, DOMAIN
+from custom_components.spcbridge.diagnostics import async_get_config_entry_diagnostics
+
+from .common import PANEL_SERIAL, async_settle
+
+
+async def test_diagnostics(hass: HomeAssistant, setup_integration) -> None:
+    """Diagnostics are redacted and include the pipeline statistics."""
+    entry = await setup_integration()
+    spc = hass.data[DOMAIN][entry.entry_id]
+    hass.config_entries.async_update_entry(
+        entry,
+        options={
+            **entry.options,
+            CONF_USERS_DATA: {"1": {"ha_pincode": "1234", "spc_password": "secret"}},
+        },
+    )
+    await async_settle(hass)
+
+    spc.set_value("zone", 1, {"input": 1})
+    spc.set_value("zone", 1, {"input": 0})
+    spc.set_value("zone", 3, {"status": 4})
+    await async_settle(hass)
+    zone_3 = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, f"{PANEL_SERIAL}-zone-3")}
+    )
+    with patch.object(Zone, "async_command", return_value={"code": 0}):
+        await hass.services.async_call(
+            DOMAIN,
+            "zone_command",
+            {"device_id": zone_3.id, "command": "inhibit"},
+            blocking=True,
+        )
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["options"][CONF_GET_PASSWORD] == REDACTED
+    assert diagnostics["options"][CONF_USERS_DATA] == {
+        "1": {"ha_pincode": REDACTED, "spc_password": REDACTED}
+    }
+    assert diagnostics["panel"]["serial"] == REDACTED
+    assert diagnostics["objects"]["zones"] == 8
+    assert diagnostics["entities"]["sensor"]["total"] > 0
+
+    dispatcher = diagnostics["dispatcher"]
+    # Zone 1 is opened and closed within one tick, the update is coalesced
+    assert dispatcher["coalesced"] >= 1
+    assert dispatcher["urgent_flushes"] == 1
+    assert dispatcher["dispatched"] < dispatcher["updates"]
+    assert dispatcher["state_writes"] > 0
+    # Zone 1 is closed again, its entities skip the write
+    assert dispatcher["skipped_writes"] > 0
+
+    commands = diagnostics["commands"]
+    assert commands["max_pending"] == 1
+    assert commands["latency_histogram"]["count"] == 1
+    assert commands["latency_histogram"]["buckets"]["le_10"] == 1
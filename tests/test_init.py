@@ -0,0 +1,411 @@
+"""Tests for the SPC Bridge integration setup."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import timedelta
+from typing import Any
+from unittest.mock import patch
+
+import httpx
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_IP_ADDRESS
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+from pyspcbridge.exceptions import RequestError
+from pyspcbridge.spc_http_client import SpcHttpClient
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.spcbridge.client import (
+    REQUEST_DELIVERY,
+    SpcDelivery,
+    SpcHttpStats,
+    create_http_client,
+)
+from custom_components.spcbridge.const import (
+    CONF_AREAS_INCLUDE_DATA,
+    CONF_USERS_DATA,
+    CONF_ZONES_INCLUDE_DATA,
+    DOMAIN,
+)
+from custom_components.spcbridge.dispatcher import FRAME_RECEIVED
+
+from .common import (
+    PANEL_SERIAL,
+    MockWebsocket,
+    async_settle,
+    generate_spc_data,
+    mock_config_entry,
+    mock_spc_http_client,
+)
+
+
+def _stored(entry, spc_data: dict) -> dict[str, Any]:
+    return {
+        f"{DOMAIN}.{entry.entry_id}": {
+            "version": 1,
+            "minor_version": 1,
+            "key": f"{DOMAIN}.{entry.entry_id}",
+            "data": spc_data,
+        }
+    }
+
+
+@pytest.mark.usefixtures("websocket")
+async def test_setup_stores_spc_data(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """The SPC data is stored on the first start and removed with the entry."""
+    spc_data = generate_spc_data()
+    entry = mock_config_entry(spc_data)
+    entry.add_to_hass(hass)
+    with mock_spc_http_client(spc_data):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await async_settle(hass)
+
+    stored = hass_storage[f"{DOMAIN}.{entry.entry_id}"]["data"]
+    assert [z["id"] for z in stored["zones"]] == list(range(1, 9))
+
+    assert await hass.config_entries.async_remove(entry.entry_id)
+    assert f"{DOMAIN}.{entry.entry_id}" not in hass_storage
+
+
+async def test_setup_from_stored_data(
+    hass: HomeAssistant, hass_storage: dict[str, Any], websocket: MockWebsocket
+) -> None:
+    """Entities are created from stored data while the bridge is unreachable.
+
+    The stored states may be outdated, the entities are unavailable until the
+    live states are fetched. The websocket is started meanwhile.
+    """
+    spc_data = generate_spc_data()
+    entry = mock_config_entry(spc_data)
+    entry.add_to_hass(hass)
+    hass_storage.update(_stored(entry, spc_data))
+    websocket.refuse = True
+
+    with patch.object(SpcHttpClient, "async_get_panel", side_effect=RequestError):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert entry.state is ConfigEntryState.LOADED
+        assert hass.states.get("binary_sensor.zone_1_door").state == "unavailable"
+        assert hass.states.get("sensor.area_1_arm_mode").state == "unavailable"
+        state = hass.states.get("binary_sensor.spc_bridge_websocket_connected")
+        assert state.state == "off"
+        assert entry.runtime_data.connection.reconnect_delay is not None
+
+        await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_refresh_applies_status(
+    hass: HomeAssistant, hass_storage: dict[str, Any], websocket: MockWebsocket
+) -> None:
+    """Status changes since the last start are applied without a reload."""
+    spc_data = generate_spc_data()
+    entry = mock_config_entry(spc_data)
+    entry.add_to_hass(hass)
+    hass_storage.update(_stored(entry, generate_spc_data()))
+    spc_data["zones"][0]["input"] = 1
+    spc_data["areas"][0]["mode"] = 3
+
+    with (
+        mock_spc_http_client(spc_data),
+        patch.object(hass.config_entries, "async_schedule_reload") as reload,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await async_settle(hass)
+
+        assert hass.states.get("binary_sensor.zone_1_door").state == "on"
+        assert hass.states.get("sensor.area_1_arm_mode").state == "armed"
+        # Unchanged entities are available with the live states
+        assert hass.states.get("binary_sensor.zone_2_door").state == "off"
+        assert hass.states.get("sensor.area_2_arm_mode").state == "disarmed"
+        assert websocket.connects == 1
+        reload.assert_not_called()
+
+
+async def test_status_saved_on_update(
+    hass: HomeAssistant, hass_storage: dict[str, Any], setup_integration
+) -> None:
+    """Changed states are saved for the next start."""
+    entry = await setup_integration()
+    spc = hass.data[DOMAIN][entry.entry_id]
+
+    spc.set_value("zone", 1, {"input": 1})
+    spc.set_value("area", 1, {"mode": 3})
+    await async_settle(hass)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+    await async_settle(hass)
+
+    stored = hass_storage[f"{DOMAIN}.{entry.entry_id}"]["data"]
+    assert stored["zones"][0]["input"] == 1
+    assert stored["areas"][0]["mode"] == 3
+    assert stored["zones"][1]["input"] == 0
+
+
+@pytest.mark.usefixtures("websocket")
+async def test_refresh_adds_new_objects(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Zones added since the last start are added without a reload."""
+    spc_data = generate_spc_data(zones=10)
+    entry = mock_config_entry(spc_data)
+    entry.add_to_hass(hass)
+    hass_storage.update(_stored(entry, generate_spc_data(zones=8)))
+
+    with (
+        mock_spc_http_client(spc_data),
+        patch.object(hass.config_entries, "async_schedule_reload") as reload,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await async_settle(hass)
+
+        reload.assert_not_called()
+        assert hass.states.get("binary_sensor.zone_10_door").state == "off"
+        stored = hass_storage[f"{DOMAIN}.{entry.entry_id}"]["data"]
+        assert len(stored["zones"]) == 10
+
+        await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_reload_command_reconciles(
+    hass: HomeAssistant, setup_integration, websocket: MockWebsocket
+) -> None:
+    """A reload requested by the bridge only updates the changed objects."""
+    spc_data = generate_spc_data(zones=8)
+    entry = await setup_integration(spc_data=spc_data)
+    spc = hass.data[DOMAIN][entry.entry_id]
+    device_registry = dr.async_get(hass)
+
+    spc_data["zones"][1]["name"] = "Front door"
+    del spc_data["zones"][7]
+    spc_data["zones"][0]["input"] = 1
+    # Reload storms are merged
+    for _ in range(3):
+        await spc._async_callback("reload", spc.panel.id)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+    await async_settle(hass)
+    assert websocket.connected
+    assert websocket.connects == 1
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert hass.states.get("binary_sensor.zone_1_door").state == "on"
+    zone_2 = device_registry.async_get_device(
+        identifiers={(DOMAIN, f"{PANEL_SERIAL}-zone-2")}
+    )
+    assert zone_2.name == "Front door"
+    state = hass.states.get("binary_sensor.zone_2_door")
+    assert state.attributes["friendly_name"] == "Front door Door"
+    assert state.attributes["name"] == "Front door"
+    assert not device_registry.async_get_device(
+        identifiers={(DOMAIN, f"{PANEL_SERIAL}-zone-8")}
+    )
+    assert hass.states.get("binary_sensor.zone_8_door") is None
+    area_2 = hass.states.get("sensor.area_2_arm_mode")
+    assert area_2.attributes["zone_ids"] == [2, 4, 6]
+
+    # The zone entities are bound to the new SPC objects
+    spc.set_value("zone", 2, {"input": 1})
+    await async_settle(hass)
+    assert hass.states.get("binary_sensor.zone_2_door").state == "on"
+
+
+async def test_updates_during_reconcile(hass: HomeAssistant, setup_integration) -> None:
+    """Frames received while the bridge is fetched are not overwritten."""
+    spc_data = generate_spc_data()
+    entry = await setup_integration(spc_data=spc_data)
+    spc = hass.data[DOMAIN][entry.entry_id]
+    store = entry.runtime_data.store
+    async_fetch = store.async_fetch
+
+    async def async_fetch_during_frame() -> dict | None:
+        data = await async_fetch()
+        token = FRAME_RECEIVED.set(time.monotonic())
+        spc.set_value("zone", 1, {"input": 1})
+        FRAME_RECEIVED.reset(token)
+        await asyncio.sleep(0)
+        return data
+
+    # With the same configuration and with a changed one
+    for name in ("Zone 2", "Front door"):
+        spc_data["zones"][1]["name"] = name
+        with patch.object(store, "async_fetch", async_fetch_during_frame):
+            await spc._async_callback("reload", spc.panel.id)
+            async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+            await async_settle(hass)
+        assert hass.states.get("binary_sensor.zone_1_door").state == "on"
+        spc.set_value("zone", 1, {"input": 0})
+        await async_settle(hass)
+    zone_2 = hass.states.get("binary_sensor.zone_2_door")
+    assert zone_2.attributes["name"] == "Front door"
+
+
+async def test_options_applied_live(
+    hass: HomeAssistant, setup_integration, websocket: MockWebsocket
+) -> None:
+    """Include modes and users are applied without a reload."""
+    spc_data = generate_spc_data(zones=8)
+    entry = await setup_integration(spc_data=spc_data)
+    spc = hass.data[DOMAIN][entry.entry_id]
+    device_registry = dr.async_get(hass)
+    zones = entry.options[CONF_ZONES_INCLUDE_DATA]
+    areas = entry.options[CONF_AREAS_INCLUDE_DATA]
+
+    with patch.object(hass.config_entries, "async_reload") as reload:
+        hass.config_entries.async_update_entry(
+            entry,
+            options={
+                **entry.options,
+                CONF_ZONES_INCLUDE_DATA: {**zones, "1": "window", "2": "exclude"},
+                CONF_AREAS_INCLUDE_DATA: {**areas, "1": "exclude"},
+                CONF_USERS_DATA: {"1": {"ha_pincode": "1234", "spc_password": "pw"}},
+            },
+        )
+        await async_settle(hass)
+        assert websocket.connected
+        reload.assert_not_called()
+
+        state = hass.states.get("binary_sensor.zone_1_door")
+        assert state.attributes["device_class"] == "window"
+        assert hass.states.get("binary_sensor.zone_2_door") is None
+        assert not device_registry.async_get_device(
+            identifiers={(DOMAIN, f"{PANEL_SERIAL}-zone-2")}
+        )
+        assert hass.states.get("sensor.area_1_arm_mode") is None
+        assert spc.users[1].ha_pincode == "1234"
+
+        hass.config_entries.async_update_entry(
+            entry,
+            options={
+                **entry.options,
+                CONF_ZONES_INCLUDE_DATA: {**zones, "1": "window"},
+            },
+        )
+        await async_settle(hass)
+        assert hass.states.get("binary_sensor.zone_2_door").state == "off"
+
+        # A changed bridge address requires a reload
+        hass.config_entries.async_update_entry(
+            entry, options={**entry.options, CONF_IP_ADDRESS: "192.0.2.2"}
+        )
+        await async_settle(hass)
+        assert not websocket.connected
+        reload.assert_called_once_with(entry.entry_id)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_http_client(hass: HomeAssistant) -> None:
+    """The bridge client applies its own timeouts and counts the requests."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    stats = SpcHttpStats()
+    client = create_http_client(hass, entry, stats)
+    with patch.object(
+        httpx.AsyncHTTPTransport,
+        "handle_async_request",
+        return_value=httpx.Response(200),
+    ) as handle_request:
+        await client.get("http://192.0.2.1/spc/panel", timeout=5)
+    request = handle_request.call_args.args[0]
+    assert request.extensions["timeout"]["connect"] == 3
+    assert request.extensions["timeout"]["read"] == 8
+    assert stats.latency(50) is not None
+
+    # Nothing listens on the port, the request is never sent
+    delivery = SpcDelivery()
+    REQUEST_DELIVERY.set(delivery)
+    with pytest.raises(httpx.ConnectError):
+        await client.get("http://127.0.0.1:1/spc/panel")
+    assert not delivery.sent
+    assert stats.requests == 2
+    assert stats.failures == 1
+
+
+async def test_websocket_reconnect(
+    hass: HomeAssistant, setup_integration, websocket: MockWebsocket
+) -> None:
+    """A dropped websocket reconnects with backoff and resyncs the states."""
+    spc_data = generate_spc_data()
+    entry = await setup_integration(spc_data=spc_data)
+    connection = entry.runtime_data.connection
+    assert connection.connected
+
+    websocket.refuse = True
+    websocket.close()
+    await async_settle(hass)
+    assert not connection.connected
+    delays = [connection.reconnect_delay]
+    for _ in range(2):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=delays[-1]))
+        await async_settle(hass)
+        assert not connection.connected
+        delays.append(connection.reconnect_delay)
+    assert 0.5 <= delays[0] <= 1 and 2 <= delays[2] <= 4
+
+    # Changes while disconnected are fetched once reconnected
+    spc_data["zones"][0]["input"] = 1
+    websocket.refuse = False
+    with patch.object(SpcHttpClient, "async_get_panel") as get_panel:
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=delays[-1]))
+        await async_settle(hass)
+        get_panel.assert_not_called()
+    assert connection.connected
+    assert connection.reconnect_delay is None
+    assert connection.reconnects == 1
+    assert websocket.connects == 2
+    assert hass.states.get("binary_sensor.zone_1_door").state == "on"
+
+    # The backoff starts over once connected
+    websocket.close()
+    await async_settle(hass)
+    assert connection.reconnect_delay <= 1
+    await hass.config_entries.async_unload(entry.entry_id)
+    assert not websocket.connected
+
+
+async def test_fallback_polling(
+    hass: HomeAssistant, setup_integration, websocket: MockWebsocket
+) -> None:
+    """States are polled while the websocket is down, backing off when idle."""
+    spc_data = generate_spc_data()
+    entry = await setup_integration(spc_data=spc_data)
+    connection = entry.runtime_data.connection
+
+    websocket.refuse = True
+    websocket.close()
+    await async_settle(hass)
+    assert connection.poll_interval == 2
+
+    # The first poll finds nothing changed
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await async_settle(hass)
+    assert connection.poll_interval == 4
+
+    spc_data["zones"][0]["input"] = 1
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=4))
+    await async_settle(hass)
+    assert hass.states.get("binary_sensor.zone_1_door").state == "on"
+    assert connection.poll_interval == 2
+
+    # Without changes the interval is doubled
+    for seconds, interval in ((4, 4), (8, 8), (16, 16)):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+        await async_settle(hass)
+        assert connection.poll_interval == interval
+
+    # Polling stops when the websocket is connected again
+    websocket.refuse = False
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=300))
+    await async_settle(hass)
+    assert connection.connected
+    assert connection.poll_interval is None
+    polls = connection.polls
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=420))
+    await async_settle(hass)
+    assert connection.polls == polls
@@ -0,0 +1,167 @@
+"""Tests for the SPC Bridge sensors."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from unittest.mock import patch
+
+import httpx
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.spcbridge.const import (
+    CONF_COALESCE_WINDOW,
+    CONF_SLOW_EVENT_THRESHOLD,
+    DOMAIN,
+    EVENT_SPC,
+)
+
+from .common import MockWebsocket, async_settle, generate_spc_data, sia_frame
+
+# Event of zone 1, on which pyspcbridge fetches the zone
+ZONE_EVENT = {"ev_id": "1000", "sia_code": "BA", "zone_id": "1"}
+
+
+async def test_area_arm_mode_attributes(hass: HomeAssistant, setup_integration) -> None:
+    """Topology attributes are built once and volatile ones follow updates."""
+    entry = await setup_integration(areas=2, zones=8)
+    spc = hass.data[DOMAIN][entry.entry_id]
+
+    state = hass.states.get("sensor.area_1_arm_mode")
+    assert state.state == "disarmed"
+    assert state.attributes["zone_ids"] == [1, 3, 5, 7]
+    zone_ids = state.attributes["zone_ids"]
+
+    spc.set_value("area", 1, {"mode": 3, "set_user": "Engineer"})
+    await async_settle(hass)
+
+    state = hass.states.get("sensor.area_1_arm_mode")
+    assert state.state == "armed"
+    assert state.attributes["last_armed_user"] == "Engineer"
+    assert state.attributes["zone_ids"] is zone_ids
+
+
+async def test_panel_event_attributes(
+    hass: HomeAssistant, setup_integration, websocket: MockWebsocket
+) -> None:
+    """The panel event is exposed as text and structured attributes."""
+    await setup_integration()
+    events = async_capture_events(hass, EVENT_SPC)
+
+    websocket.send(
+        sia_frame(
+            {
+                "ev_id": "1000",
+                "sia_code": "BA",
+                "ev_desc": "Burglary Alarm",
+                "area_id": "1",
+                "area_name": "Area 1",
+                "zone_id": "3",
+                "zone_name": "Zone 3",
+            }
+        )
+    )
+    await async_settle(hass)
+
+    state = hass.states.get("sensor.spc6000_event_message")
+    assert state.state == "Burglary Alarm - Area 1 - Zone 3"
+    assert state.attributes["event_id"] == 1000
+    assert state.attributes["sia_code"] == "BA"
+    assert state.attributes["area_id"] == 1
+    assert state.attributes["zone_id"] == 3
+    assert state.attributes["door_id"] is None
+    # The bus event carries the same parsed event
+    assert state.attributes["timestamp"] == events[0].data["timestamp"]
+
+
+async def test_bridge_health(
+    hass: HomeAssistant, setup_integration, websocket: MockWebsocket
+) -> None:
+    """The health sensors of the bridge follow the pipeline counters."""
+    entry = await setup_integration()
+    data = entry.runtime_data
+    assert hass.states.get("binary_sensor.spc_bridge_websocket_connected").state == "on"
+    assert hass.states.get("sensor.spc_bridge_last_websocket_frame").state == "unknown"
+
+    websocket.send({"data": {}})
+    websocket.send({"data": {}})
+    await async_settle(hass)
+    with patch.object(
+        httpx.AsyncHTTPTransport,
+        "handle_async_request",
+        return_value=httpx.Response(200, json={}),
+    ):
+        for _ in range(4):
+            await data.http_client.get("http://192.0.2.1/spc/panel")
+    stats = data.dispatcher.stats
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=30))
+    await async_settle(hass)
+    # Health updates are not counted as event pipeline writes
+    assert data.dispatcher.stats == stats
+
+    assert hass.states.get("sensor.spc_bridge_events_per_minute").state == "2"
+    assert hass.states.get("sensor.spc_bridge_last_websocket_frame").state != "unknown"
+    state = hass.states.get("sensor.spc_bridge_rest_round_trip_p95")
+    assert float(state.state) >= 0
+    assert state.attributes["requests"] == 4
+    assert hass.states.get("sensor.spc_bridge_websocket_reconnects").state == "0"
+
+    # A dropped connection is shown without waiting for the next update
+    websocket.close()
+    await async_settle(hass)
+    state = hass.states.get("binary_sensor.spc_bridge_websocket_connected")
+    assert state.state == "off"
+
+
+async def test_event_latency(
+    hass: HomeAssistant, setup_integration, websocket: MockWebsocket, caplog
+) -> None:
+    """Updates of websocket frames are traced until the state is written."""
+    spc_data = generate_spc_data()
+    entry = await setup_integration(spc_data=spc_data)
+    data = entry.runtime_data
+    spc = data.spc
+
+    # A tampered zone, which writes the state of several entities. The zone
+    # is fetched by pyspcbridge on its event.
+    spc_data["zones"][0].update(input=1, status=4)
+    websocket.send(sia_frame(ZONE_EVENT))
+    await async_settle(hass)
+    assert hass.states.get("binary_sensor.zone_1_tamper").state == "on"
+    # Once for the zone, not for each of its entities
+    traced = data.dispatcher.latency["zone"].count
+    assert traced == 1
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=30))
+    await async_settle(hass)
+    state = hass.states.get("sensor.spc_bridge_zone_event_latency")
+    assert float(state.state) >= 0
+    assert state.attributes["updates"] == traced
+    assert hass.states.get("sensor.spc_bridge_door_event_latency").state == "unknown"
+
+    # Fetched updates have no frame to measure from, the next frame fetches
+    # the open zone again
+    spc.set_value("zone", 1, {"input": 0})
+    await async_settle(hass)
+    assert data.dispatcher.latency["zone"].count == traced
+
+    hass.config_entries.async_update_entry(
+        entry,
+        options={
+            **entry.options,
+            CONF_COALESCE_WINDOW: 50,
+            CONF_SLOW_EVENT_THRESHOLD: 20,
+        },
+    )
+    await async_settle(hass)
+    with caplog.at_level(logging.WARNING):
+        websocket.send(sia_frame(ZONE_EVENT))
+        await asyncio.sleep(0.1)
+        await async_settle(hass)
+    assert "Slow update of zone 1" in caplog.text
+    assert data.dispatcher.latency["zone"].as_dict()["max"] >= 50
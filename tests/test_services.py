@@ -0,0 +1,359 @@
+"""Tests for the SPC Bridge services."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+import voluptuous as vol
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+from pyspcbridge import SpcBridge
+from pyspcbridge.zone import Zone
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.spcbridge.client import REQUEST_DELIVERY
+from custom_components.spcbridge.commands import SpcCommandQueue
+from custom_components.spcbridge.const import CONF_ZONES_INCLUDE_DATA, DOMAIN
+from custom_components.spcbridge.diagnostics import async_get_config_entry_diagnostics
+
+from .common import PANEL_SERIAL, async_settle, generate_spc_data
+
+
+def _zone_device(hass: HomeAssistant, zone_id: int) -> dr.DeviceEntry | None:
+    return dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, f"{PANEL_SERIAL}-zone-{zone_id}")}
+    )
+
+
+async def test_zone_command(hass: HomeAssistant, setup_integration) -> None:
+    """Zone commands follow zones added and removed by a reconcile."""
+    spc_data = generate_spc_data(zones=8)
+    entry = await setup_integration(spc_data=spc_data)
+    spc = hass.data[DOMAIN][entry.entry_id]
+    zone_3 = _zone_device(hass, 3)
+    zone_8 = _zone_device(hass, 8)
+
+    with patch.object(
+        Zone, "async_command", autospec=True, return_value={"code": 0}
+    ) as command:
+        await hass.services.async_call(
+            DOMAIN,
+            "zone_command",
+            {"device_id": zone_3.id, "command": "inhibit"},
+            blocking=True,
+        )
+        assert command.call_args.args[0] is spc.zones[3]
+        assert command.call_args.args[1:] == ("inhibit", "")
+
+        # Commands for other object types are ignored
+        command.reset_mock()
+        await hass.services.async_call(
+            DOMAIN,
+            "area_command",
+            {"device_id": zone_3.id, "command": "set"},
+            blocking=True,
+        )
+        command.assert_not_called()
+
+        hass.config_entries.async_update_entry(
+            entry,
+            options={
+                **entry.options,
+                CONF_ZONES_INCLUDE_DATA: {
+                    **entry.options[CONF_ZONES_INCLUDE_DATA],
+                    "9": "door",
+                },
+            },
+        )
+        spc_data["zones"][7]["id"] = 9
+        spc_data["zones"][7]["name"] = "Zone 9"
+        await spc._async_callback("reload", spc.panel.id)
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+        await async_settle(hass)
+
+        await hass.services.async_call(
+            DOMAIN,
+            "zone_command",
+            {"device_id": _zone_device(hass, 9).id, "command": "inhibit"},
+            blocking=True,
+        )
+        assert command.call_args.args[0] is spc.zones[9]
+
+        with pytest.raises(vol.Invalid):
+            await hass.services.async_call(
+                DOMAIN,
+                "zone_command",
+                {"device_id": zone_8.id, "command": "inhibit"},
+                blocking=True,
+            )
+
+
+async def test_area_command_error(hass: HomeAssistant, setup_integration) -> None:
+    """Errors returned by the panel are raised to the caller."""
+    await setup_integration()
+    area_1 = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, f"{PANEL_SERIAL}-area-1")}
+    )
+
+    with (
+        patch(
+            "pyspcbridge.area.Area.async_command",
+            AsyncMock(return_value={"code": 1, "message": "Area not ready"}),
+        ),
+        pytest.raises(Exception, match="Area not ready"),
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            "area_command",
+            {"device_id": area_1.id, "command": "set"},
+            blocking=True,
+        )
+
+
+async def test_bulk_command(hass: HomeAssistant, setup_integration) -> None:
+    """Bulk commands run in parallel and return a result per target."""
+    await setup_integration()
+    running = 0
+    max_running = 0
+
+    async def async_command(zone, command, code):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if zone.id == 2:
+            return {"code": 1, "message": "Zone not ready"}
+        return {"code": 0}
+
+    with patch.object(Zone, "async_command", autospec=True, side_effect=async_command):
+        response = await hass.services.async_call(
+            DOMAIN,
+            "bulk_command",
+            {
+                "device_id": [_zone_device(hass, id).id for id in (1, 3, 4, 5)],
+                "entity_id": ["binary_sensor.zone_2_door", "sensor.unknown"],
+                "command": "inhibit",
+                "concurrency": 4,
+            },
+            blocking=True,
+            return_response=True,
+        )
+        # Above the limit of the command queue for single commands
+        assert max_running == 4
+        results = response["results"]
+        assert results[_zone_device(hass, 1).id] == {"success": True}
+        assert results["binary_sensor.zone_2_door"] == {
+            "success": False,
+            "error": "Zone not ready",
+        }
+        assert not results["sensor.unknown"]["success"]
+        assert sum(r["success"] for r in results.values()) == 4
+
+        # Without response failures are raised
+        with pytest.raises(ServiceValidationError, match="binary_sensor.zone_2_door"):
+            await hass.services.async_call(
+                DOMAIN,
+                "bulk_command",
+                {"entity_id": "binary_sensor.zone_2_door", "command": "inhibit"},
+                blocking=True,
+            )
+
+
+async def test_command_queue(hass: HomeAssistant) -> None:
+    """Identical pending commands are merged and failed commands retried."""
+    commands = SpcCommandQueue(hass, concurrency=1)
+    zone = Mock(id=1)
+    results = [{"code": 998, "message": "ERROR: Communication error"}, {"code": 0}]
+
+    async def async_command(command, code):
+        await asyncio.sleep(0)
+        return results.pop(0)
+
+    zone.async_command = AsyncMock(side_effect=async_command)
+    with patch("custom_components.spcbridge.commands.COMMAND_BACKOFF", 0):
+        assert await asyncio.gather(
+            commands.async_command("zone", zone, "inhibit", "1234"),
+            commands.async_command("zone", zone, "inhibit", "1234"),
+        ) == [{"code": 0}, {"code": 0}]
+
+    assert zone.async_command.await_count == 2
+    stats = commands.stats
+    assert stats["pending"] == 0
+    assert stats["commands"] == 1
+    assert stats["merged"] == 1
+    assert stats["retries"] == 1
+    assert stats["failures"] == 0
+
+
+async def test_command_sent_once(hass: HomeAssistant) -> None:
+    """Commands that reached the bridge are not repeated."""
+    commands = SpcCommandQueue(hass)
+    area = Mock(id=1)
+
+    async def async_lost_reply(command, code):
+        # Traced by the HTTP client when the request is sent
+        REQUEST_DELIVERY.get().sent = True
+        return {"code": 998, "message": "ERROR: Communication error"}
+
+    area.async_command = AsyncMock(side_effect=async_lost_reply)
+    result = await commands.async_command("area", area, "set", "1234")
+    assert result["code"] == 998
+    assert area.async_command.await_count == 1
+
+    async def async_no_reply(command, code):
+        await asyncio.Event().wait()
+
+    # Without a reply in time the outcome is unknown
+    area.async_command = AsyncMock(side_effect=async_no_reply)
+    with patch("custom_components.spcbridge.commands.COMMAND_TIMEOUT", 0.01):
+        result = await commands.async_command("area", area, "unset", "1234")
+    assert result["code"] == 999
+    assert "may have been executed" in result["message"]
+    assert area.async_command.await_count == 1
+    stats = commands.stats
+    assert stats["retries"] == 0
+    assert stats["failures"] == 2
+
+
+async def test_arm_status(hass: HomeAssistant, setup_integration) -> None:
+    """The arm status is answered from the zone states unless verified."""
+    spc_data = generate_spc_data()
+    # A fire zone of area 1, open fire zones do not prevent setting
+    spc_data["zones"][6]["type"] = 3
+    entry = await setup_integration(spc_data=spc_data)
+    spc = hass.data[DOMAIN][entry.entry_id]
+    area_1 = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, f"{PANEL_SERIAL}-area-1")}
+    )
+    assert hass.states.get("binary_sensor.area_1_ready_to_set").state == "on"
+
+    spc.set_value("zone", 1, {"input": 1})
+    spc.set_value("zone", 3, {"status": 4})
+    spc.set_value("zone", 5, {"input": 1, "status": 1})
+    spc.set_value("zone", 7, {"input": 1})
+    await async_settle(hass)
+
+    state = hass.states.get("binary_sensor.area_1_ready_to_set")
+    assert state.state == "off"
+    assert state.attributes["reasons"] == ["zone_1", "zone_3"]
+    assert hass.states.get("binary_sensor.area_2_ready_to_set").state == "on"
+
+    with patch.object(
+        SpcBridge, "async_get_arm_status", return_value=[]
+    ) as get_arm_status:
+        for arm_mode, reasons in (
+            ("set", ["zone_1", "zone_3"]),
+            # Answered like the bridge, which has no forced arm status
+            ("set_forced", ["zone_1", "zone_3"]),
+            ("set_b", ["undefined"]),
+            ("disarm", []),
+        ):
+            response = await hass.services.async_call(
+                DOMAIN,
+                "get_area_arm_status",
+                {"device_id": area_1.id, "arm_mode": arm_mode},
+                blocking=True,
+                return_response=True,
+            )
+            assert response == {"area": {1: reasons}}
+        get_arm_status.assert_not_called()
+
+        for _ in range(3):
+            await hass.services.async_call(
+                DOMAIN,
+                "get_area_arm_status",
+                {"device_id": area_1.id, "arm_mode": "set_forced", "verify": True},
+                blocking=True,
+                return_response=True,
+            )
+        get_arm_status.assert_called_once_with("set", 1)
+        diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+        assert diagnostics["arm_status_cache"]["hits"] == 2
+        assert diagnostics["arm_status_cache"]["hit_rate"] == 0.667
+
+        # A zone change invalidates the cached answer, an event does not
+        spc.set_value("panel", None, {"event": "{}"})
+        await async_settle(hass)
+        await hass.services.async_call(
+            DOMAIN,
+            "get_area_arm_status",
+            {"device_id": area_1.id, "arm_mode": "set", "verify": True},
+            blocking=True,
+            return_response=True,
+        )
+        assert get_arm_status.call_count == 1
+        spc.set_value("zone", 8, {"input": 1})
+        await async_settle(hass)
+        await hass.services.async_call(
+            DOMAIN,
+            "get_area_arm_status",
+            {"device_id": area_1.id, "arm_mode": "set", "verify": True},
+            blocking=True,
+            return_response=True,
+        )
+        assert get_arm_status.call_count == 2
+
+    spc.set_value("zone", 1, {"status": 1})
+    spc.set_value("zone", 3, {"status": 0})
+    await async_settle(hass)
+    state = hass.states.get("binary_sensor.area_1_ready_to_set")
+    assert state.state == "on"
+    assert state.attributes["reasons"] == []
+
+
+async def test_profile(
+    hass: HomeAssistant, setup_integration, config_dir: Path
+) -> None:
+    """The profile service times the event pipeline and writes a report."""
+    entry = await setup_integration()
+    spc = hass.data[DOMAIN][entry.entry_id]
+    task = hass.async_create_task(
+        hass.services.async_call(
+            DOMAIN,
+            "profile",
+            {"duration": 1},
+            blocking=True,
+            return_response=True,
+        )
+    )
+    await asyncio.sleep(0.1)
+    assert entry.runtime_data.perf.enabled
+    spc.set_value("zone", 3, {"status": 4})
+    await asyncio.sleep(0.1)
+
+    with pytest.raises(ServiceValidationError, match="already running"):
+        await hass.services.async_call(
+            DOMAIN, "profile", {"duration": 1}, blocking=True
+        )
+
+    response = await task
+    assert not entry.runtime_data.perf.enabled
+    timers = response["timers"][entry.title]
+    assert timers["update_callback"]["count"] >= 1
+    assert timers["entity_update"]["count"] >= 1
+    report = Path(response["path"])
+    assert report.parent == config_dir
+    assert "update_callback" in report.read_text(encoding="utf-8")
+
+
+async def test_profile_other_profiler(hass: HomeAssistant, setup_integration) -> None:
+    """The profile service fails cleanly while another profiler runs."""
+    entry = await setup_integration()
+    other = cProfile.Profile()
+    other.enable()
+    try:
+        with pytest.raises(ServiceValidationError, match="Cannot profile"):
+            await hass.services.async_call(
+                DOMAIN, "profile", {"duration": 1}, blocking=True
+            )
+    finally:
+        other.disable()
+    assert not entry.runtime_data.perf.enabled
@@ -0,0 +1,229 @@
+"""Tests of the integration against the simulated SPC Bridge."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from homeassistant import config_entries
+from homeassistant.const import CONF_IP_ADDRESS, CONF_PORT
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.spcbridge.const import (
+    CONF_RECORD_FRAMES,
+    CONF_USER_IDENTIFY_BY_ID,
+    CONF_USER_IDENTIFY_METHOD,
+    DOMAIN,
+    EVENT_SPC,
+)
+
+from .common import PANEL_SERIAL, async_settle, mock_config_entry
+from .simulator import FakeSpcBridge
+
+# The bridge is served on 127.0.0.1
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+async def _async_wait(
+    hass: HomeAssistant, predicate: Callable[[], bool], timeout: float = 10
+) -> None:
+    """Wait until predicate is true, updates arrive over the network."""
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+    # Frames may still fetch the zones of repeated events
+    await async_settle(hass)
+
+
+async def _async_setup(hass: HomeAssistant, bridge: FakeSpcBridge) -> MockConfigEntry:
+    entry = mock_config_entry(bridge.spc_data, port=bridge.port)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await _async_wait(hass, lambda: entry.runtime_data.connection.connected)
+    return entry
+
+
+def _state(hass: HomeAssistant, entity_id: str) -> str | None:
+    return state.state if (state := hass.states.get(entity_id)) else None
+
+
+async def test_setup_and_commands(hass: HomeAssistant) -> None:
+    """The integration loads the panel and follows events and commands."""
+    async with FakeSpcBridge() as bridge:
+        entry = await _async_setup(hass, bridge)
+        assert bridge.connected == 1
+        assert bridge.requests["GET /spc/zone"] == 1
+        assert _state(hass, "binary_sensor.zone_1_door") == "off"
+
+        await bridge.async_set_zone(1, input=1)
+        await _async_wait(
+            hass, lambda: _state(hass, "binary_sensor.zone_1_door") == "on"
+        )
+        assert bridge.requests["GET /spc/zone/{id}"] == 1
+
+        area_1 = dr.async_get(hass).async_get_device(
+            identifiers={(DOMAIN, f"{PANEL_SERIAL}-area-1")}
+        )
+        await hass.services.async_call(
+            DOMAIN,
+            "area_command",
+            # SPC user 2 with its password
+            {"device_id": area_1.id, "command": "set_forced", "code": "21234"},
+            blocking=True,
+        )
+        await _async_wait(
+            hass, lambda: _state(hass, "sensor.area_1_arm_mode") == "armed"
+        )
+
+        # The websocket reconnects and the missed states are resynced
+        await bridge.async_drop_websockets()
+        await _async_wait(hass, lambda: not entry.runtime_data.connection.connected)
+        bridge.spc_data["zones"][0]["input"] = 0
+        await _async_wait(hass, lambda: entry.runtime_data.connection.connected)
+        await _async_wait(
+            hass, lambda: _state(hass, "binary_sensor.zone_1_door") == "off"
+        )
+        assert entry.runtime_data.connection.reconnects == 1
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_event_stream(hass: HomeAssistant) -> None:
+    """Random event streams end in the states of the panel."""
+    async with FakeSpcBridge(areas=4, zones=64, outputs=4, doors=2) as bridge:
+        entry = await _async_setup(hass, bridge)
+        sent = await bridge.async_run_events(bridge.random_events(300), rate=500)
+        assert sent == 300
+
+        def _in_sync() -> bool:
+            return all(
+                _state(hass, f"binary_sensor.zone_{z['id']}_door")
+                == ("on" if z["input"] else "off")
+                for z in bridge.spc_data["zones"]
+            )
+
+        await _async_wait(hass, _in_sync)
+        stats = entry.runtime_data.dispatcher.stats
+        assert stats["updates"] >= stats["dispatched"] > 0
+        assert entry.runtime_data.dispatcher.latency["zone"].count > 0
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_config_flow(hass: HomeAssistant) -> None:
+    """The config flow authenticates against the bridge and creates the entry."""
+    async with FakeSpcBridge(areas=1, zones=2) as bridge:
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_IP_ADDRESS: "127.0.0.1", CONF_PORT: bridge.port}
+        )
+        assert result["step_id"] == "bridge_credentials"
+
+        credentials = dict(bridge.credentials)
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {**credentials, "get_password": "wrong"}
+        )
+        assert result["errors"] == {"base": "cannot_connect"}
+        assert bridge.connected == 0
+
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], credentials
+        )
+        assert result["step_id"] == "discovered"
+        for user_input in (
+            {},
+            {CONF_USER_IDENTIFY_METHOD: CONF_USER_IDENTIFY_BY_ID},
+            {"include_areas": ["area_1"]},
+            {"include_1": "door", "include_2": "exclude"},
+            {"include_outputs": ["output_1"]},
+            {"include_doors": []},
+            {},
+        ):
+            result = await hass.config_entries.flow.async_configure(
+                result["flow_id"], user_input
+            )
+        assert result["type"] is FlowResultType.CREATE_ENTRY
+        assert result["result"].unique_id == PANEL_SERIAL
+        await _async_wait(
+            hass, lambda: result["result"].runtime_data.connection.connected
+        )
+        assert _state(hass, "binary_sensor.zone_1_door") == "off"
+        assert hass.states.get("binary_sensor.zone_2_door") is None
+        assert await hass.config_entries.async_unload(result["result"].entry_id)
+
+
+async def test_record_and_replay(hass: HomeAssistant, config_dir: Path) -> None:
+    """Recorded frames are redacted and replayed through the event pipeline."""
+    async with FakeSpcBridge() as bridge:
+        entry = await _async_setup(hass, bridge)
+        hass.config_entries.async_update_entry(
+            entry, options={**entry.options, CONF_RECORD_FRAMES: True}
+        )
+        await async_settle(hass)
+
+        for value in ("on", "off"):
+            await bridge.async_set_zone(1, input=int(value == "on"))
+            await _async_wait(
+                hass,
+                lambda value=value: _state(hass, "binary_sensor.zone_1_door") == value,
+            )
+        # A door event carrying a password of the bridge
+        await bridge.async_send_event(
+            {
+                "ev_id": 3000,
+                "door_id": 1,
+                "user_name": bridge.credentials["ws_password"],
+            }
+        )
+        recorder = entry.runtime_data.connection.recorder
+        await _async_wait(hass, lambda: recorder.frames == 3)
+        hass.config_entries.async_update_entry(
+            entry, options={**entry.options, CONF_RECORD_FRAMES: False}
+        )
+        await async_settle(hass)
+
+        path = Path(recorder.path)
+        assert path.parent == config_dir
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 3
+        assert bridge.credentials["ws_password"] not in lines[2]
+        received, frame = json.loads(lines[0])
+        assert received > 0
+        assert frame["data"]["sia"]["zone_id"] == "1"
+
+        events = async_capture_events(hass, EVENT_SPC)
+        frames = entry.runtime_data.connection.frames
+        fetches = bridge.requests["GET /spc/zone/{id}"]
+        response = await hass.services.async_call(
+            DOMAIN,
+            "replay",
+            {"config_entry_id": entry.entry_id, "speed": 0},
+            blocking=True,
+            return_response=True,
+        )
+        assert response["frames"] == 3
+        assert len(events) == 3
+        assert entry.runtime_data.connection.frames == frames + 3
+        # pyspcbridge fetches the zone of every zone event from the bridge
+        assert bridge.requests["GET /spc/zone/{id}"] == fetches + 2
+        assert _state(hass, "sensor.door_1_last_entry_granted_user") == "**REDACTED**"
+
+        with pytest.raises(ServiceValidationError, match="configuration directory"):
+            await hass.services.async_call(
+                DOMAIN,
+                "replay",
+                {"config_entry_id": entry.entry_id, "file": "../frames.jsonl"},
+                blocking=True,
+            )
+        assert await hass.config_entries.async_unload(entry.entry_id)